@@ -1,9 +1,8 @@
-import csv
-import os
 from dataclasses import dataclass, field
 
-import dlib
-import numpy as np
+from package.face_gallery import FaceGallery
+from package.gallery_file import load_gallery
+from package.model_registry import registry
 
 
 @dataclass
@@ -15,6 +14,27 @@ class VideoConfigData:
         "image_width",
         "detection_range_start_point",
         "detection_range_end_point",
+        "frame_buffer_size",
+        "frame_buffer_policy",
+        "capture_process",
+        "capture_decimation",
+        "video_file",
+        "video_pacing",
+        "video_loop",
+        "video_fps",
+        "capture_backend",
+        "capture_buffer_size",
+        "capture_width",
+        "capture_height",
+        "ffmpeg_options",
+        "detection_target_fps",
+        "detection_idle_fps",
+        "detection_cpu_budget",
+        "detection_max_stride",
+        "detection_interval",
+        "tracking_min_confidence",
+        "detection_roi",
+        "detection_roi_margin",
     ]
     rtsp: str | None
     web_camera: int | None
@@ -22,6 +42,27 @@ class VideoConfigData:
     image_width: int
     detection_range_start_point: list
     detection_range_end_point: list
+    frame_buffer_size: int = 2
+    frame_buffer_policy: str = "latest"
+    capture_process: bool = False
+    capture_decimation: int = 0
+    video_file: str | None = None
+    video_pacing: str = "realtime"
+    video_loop: bool = False
+    video_fps: float = 0.0
+    capture_backend: str = "any"
+    capture_buffer_size: int = 0
+    capture_width: int = 0
+    capture_height: int = 0
+    ffmpeg_options: str | None = None
+    detection_target_fps: float = 15.0
+    detection_idle_fps: float = 5.0
+    detection_cpu_budget: float = 0.8
+    detection_max_stride: int = 6
+    detection_interval: int = 1
+    tracking_min_confidence: float = 0.6
+    detection_roi: bool = False
+    detection_roi_margin: int = 40
 
 
 @dataclass
@@ -44,34 +85,39 @@ class RecoConfigData:
     eyes_detection_brightness_value: list
     sensitivity: float
     consecutive_prediction_intervals: int
-    registered_face_descriptor: np.ndarray = field(init=False, default=None)
+    gallery_index: str = "brute_force"
+    gallery_index_nprobe: int = 8
+    gallery_index_path: str | None = None
+    gallery_reload_interval: float = 1.0
+    recognition_executor: str = "thread"
+    recognition_workers: int = 2
+    recognition_queue_size: int = 4
+    recognition_timeout: float = 5.0
+    recognition_batch_size: int = 1
+    recognition_batch_wait_ms: float = 5.0
+    quality_gate: bool = False
+    quality_minimum_sharpness: float = 20.0
+    quality_minimum_brightness: float = 40.0
+    quality_minimum_symmetry: float = 0.4
+    best_shot_frames: int = 8
+    identity_cache_ttl: float = 5.0
+    identity_quality_gain: float = 1.5
+    registered_face_descriptor: FaceGallery = field(init=False, default=None)
+    dlib_predictor_path: str = field(init=False, default=None)
+    dlib_recognition_model_path: str = field(init=False, default=None)
 
     def __post_init__(self):
-        # Initialize dlib models
-        self.dlib_predictor = dlib.shape_predictor(self.dlib_predictor)
-        self.dlib_recognition_model = dlib.face_recognition_model_v1(self.dlib_recognition_model)
+        # Shared dlib models from the registry, keeping the paths for the recognition worker processes
+        self.dlib_predictor_path = self.dlib_predictor
+        self.dlib_recognition_model_path = self.dlib_recognition_model
+        self.dlib_predictor = registry.shape_predictor(self.dlib_predictor)
+        self.dlib_recognition_model = registry.face_recognition_model(self.dlib_recognition_model)
         # Load face features
-        self.load_face_features()  # FIXME: 將 face features 改成 key-value db
+        self.load_face_features()
 
     def load_face_features(self):
         """
-        Load registered face features from CSV.
-        CSV format: name, f1, f2, ..., f128
+        Load registered face features into a `FaceGallery` matrix.
+        Gallery files are memory-mapped; `.csv` model files are still parsed. CSV format: name, f1, f2, ..., f128
         """
-        self.registered_face_descriptor = {}
-
-        if os.path.isfile(self.face_model):
-            with open(self.face_model, newline="") as model:
-                rows = csv.reader(model)
-                for row in rows:
-                    if len(row) < 129:
-                        continue
-                    name = row[0]
-                    features = np.array(row[1:], dtype=float)
-                    self.registered_face_descriptor[name] = features
-        else:
-            # Create the directory if it does not exist
-            directory_path = os.path.dirname(self.face_model)
-            os.makedirs(directory_path, exist_ok=True)
-            with open(self.face_model, mode="a", newline="") as model:
-                pass
+        self.registered_face_descriptor = load_gallery(self.face_model)
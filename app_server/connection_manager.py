@@ -1,5 +1,5 @@
 import asyncio
-from typing import Optional, Set
+from typing import Optional
 
 from fastapi import WebSocket
 
@@ -11,17 +11,21 @@ class ConnectionManager:
     """WebSocket connection manager"""
 
     def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
+        self.active_connections: set[WebSocket] = set()
+        # Clients receiving video frames, every client until it unsubscribes
+        self.frame_subscribers: set[WebSocket] = set()
         self.face_app_manager: Optional[FaceAppManager] = None
         self.stream_task: Optional[asyncio.Task] = None
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.add(websocket)
+        self.frame_subscribers.add(websocket)
         print(f"New client connected: {websocket.client}")
 
     async def disconnect(self, websocket: WebSocket):
         self.active_connections.discard(websocket)
+        self.frame_subscribers.discard(websocket)
         print(f"Client disconnected: {websocket.client}")
 
         # Stop face detection service when no clients connected
@@ -29,17 +33,32 @@ class ConnectionManager:
             print("All clients disconnected, stopping face detection service.")
             await self.stop_face_detection()
 
-    async def send_frame(self, frame_data: str):
-        """Send frame to all connected clients"""
+    def subscribe_frames(self, websocket: WebSocket, subscribed: bool = True):
+        """Start or stop sending video frames to a client, logs and status messages are always sent"""
+        if subscribed and websocket in self.active_connections:
+            self.frame_subscribers.add(websocket)
+        else:
+            self.frame_subscribers.discard(websocket)
+
+    def wants_frames(self) -> bool:
+        """Whether any client receives video frames, frames are not drawn or encoded otherwise"""
+        return bool(self.frame_subscribers)
+
+    async def send_frame(self, frame_data: str, frame_stamp: Optional[dict] = None):
+        """Send frame, with its capture sequence and timestamps if given, to the clients subscribed to frames"""
+        message = {"type": "frame", "data": frame_data}
+        if frame_stamp is not None:
+            message["frame"] = frame_stamp
         disconnected_clients = set()
-        for connection in self.active_connections:
+        for connection in list(self.frame_subscribers):
             try:
-                await connection.send_json({"type": "frame", "data": frame_data})
+                await connection.send_json(message)
             except:
                 disconnected_clients.add(connection)
 
         # Remove disconnected clients
         self.active_connections -= disconnected_clients
+        self.frame_subscribers -= disconnected_clients
 
     async def send_log(self, log_data: dict):
         """Send log to all connected clients"""
@@ -51,6 +70,7 @@ class ConnectionManager:
                 disconnected_clients.add(connection)
 
         self.active_connections -= disconnected_clients
+        self.frame_subscribers -= disconnected_clients
 
     async def broadcast_message(self, message: dict):
         """Broadcast message to all connected clients"""
@@ -64,6 +84,7 @@ class ConnectionManager:
                 disconnected_clients.add(connection)
 
         self.active_connections -= disconnected_clients
+        self.frame_subscribers -= disconnected_clients
 
     async def start_face_detection(self):
         """Start face detection service"""
@@ -53,7 +53,7 @@ class FaceRecognitionConfig(Base):
     face_model = Column(
         String(256),
         nullable=True,
-    )  # TODO: Path to the CSV model file for face features, change to key-value db
+    )  # Path to the face features: SQLite store (.db), gallery file (.gallery) or legacy CSV (.csv)
     minimum_bounding_box_height = Column(Float, default=0.0)
     minimum_face_detection_score = Column(Float, default=0.0)
     eyes_detection_brightness_threshold = Column(Integer, default=0)
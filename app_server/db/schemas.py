@@ -49,7 +49,9 @@ class FaceRecognitionConfigBase(BaseModel):
     dlib_recognition_model_path: str = Field(
         default="", max_length=256, description="Path to the Dlib recognition model"
     )
-    face_model: str = Field(default="", max_length=256, description="CSV model file for face features")
+    face_model: str = Field(
+        default="", max_length=256, description="Face features file: SQLite store (.db), gallery file (.gallery) or CSV"
+    )
     minimum_bounding_box_height: float = Field(
         default=0.0, ge=0.0, le=1.0, description="Minimum bounding box height as a ratio (0.0 to 1.0)"
     )
@@ -2,6 +2,7 @@ import asyncio
 import threading
 from datetime import datetime
 from queue import Queue
+from typing import Optional
 
 from face_detection import RunMode
 
@@ -30,6 +31,34 @@ class FaceAppManager:
         if self.face_app:
             self.face_app.toggle_blink_detection()
 
+    def notify_gallery_changed(self):
+        """Let the running FaceApp pick up enrolled or deleted faces"""
+        if self.face_app:
+            self.face_app.notify_gallery_changed()
+
+    def recognition_stats(self) -> dict:
+        """Recognition counters of the running FaceApp"""
+        if self.face_app:
+            return self.face_app.recognition_stats()
+        return {}
+
+    def detection_stats(self) -> dict:
+        """Detection stride and frame channel counters of the running FaceApp"""
+        if self.face_app:
+            return self.face_app.detection_stats()
+        return {}
+
+    def latency_stats(self) -> dict:
+        """Per-hop latency histograms of the running FaceApp"""
+        if self.face_app:
+            return self.face_app.latency.stats()
+        return {}
+
+    def _record_latency(self, hop: str, start: Optional[float]) -> None:
+        face_app = self.face_app
+        if face_app:
+            face_app.latency.record(hop, start)
+
     async def run(self):
         """Run face detection in async context"""
         self.running = True
@@ -49,6 +78,7 @@ class FaceAppManager:
             frame_queue=self.frame_queue,
             log_queue=self.log_queue,
             external_detection_queue=self.detection_results_queue,
+            frame_demand=self.connection_manager.wants_frames,
         )
 
         # Start face detection in a separate thread
@@ -71,10 +101,12 @@ class FaceAppManager:
         while self.running:
             try:
                 # Get frame from queue
-                frame_data = await asyncio.wait_for(self.frame_queue.get(), timeout=0.1)
+                frame_data, frame_stamp = await asyncio.wait_for(self.frame_queue.get(), timeout=0.1)
 
                 # Send to all connected clients
-                await self.connection_manager.send_frame(frame_data)
+                await self.connection_manager.send_frame(frame_data, frame_stamp)
+                if frame_stamp:
+                    self._record_latency("frame_to_client", frame_stamp["captured_at"])
 
             except asyncio.TimeoutError:
                 continue
@@ -94,6 +126,10 @@ class FaceAppManager:
 
                 # Send to WebSocket clients
                 await self.connection_manager.send_log(log_data)
+                frame_stamp = log_data.get("frame")
+                if frame_stamp:
+                    self._record_latency("recognize_to_publish", frame_stamp["recognized_at"])
+                    self._record_latency("capture_to_publish", frame_stamp["captured_at"])
 
                 # Post to external server (if configured)
                 if not self.config_adapter.system_config.debug:
@@ -31,6 +31,7 @@ class FaceRegistrationManager:
         self.video_stream = VideoStream(
             config_source=self.config_adapter,
             frame_queue=self.frame_queue,
+            frame_demand=self.connection_manager.wants_frames,
         )
 
         face_thread = threading.Thread(target=self.video_stream.run)
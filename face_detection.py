@@ -1,20 +1,40 @@
 import asyncio
 import base64
 import hashlib
+import queue
 import threading
 import time
 from datetime import datetime
 from enum import Enum
 from multiprocessing import Queue
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import cv2
 import dlib
 import mediapipe as mp
 import numpy as np
 
-from package import calculation, config, coordinate_detection, predictor, video_capturer
+from package import (
+    best_shot,
+    calculation,
+    config,
+    coordinate_detection,
+    face_flow_tracker,
+    face_quality,
+    face_tracker,
+    frame_preprocessor,
+    frame_scheduler,
+    gallery_index,
+    gallery_watcher,
+    latency,
+    loop_meter,
+    overlay,
+    pipeline,
+    predictor,
+    recognition_executor,
+    video_capturer,
+)
 from package import settings as system_settings
 from package.blink_detector import BlinkDetector
 
@@ -32,6 +52,7 @@ class FaceApp:
         frame_queue: Optional[Any] = None,
         log_queue: Optional[Any] = None,
         external_detection_queue: Optional[Queue] = None,
+        frame_demand: Optional[Callable[[], bool]] = None,
     ):
         """
         Initialize FaceApp.
@@ -42,10 +63,12 @@ class FaceApp:
             frame_queue: FastAPI mode streaming frame queue
             log_queue: FastAPI mode logging queue
             external_detection_queue: Optional external queue for detection results (if None, creates a new Queue)
+            frame_demand: FastAPI mode, returns whether any client watches the stream (if None, always streams)
         """
         self.mode = mode
         self.frame_queue = frame_queue
         self.log_queue = log_queue
+        self.frame_demand = frame_demand
         self.running = True
         self._minio_client = None
 
@@ -77,34 +100,117 @@ class FaceApp:
         # Calculation module
         self.calculation = calculation.Calculation(self.video_config.image_width, self.video_config.image_height)
 
+        # Part of the frame MediaPipe runs on, None for the whole frame
+        self.detection_region = None
+        if self.video_config.detection_roi:
+            self.detection_region = self.calculation.detection_region(
+                self.video_config.detection_range_start_point,
+                self.video_config.detection_range_end_point,
+                self.video_config.detection_roi_margin,
+            )
+
         # Face predictor
         self.predictor = predictor.Predictor(
             self.reco_config.dlib_predictor,
             self.reco_config.dlib_recognition_model,
             self.reco_config.registered_face_descriptor,
             self.reco_config.sensitivity,
+            gallery_index.create_gallery_index(
+                self.reco_config.registered_face_descriptor,
+                self.reco_config.gallery_index,
+                self.reco_config.gallery_index_nprobe,
+                self.reco_config.gallery_index_path,
+            ),
         )
 
+        # Pick up enrolled and deleted faces while running
+        self.gallery_watcher = None
+        if self.reco_config.gallery_reload_interval > 0:
+            self.gallery_watcher = gallery_watcher.GalleryWatcher(
+                self.reco_config.face_model, self.predictor, self.reco_config.gallery_reload_interval
+            )
+            self.gallery_watcher.start()
+
         # Initialize BlinkDetector (Can be controlled via configuration or parameters)
         enable_blink = getattr(self.reco_config, "enable_blink_detection", True)
         self.blink_detector = BlinkDetector(enabled=enable_blink)
 
-        # FPS counter
-        self.fps = 0
-        self.fps_count = 0
+        # Quality gate before recognition
+        self.quality_scorer = face_quality.FaceQualityScorer(
+            self.reco_config.quality_minimum_sharpness,
+            self.reco_config.quality_minimum_brightness,
+            self.reco_config.quality_minimum_symmetry,
+            self.reco_config.quality_gate,
+        )
+
+        # Recent face crops, only the best one is recognized
+        self.best_shot = best_shot.BestShotBuffer(self.reco_config.best_shot_frames)
 
-        # Video capture
-        self.video_queue = Queue()
-        self.video_capture_status_alive = True
+        # Face tracks and their cached identities
+        self.face_tracker = face_tracker.FaceTracker(
+            self.reco_config.identity_cache_ttl, quality_gain=self.reco_config.identity_quality_gain
+        )
+
+        # Resize, mirror and colour conversions into reused buffers
+        self.frame_preprocessor = frame_preprocessor.FramePreprocessor(
+            self.video_config.image_width, self.video_config.image_height
+        )
 
-        # External detection queue
-        self.detection_results_queue = external_detection_queue or Queue()
+        # Detection stride adapted to the frame rate, the processing cost and whether a face is in range
+        self.frame_scheduler = frame_scheduler.FrameScheduler(
+            self.video_config.detection_target_fps,
+            self.video_config.detection_idle_fps,
+            self.video_config.detection_cpu_budget,
+            self.video_config.detection_max_stride,
+        )
+
+        # MediaPipe every N processed frames, optical flow carries the faces in between
+        self.flow_tracker = face_flow_tracker.FlowTracker(
+            self.video_config.detection_interval, self.video_config.tracking_min_confidence
+        )
 
-        # FIXME: rtsp 或 web_camera 資料型態不一致，需統一資料型態處理方法
-        video_source = self.video_config.rtsp if self.video_config.rtsp else self.video_config.web_camera
-        self.video_capture = video_capturer.VideoCapturer(
-            video_source, self.video_queue, self.video_capture_status_alive
+        # Per-hop latency from capture to the WebSocket client
+        self.latency = latency.LatencyTracker()
+
+        # Processed frames per second, time waiting for frames and CPU share of the detection loop
+        self.loop_meter = loop_meter.LoopMeter()
+
+        # Stages after capture. Detection and liveness run on the loop thread, recognition on the executor
+        # workers; drawing, JPEG encoding and S3 uploads run on workers of their own behind bounded queues,
+        # so slow I/O drops stream frames or old uploads instead of slowing detection down.
+        self.pipeline = pipeline.Pipeline(
+            pipeline.Stage("detect"),
+            pipeline.Stage("liveness"),
+            pipeline.Stage("annotate", self._annotate, policy="latest"),
+            pipeline.Stage("publish", self._publish_frame, policy="latest"),
+            pipeline.Stage("upload", self._upload_result, capacity=16, policy="drop_oldest"),
         )
+        self.pipeline["annotate"].connect(self.pipeline["publish"])
+
+        # Static overlay layers by blink detection state, and frames not streamed because nobody watched
+        self._overlay_layers: dict[bool, overlay.OverlayLayer] = {}
+        self.stream_skipped = 0
+
+        # External detection queue, results stay in this process
+        self.detection_results_queue = external_detection_queue or queue.Queue()
+
+        # Recognition workers
+        self.recognition_executor = recognition_executor.RecognitionExecutor(
+            self.predictor,
+            self.detection_results_queue,
+            self.reco_config.recognition_executor,
+            self.reco_config.recognition_workers,
+            self.reco_config.recognition_queue_size,
+            self.reco_config.recognition_timeout,
+            self.reco_config.dlib_predictor_path,
+            self.reco_config.dlib_recognition_model_path,
+            self.reco_config.recognition_batch_size,
+            self.reco_config.recognition_batch_wait_ms,
+        )
+
+        # Video capture, in a thread or a capture process
+        video_source = video_capturer.capture_source(self.video_config)
+        self.video_queue, self.video_capture = video_capturer.create_capture(video_source, self.video_config)
         self.video_capturer_thread = threading.Thread(target=self.video_capture.get_video)
         self.video_capturer_thread.start()
 
@@ -121,8 +227,13 @@ class FaceApp:
 
     def stop(self):
         self.running = False
+        self.pipeline.stop()
+        if self.gallery_watcher:
+            self.gallery_watcher.stop()
+        self.recognition_executor.shutdown()
+        config.logger.info(f"Recognition stats: {self.recognition_stats()}")
+        config.logger.info(f"Detection stats: {self.detection_stats()}")
         self.video_queue.close()
-        self.video_queue.join_thread()
         if hasattr(self, "video_capturer_thread") and self.video_capturer_thread.is_alive():
             self.video_capture.stop()
             self.video_capturer_thread.join(timeout=2)
@@ -154,43 +265,57 @@ class FaceApp:
                 1,
             )
 
+    def _overlay_layer(self) -> overlay.OverlayLayer:
+        """The detection range and the labels for the current blink detection state, rendered at the first use."""
+        blink_enabled = self.blink_detector.enabled
+        layer = self._overlay_layers.get(blink_enabled)
+        if layer is None:
+            layer = overlay.OverlayLayer().rectangle(
+                self.video_config.detection_range_start_point, self.video_config.detection_range_end_point, (0, 255, 0)
+            )
+            if blink_enabled:
+                status_text = "ON" if self.mode == RunMode.STANDALONE else "ON (Stream)"
+                layer.text("Eyes detection:", (10, 70), (0, 0, 255))
+                layer.text(f"Blink: {status_text}", (400, 70), (0, 255, 0))
+            else:
+                layer.text("Blink: OFF", (10, 70), (255, 0, 0))
+            layer.text("Face detection:", (10, 110), (0, 0, 255))
+            layer.text("Distance:", (10, 150), (0, 0, 255))
+
+            # 顯示執行模式
+            if self.mode == RunMode.FASTAPI:
+                layer.text("[FastAPI Mode]", (10, 30), (255, 165, 0))
+            self._overlay_layers[blink_enabled] = layer
+        return layer
+
     def _draw_result_information(
         self, frame: np.ndarray, detection_results: bool, blink_state: bool, detection_distance: int
     ) -> None:
-        """Draw detection results and blink state on the frame."""
+        """Draw the detection range, detection results and blink state on the frame; only the values are drawn."""
         face_color = (0, 255, 0) if detection_results else (0, 0, 255)
+        self._overlay_layer().apply(frame)
 
         # Draw blink detection information
         if self.blink_detector.enabled:
             eyes_color = (0, 255, 0) if blink_state else (0, 0, 255)
-            FaceApp._draw_text(frame, "Eyes detection:", (10, 70), (0, 0, 255))
             FaceApp._draw_text(frame, str(blink_state), (260, 70), eyes_color)
-            status_text = "ON" if self.mode == RunMode.STANDALONE else "ON (Stream)"
-            FaceApp._draw_text(frame, f"Blink: {status_text}", (400, 70), (0, 255, 0))
-        else:
-            FaceApp._draw_text(frame, "Blink: OFF", (10, 70), (255, 0, 0))
 
-        FaceApp._draw_text(frame, "Face detection:", (10, 110), (0, 0, 255))
         FaceApp._draw_text(frame, str(detection_results), (260, 110), face_color)
-        FaceApp._draw_text(frame, "Distance:", (10, 150), (0, 0, 255))
         FaceApp._draw_text(frame, str(detection_distance), (150, 150), face_color)
 
-        # 顯示執行模式
-        if self.mode == RunMode.FASTAPI:
-            FaceApp._draw_text(frame, "[FastAPI Mode]", (10, 30), (255, 165, 0))
-
     def _eyes_preprocessing(
         self, frame: np.ndarray, bounding_eye_left: list, bounding_eye_right: list, threshold_value: int
     ) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
-        """Eyes preprocessing."""
+        """Eyes preprocessing, the eye ROIs are cut from the grayscale frame."""
+        gray_frame = self.frame_preprocessor.gray()
         if self.sys_config.debug:
             FaceApp._draw_rectangle(frame, bounding_eye_left)
             FaceApp._draw_rectangle(frame, bounding_eye_right)
 
-        eye_left_roi = frame[
+        eye_left_roi = gray_frame[
             bounding_eye_left[0][1] : bounding_eye_left[1][1], bounding_eye_left[0][0] : bounding_eye_left[1][0]
         ]
-        eye_right_roi = frame[
+        eye_right_roi = gray_frame[
             bounding_eye_right[0][1] : bounding_eye_right[1][1], bounding_eye_right[0][0] : bounding_eye_right[1][0]
         ]
 
@@ -200,11 +325,36 @@ class FaceApp:
         )
         return left_eye_gary, right_eye_gary
 
-    def _fps_counter(self):
-        if time.time() - self.start_time >= 1:
-            self.fps = self.fps_count
-            self.fps_count = 0
-            self.start_time = time.time()
+    def recognition_stats(self) -> dict:
+        """Counters of the recognition executor, the quality gate and the identity cache."""
+        executor = self.recognition_executor
+        return {
+            "submitted": executor.submitted,
+            "completed": executor.completed,
+            "dropped": executor.dropped,
+            "timed_out": executor.timed_out,
+            "failed": executor.failed,
+            "mean_recognition_seconds": round(executor.mean_recognition_seconds, 4),
+            "quality_gate": self.quality_scorer.stats(executor.mean_recognition_seconds),
+            **self.face_tracker.stats(),
+        }
+
+    def detection_stats(self) -> dict:
+        """The loop rate and CPU share, the detection stride, the flow tracking and the frame channel counters."""
+        return {
+            "fps": self.loop_meter.fps,
+            "loop": self.loop_meter.stats(),
+            "scheduler": self.frame_scheduler.stats(),
+            "tracking": self.flow_tracker.stats(),
+            "frame_channel": self.video_queue.stats(),
+            "stages": self.pipeline.stats(),
+            "stream_skipped": self.stream_skipped,
+        }
+
+    def notify_gallery_changed(self):
+        """Apply enrolls and deletes of the face model now instead of at the next reload interval."""
+        if self.gallery_watcher:
+            self.gallery_watcher.notify()
 
     def toggle_blink_detection(self):
         """Switch blink detection on/off. Use for standalone mode."""
@@ -212,8 +362,8 @@ class FaceApp:
         config.logger.info(f"Blink detection toggled to: {self.blink_detector.enabled}")
 
     # TAG: FastAPI mode methods
-    async def _put_frame_async(self, frame: np.ndarray):
-        """Put frame into queue (FastAPI mode)"""
+    async def _put_frame_async(self, frame: np.ndarray, frame_stamp: Optional[latency.FrameStamp] = None):
+        """Put frame and its stamp into queue (FastAPI mode)"""
         if self.mode != RunMode.FASTAPI or not self.frame_queue:
             return
 
@@ -222,7 +372,7 @@ class FaceApp:
             frame_base64 = base64.b64encode(buffer).decode("utf-8")
 
             if not self.frame_queue.full():
-                await self.frame_queue.put(frame_base64)
+                await self.frame_queue.put((frame_base64, frame_stamp.as_dict() if frame_stamp else None))
         except Exception as e:
             config.logger.error(f"Error putting frame to queue: {e}")
 
@@ -280,18 +430,58 @@ class FaceApp:
 
         return upload_status
 
+    # TAG: Pipeline stages
+    def _stream_wanted(self) -> bool:
+        """True if a streamed frame would be watched: a client wants frames and the stream queue has room."""
+        if self.frame_queue is None or self.frame_queue.full():
+            return False
+        return self.frame_demand is None or self.frame_demand()
+
+    def _annotate(self, frame_overlay: tuple) -> tuple:
+        """Draw the detection range, the face boxes and the results on a frame (annotate stage)."""
+        frame, frame_stamp, face_boxes, detection_results, blink_state, detection_distance = frame_overlay
+        if self.sys_config.debug:
+            for face_box in face_boxes:
+                FaceApp._draw_rectangle(frame, face_box)
+        self._draw_result_information(frame, detection_results, blink_state, detection_distance)
+        if self.sys_config.debug:
+            FaceApp._draw_text(
+                frame, f"FPS: {self.loop_meter.fps} stride: {self.frame_scheduler.stride}", (10, 30), (0, 0, 255)
+            )
+        return frame, frame_stamp
+
+    def _publish_frame(self, annotated: tuple) -> None:
+        """Encode a frame and put it into the stream queue (publish stage)."""
+        frame, frame_stamp = annotated
+        asyncio.run(self._put_frame_async(frame, frame_stamp))
+
+    def _upload_result(self, result: tuple) -> None:
+        """Upload the face of a recognition to S3 and put its log into the log queue (upload stage)."""
+        face_image, detection_results, person_name, frame_stamp, recognized_time = result
+        s3_object_key, upload_status = None, False
+        if not self.sys_config.debug and face_image is not None:
+            # self._save_face_image(frame, detection_results, person_name)
+            s3_object_key = f"{recognized_time.strftime('%Y%m%d_%H%M%S')}_{person_name}.jpg"
+            upload_status = self._upload_face_image_to_s3(face_image, detection_results, s3_object_key)
+
+        log_data = {
+            "name": person_name,
+            "group": "Unknown",
+            "s3_object_key": s3_object_key if upload_status else None,
+            "detection_results": detection_results,
+            "timestamp": recognized_time.isoformat(),
+            "frame": frame_stamp.as_dict(),
+        }
+        asyncio.run(self._put_log_async(log_data))
+
     def run(self):
-        # If running in FastAPI mode, create an event loop
-        loop = None
+        # Standalone mode draws and shows frames on this thread, FastAPI mode hands them to the stage workers
         if self.mode == RunMode.FASTAPI:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        # fps parameters
-        self.start_time = time.time()
+            self.pipeline.start()
 
         # detection parameters
         face_roi: Optional[np.array] = None
+        face_track: Optional[face_tracker.FaceTrack] = None
         face_in_detection_range: bool = False
         enable_execution_interval: bool = False
         interval_count: int = 0
@@ -302,11 +492,13 @@ class FaceApp:
         with self.mp_face_detection as face_detection:
             while self.running and self.video_capture.status_alive:
                 try:
-                    self.fps_count += 1
-                    self._fps_counter()
-
-                    if self.video_queue.empty():
-                        cv2.waitKey(1) if self.mode == RunMode.STANDALONE else time.sleep(0.001)
+                    # Block until the capture publishes a frame, the timeout only lets the loop see `running`.
+                    wait_started = time.monotonic()
+                    captured = self.video_queue.get(timeout=loop_meter.FRAME_WAIT_TIMEOUT)
+                    self.loop_meter.waited(time.monotonic() - wait_started)
+                    if captured is None:
+                        if self.mode == RunMode.STANDALONE:
+                            cv2.waitKey(1)
                         continue
 
                     # Handle key events
@@ -315,22 +507,32 @@ class FaceApp:
                     if key == ord("b") or key == ord("B"):
                         self.toggle_blink_detection()
 
-                    frame = cv2.resize(
-                        self.video_queue.get(),
-                        (self.video_config.image_width, self.video_config.image_height),
-                        interpolation=cv2.INTER_AREA,
-                    )
-
-                    FaceApp._draw_rectangle(
-                        frame,
-                        [self.video_config.detection_range_start_point, self.video_config.detection_range_end_point],
-                    )
-
-                    frame_bgr = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    results = face_detection.process(frame_bgr)
-
-                    if results.detections:
-                        for detection_mp in results.detections:
+                    frame = self.frame_preprocessor.process(captured)
+                    self.loop_meter.frame()
+                    frame_stamp = latency.FrameStamp(self.video_queue.last_sequence, self.video_queue.last_timestamp)
+                    processing_started = time.monotonic()
+                    face_boxes = []
+
+                    # Skipped frames are still shown and streamed, only detection and recognition wait.
+                    # Between MediaPipe runs the faces are tracked, the same detection code follows either way.
+                    detections = None
+                    if self.frame_scheduler.should_process(processing_started):
+                        if not self.flow_tracker.needs_detection():
+                            detections = self.flow_tracker.track(self.frame_preprocessor.gray())
+                        if detections is None:
+                            detections = (
+                                face_detection.process(self.frame_preprocessor.rgb(self.detection_region)).detections
+                                or []
+                            )
+                            if self.detection_region is not None:
+                                detections = self.calculation.map_detections(detections, self.detection_region)
+                            if self.flow_tracker.enabled:
+                                self.flow_tracker.start(self.frame_preprocessor.gray(), detections)
+                        frame_stamp.detected_at = time.monotonic()
+                        self.latency.record("capture_to_detect", frame_stamp.captured_at, frame_stamp.detected_at)
+
+                    if detections:
+                        for detection_mp in detections:
                             # face bounding box
                             bounding_box_mp = detection_mp.location_data.relative_bounding_box
                             bounding_box_height = round(bounding_box_mp.height, 2)
@@ -341,6 +543,7 @@ class FaceApp:
                                 center, bounding_box_height, detection_score
                             ):
                                 self.blink_detector.reset()
+                                self.best_shot.reset()
                                 face_in_detection_range = False
                                 continue
 
@@ -351,6 +554,8 @@ class FaceApp:
                                 face_bounding_box[0][0] : face_bounding_box[1][0],
                             ]
                             face_in_detection_range = np.all(np.array(face_roi.shape) != 0)
+                            if face_in_detection_range:
+                                face_boxes.append(face_bounding_box)
 
                             # Update brightness for blink detection
                             if (
@@ -364,14 +569,28 @@ class FaceApp:
                                     self.reco_config.eyes_detection_brightness_value,
                                 )
 
-                            if self.sys_config.debug:
-                                FaceApp._draw_rectangle(frame, face_bounding_box)
+                        # Track the faces, another person starts a new best-shot window
+                        face_tracks = self.face_tracker.update(face_boxes)
+                        current_track = face_tracks[-1] if face_tracks else None
+                        if current_track is not face_track:
+                            self.best_shot.reset()
+                        face_track = current_track
 
                         # Handles blink detection and facial recognition
                         if self.reco_config.enable and face_in_detection_range:
+                            self.best_shot.push(
+                                face_roi,
+                                self.quality_scorer.score(
+                                    face_roi,
+                                    detection_mp.location_data.relative_keypoints,
+                                    self.blink_detector.average_brightness,
+                                ),
+                            )
+
                             # Blink detection
                             blink_state = False
                             if self.blink_detector.enabled and self.blink_detector.average_brightness != 0:
+                                liveness_started = time.monotonic()
                                 # eyes bounding box
                                 bounding_eye_left, bounding_eye_right = self.calculation.get_eyes_boundingbox(
                                     detection_mp, bounding_box_mp.height
@@ -381,6 +600,7 @@ class FaceApp:
                                 )
 
                                 blink_state = self.blink_detector.process_eyes(left_eye_gary, right_eye_gary)
+                                self.pipeline["liveness"].record(time.monotonic() - liveness_started)
 
                                 if self.mode == RunMode.STANDALONE and self.sys_config.debug:
                                     cv2.imshow("eyes_left", left_eye_gary)
@@ -398,15 +618,36 @@ class FaceApp:
                                 else:
                                     trigger_recognition = not enable_execution_interval
 
+                            # Best crop of the window: the cached identity of its track, else a recognition
+                            # if it passes the quality gate. A skipped face is tried again on the next trigger,
+                            # i.e. the next blink when blink detection is on.
                             if trigger_recognition:
-                                extraction = threading.Thread(
-                                    target=self.predictor.face_prediction,
-                                    args=(
-                                        face_roi,
-                                        self.detection_results_queue,
-                                    ),
-                                )
-                                extraction.start()
+                                best_face_crop, face_quality_result = self.best_shot.best()
+                                if face_track is not None and not self.face_tracker.needs_recognition(
+                                    face_track, face_quality_result.score
+                                ):
+                                    # Shown again, but not uploaded or logged again: the recognition already was.
+                                    detection_results, detection_distance, person_name = (
+                                        face_track.passed,
+                                        round(face_track.distance, 2),
+                                        face_track.name,
+                                    )
+                                elif self.quality_scorer.record(face_quality_result):
+                                    self.recognition_executor.submit(
+                                        best_face_crop,
+                                        (
+                                            face_track.track_id if face_track else None,
+                                            face_track.presence if face_track else None,
+                                            face_quality_result.score,
+                                            frame_stamp,
+                                        ),
+                                    )
+                                else:
+                                    config.logger.debug(f"Face skipped by the quality gate: {face_quality_result}")
+                                    trigger_recognition = False
+
+                            if trigger_recognition:
+                                self.best_shot.reset()
                                 enable_execution_interval = True
                                 interval_count = 0
 
@@ -425,56 +666,75 @@ class FaceApp:
                                 predictor.Predictor.save_feature(self.reco_config.face_model, face_descriptor, name)
                                 if self.sys_config.debug:
                                     FaceApp._draw_dlib_features(face_roi, feature_coordinates)
-                    else:
+                    elif detections is not None:
                         self.blink_detector.reset()
+                        self.best_shot.reset()
+                        self.face_tracker.update([])
+                        face_track = None
                         face_roi = None
 
+                    if detections is not None:
+                        self.frame_scheduler.record(
+                            time.monotonic() - processing_started,
+                            bool(detections),
+                            bool(detections) and bool(face_in_detection_range),
+                        )
+                    self.pipeline["detect"].record(time.monotonic() - processing_started)
+
                     # Handle detection results
                     if not self.detection_results_queue.empty():
                         detection_result = self.detection_results_queue.get()
                         detection_distance = round(detection_result[1], 2)
                         detection_results = detection_result[0]
                         person_name = detection_result[2] if len(detection_result) > 2 else "Unknown"
-
-                        # FastAPI mode: save face image and put log
-                        if self.mode == RunMode.FASTAPI and frame is not None:
-                            if not self.sys_config.debug:
-                                # self._save_face_image(frame, detection_results, person_name)
-                                s3_object_key = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{person_name}.jpg"
-                                upload_status = self._upload_face_image_to_s3(
-                                    face_roi, detection_results, s3_object_key
+                        # The aligned chip of the recognized face, not the ROI of the current frame
+                        face_chip = detection_result[3] if len(detection_result) > 3 else None
+                        # Fresh recognitions are cached on the track they were submitted for and carry the
+                        # stamp of the frame they were detected in, results without a tag the current one
+                        result_stamp = frame_stamp
+                        if len(detection_result) > 5 and detection_result[5] is not None:
+                            track_id, presence, quality_score, result_stamp = detection_result[5]
+                            result_stamp.recognized_at = detection_result[6]
+                            self.latency.record(
+                                "detect_to_recognize", result_stamp.detected_at, result_stamp.recognized_at
+                            )
+                            if track_id is not None:
+                                self.face_tracker.remember(track_id, detection_result, quality_score, presence)
+
+                        # FastAPI mode: upload the face image and put the log on the upload stage
+                        if self.mode == RunMode.FASTAPI:
+                            face_image = face_chip if face_chip is not None else face_roi
+                            self.pipeline["upload"].submit(
+                                (
+                                    None if face_image is None else face_image.copy(),
+                                    detection_results,
+                                    person_name,
+                                    result_stamp,
+                                    datetime.now(),
                                 )
+                            )
 
-                            log_data = {
-                                "name": person_name,
-                                "group": "Unknown",
-                                "s3_object_key": s3_object_key if upload_status else None,
-                                "detection_results": detection_results,
-                                "timestamp": datetime.now().isoformat(),
-                            }
-
-                            # Send log data
-                            if loop:
-                                loop.run_until_complete(self._put_log_async(log_data))
-
-                    # Draw results
-                    self._draw_result_information(
-                        frame, detection_results, self.blink_detector.blink_state, detection_distance
+                    frame_overlay = (
+                        frame,
+                        frame_stamp,
+                        face_boxes,
+                        detection_results,
+                        self.blink_detector.blink_state,
+                        detection_distance,
                     )
-
-                    if self.sys_config.debug:
-                        FaceApp._draw_text(frame, "FPS: " + str(self.fps), (10, 30), (0, 0, 255))
-
-                    # Handle frame display
                     if self.mode == RunMode.STANDALONE:
-                        # Standalone mode: Show video window
+                        # Standalone mode: draw and show the video window on this thread
+                        self.pipeline["annotate"].process(frame_overlay)
                         cv2.imshow("video_out", frame)
                         if key == ord("q") or key == ord("Q"):
                             break
-                    else:
-                        # FastAPI mode: put frame into queue
-                        if self.fps_count % 3 == 0 and loop:
-                            loop.run_until_complete(self._put_frame_async(frame))
+                    elif self.loop_meter.frames % 3 == 0:
+                        # FastAPI mode: only frames that will be streamed are copied, annotated and encoded;
+                        # the frame buffer is reused by the next frame, the stages get a copy
+                        if self._stream_wanted():
+                            self.pipeline["annotate"].submit((frame.copy(), *frame_overlay[1:]))
+                        else:
+                            self.stream_skipped += 1
 
                     if self.mode == RunMode.STANDALONE and self.sys_config.debug:
                         cv2.imshow("video_out", frame)
@@ -495,9 +755,6 @@ class FaceApp:
 
         # 清理資源
         cv2.destroyAllWindows()
-        if loop:
-            print("Stopping event loop...")
-            loop.close()
         self.stop()
 
 
@@ -51,6 +51,14 @@ async def lifespan(app: FastAPI):
 
 manager = ConnectionManager()
 
+
+def notify_gallery_changed():
+    """Let a running face detection pick up enrolled or deleted faces without a restart."""
+    notify = getattr(manager.face_app_manager, "notify_gallery_changed", None)
+    if notify:
+        notify()
+
+
 app = FastAPI(
     title="Face Recognition API",
     description="API for face recognition system settings.",
@@ -88,6 +96,10 @@ async def websocket_endpoint(websocket: WebSocket):
             elif message.get("type") == "stop_detection":
                 print("⚠️ Stopping face detection...")
                 await manager.stop_face_detection()
+            elif message.get("type") in ("subscribe_frames", "unsubscribe_frames"):
+                subscribed = message["type"] == "subscribe_frames"
+                manager.subscribe_frames(websocket, subscribed)
+                await websocket.send_text(json.dumps({"type": "frames", "subscribed": subscribed}))
             elif message.get("type") == "ping":
                 await websocket.send_text(json.dumps({"type": "pong"}))
             elif message.get("type") == "start_video_stream":
@@ -116,6 +128,26 @@ async def health_check():
     }
 
 
+@app.get("/api/latency")
+async def latency_stats():
+    """Per-hop latency histograms of the running face detection, from capture to the WebSocket client."""
+    face_app_manager = manager.face_app_manager
+    running = face_app_manager is not None and face_app_manager.face_app is not None
+    return {"face_detection_running": running, "hops": face_app_manager.latency_stats() if running else {}}
+
+
+@app.get("/api/stats")
+async def pipeline_stats():
+    """Detection and recognition counters of the running face detection."""
+    face_app_manager = manager.face_app_manager
+    running = face_app_manager is not None and face_app_manager.face_app is not None
+    return {
+        "face_detection_running": running,
+        "detection": face_app_manager.detection_stats() if running else {},
+        "recognition": face_app_manager.recognition_stats() if running else {},
+    }
+
+
 @app.get("/api/face-reco-config")
 async def read_face_reco_config(db: Session = Depends(get_db)):
     """Read face recognition configuration."""
@@ -234,6 +266,7 @@ async def register_face(base64_face_image: str = Form(...), name: str = Form(...
             if not upload_status:
                 face_feature_extractor.delete_feature(config.face_model, name)
                 raise HTTPException(status_code=503, detail=message.get("error"))
+        notify_gallery_changed()
 
         return Response(
             status_code=201,
@@ -264,6 +297,7 @@ async def delete_registered_face(user_name: str, db: Session = Depends(get_db)):
     MinioClient.delete_directory(bucket_name="user-registration", directory_name=user_name)
 
     if delete_status:
+        notify_gallery_changed()
         return Response(
             status_code=200,
             content=json.dumps(message),
@@ -0,0 +1,86 @@
+"""
+Best-shot selection: keep the recent crops of a face and recognize only the best one.
+"""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from package.face_aligner import MAX_ROI_SIDE
+from package.face_quality import FaceQuality
+
+
+class BestShotBuffer:
+    """
+    A fixed ring of the last `capacity` face crops and their quality while a face is in the detection range. \n
+    The frame completing the blink pattern is often mid-blink or motion blurred; on trigger the sharpest,
+    most frontal crop that passes the quality gate is recognized instead. Crops are downscaled to at most
+    `max_side` pixels per side, which the aligner would do anyway, and written into preallocated slots,
+    so pushing a frame allocates no image memory.
+    """
+
+    def __init__(self, capacity: int = 8, max_side: int = MAX_ROI_SIDE):
+        self.capacity = max(capacity, 1)
+        self.max_side = max_side
+        self._slots = np.empty((self.capacity, max_side * max_side * 3), dtype=np.uint8)
+        self._shapes = np.zeros((self.capacity, 2), dtype=np.int32)
+        self._scores = np.zeros(self.capacity, dtype=np.float64)
+        self._passed = np.zeros(self.capacity, dtype=bool)
+        self._qualities: list[Optional[FaceQuality]] = [None] * self.capacity
+        self._next = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _crop(self, index: int) -> np.ndarray:
+        height, width = self._shapes[index]
+        return self._slots[index, : height * width * 3].reshape(height, width, 3)
+
+    def push(self, face_roi: np.ndarray, quality: FaceQuality) -> None:
+        """
+        Store a face crop, overwriting the oldest one when full.
+
+        Parameters:
+            face_roi (np.ndarray): The BGR face ROI.
+            quality (FaceQuality): Its quality score.
+        """
+        height, width = face_roi.shape[:2]
+        scale = min(1.0, self.max_side / max(height, width))
+        if scale < 1.0:
+            height, width = max(round(height * scale), 1), max(round(width * scale), 1)
+        index = self._next
+        self._shapes[index] = height, width
+        crop = self._crop(index)
+        if scale < 1.0:
+            cv2.resize(face_roi, (width, height), crop, 0, 0, cv2.INTER_AREA)
+        else:
+            np.copyto(crop, face_roi)
+        self._scores[index] = quality.score
+        self._passed[index] = quality.passed
+        self._qualities[index] = quality
+        self._next = (index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def best(self) -> tuple[Optional[np.ndarray], Optional[FaceQuality]]:
+        """
+        Pick the best stored crop.
+
+        Returns:
+            face_crop (np.ndarray): The highest scoring crop that passed the gate, else the highest scoring one.
+                It is a view into the buffer, valid until the next `push`.
+            quality (FaceQuality): Its quality, None if the buffer is empty.
+        """
+        if self.size == 0:
+            return None, None
+        scores = np.where(self._passed[: self.size], self._scores[: self.size], -1.0)
+        if not self._passed[: self.size].any():
+            scores = self._scores[: self.size]
+        index = int(np.argmax(scores))
+        return self._crop(index), self._qualities[index]
+
+    def reset(self) -> None:
+        """Forget the stored crops, e.g. when the face leaves or after a recognition."""
+        self._next = 0
+        self.size = 0
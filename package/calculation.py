@@ -3,6 +3,7 @@ import mediapipe
 import numpy as np
 
 import package.config as config
+from package.face_flow_tracker import TrackedDetection
 
 
 class Calculation:
@@ -32,6 +33,56 @@ class Calculation:
         center = [center_x, center_y]
         return bounding_box, center
 
+    def detection_region(self, start_point: list, end_point: list, margin: int) -> tuple[int, int, int, int]:
+        """
+        Get the part of the image face detection runs on, the detection range with a margin.
+
+        Parameters:
+            start_point (list): The top left corner of the detection range.
+            end_point (list): The bottom right corner of the detection range.
+            margin (int): Pixels added on every side, so faces centered near the edge are whole.
+
+        Returns:
+            region (tuple[int, int, int, int]): x1, y1, x2, y2 clipped to the image.
+        """
+        x1 = min(max(min(start_point[0], end_point[0]) - margin, 0), self.image_width)
+        y1 = min(max(min(start_point[1], end_point[1]) - margin, 0), self.image_height)
+        x2 = min(max(max(start_point[0], end_point[0]) + margin, 0), self.image_width)
+        y2 = min(max(max(start_point[1], end_point[1]) + margin, 0), self.image_height)
+        return x1, y1, x2, y2
+
+    def map_detections(self, detections: list, region: tuple) -> list[TrackedDetection]:
+        """
+        Convert detections relative to a region of the image into detections relative to the whole image.
+
+        Parameters:
+            detections (list): The mediapipe detections found in the region.
+            region (tuple): x1, y1, x2, y2 of the region.
+
+        Returns:
+            detections (list[TrackedDetection]): The same faces, read like mediapipe detections of the image.
+        """
+        x1, y1, x2, y2 = region
+        offset = np.array([x1, y1], dtype=np.float32)
+        scale = np.array([x2 - x1, y2 - y1], dtype=np.float32)
+        mapped = []
+        for detection in detections:
+            box = detection.location_data.relative_bounding_box
+            corners = np.array([[box.xmin, box.ymin], [box.xmin + box.width, box.ymin + box.height]], dtype=np.float32)
+            keypoints = np.array(
+                [[point.x, point.y] for point in detection.location_data.relative_keypoints], dtype=np.float32
+            )
+            mapped.append(
+                TrackedDetection(
+                    (corners * scale + offset).ravel(),
+                    keypoints.reshape(-1, 2) * scale + offset,
+                    detection.score[0],
+                    self.image_width,
+                    self.image_height,
+                )
+            )
+        return mapped
+
     def get_eyes_boundingbox(self, detection: mediapipe, bounding_height: mediapipe) -> tuple[list, list]:
         """
         Get the eyes bounding box coordinates converted by mediapipe data format to the actual image size.
@@ -77,8 +128,8 @@ class Calculation:
         Grayscale the eyes ROI and image processing.
 
         Parameters:
-            eye_left_roi (np.ndarray): The left eye ROI.
-            eye_right_roi (np.ndarray): The right eye ROI.
+            eye_left_roi (np.ndarray): The left eye ROI, BGR or already grayscale.
+            eye_right_roi (np.ndarray): The right eye ROI, BGR or already grayscale.
             threshold_value (int): The threshold value for grayscale.
 
         Returns:
@@ -90,8 +141,10 @@ class Calculation:
                 eye_left_roi = eye_right_roi
             elif eye_right_roi.size == 0:
                 eye_right_roi = eye_left_roi
-            left_eye_gary = cv2.cvtColor(eye_left_roi, cv2.COLOR_BGR2GRAY)
-            right_eye_gary = cv2.cvtColor(eye_right_roi, cv2.COLOR_BGR2GRAY)
+            left_eye_gary = cv2.cvtColor(eye_left_roi, cv2.COLOR_BGR2GRAY) if eye_left_roi.ndim == 3 else eye_left_roi
+            right_eye_gary = (
+                cv2.cvtColor(eye_right_roi, cv2.COLOR_BGR2GRAY) if eye_right_roi.ndim == 3 else eye_right_roi
+            )
             left_eye_gary = cv2.GaussianBlur(left_eye_gary, (3, 3), 0)
             right_eye_gary = cv2.GaussianBlur(right_eye_gary, (3, 3), 0)
             ret, left_eye_gary = cv2.threshold(left_eye_gary, threshold_value, 255, cv2.THRESH_BINARY)
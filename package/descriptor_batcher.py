@@ -0,0 +1,114 @@
+"""
+Micro-batching of dlib descriptor computation across faces and cameras.
+"""
+
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from typing import Optional
+
+import numpy as np
+
+import package.config as config
+from package.predictor import Predictor
+
+
+class DescriptorBatcher:
+    """
+    Collect pending face ROIs for up to `max_batch` items or `max_wait_ms` milliseconds, align them,
+    run one batched `compute_face_descriptor` call over the chips and scatter the results back. \n
+    The ResNet forward pass of a batch runs as one set of matrix products, which uses more CPU
+    cores than one face at a time. A lone face waits at most `max_wait_ms` for company.
+    """
+
+    def __init__(self, predictor: Predictor, max_batch: int = 8, max_wait_ms: float = 5.0):
+        self.predictor = predictor
+        self.max_batch = max(max_batch, 1)
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.faces = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="DescriptorBatcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def mean_batch_size(self) -> float:
+        """The average number of faces per batched call."""
+        return self.faces / self.batches if self.batches else 0.0
+
+    def submit(self, face_roi: np.ndarray) -> Future:
+        """
+        Queue a face ROI.
+
+        Parameters:
+            face_roi (np.ndarray): The face ROI.
+
+        Returns:
+            future (Future): Resolves to `(face_descriptor, face_chip)`, `(None, None)` if no face could be aligned.
+        """
+        future = Future()
+        self._queue.put((face_roi, future))
+        return future
+
+    def extract(
+        self, face_roi: np.ndarray, timeout: Optional[float] = None
+    ) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Queue a face ROI and wait for its descriptor and chip."""
+        return self.submit(face_roi).result(timeout)
+
+    def _collect(self) -> list[tuple[np.ndarray, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return [item for item in batch if item is not None]
+
+    def _run(self) -> None:
+        while self._running:
+            batch = self._collect()
+            if batch:
+                self._compute(batch)
+
+    def _compute(self, batch: list[tuple[np.ndarray, Future]]) -> None:
+        chips, futures = [], []
+        for face_roi, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                face_chip, _ = self.predictor.aligner.align(face_roi)
+            except Exception as err:
+                future.set_exception(err)
+                continue
+            if face_chip is None:
+                future.set_result((None, None))
+                continue
+            chips.append(face_chip)
+            futures.append(future)
+        if not futures:
+            return
+
+        try:
+            descriptors = self.predictor.dlib_recognition_model.compute_face_descriptor(chips)
+        except Exception as err:
+            config.logger.debug(traceback.format_exc())
+            for future in futures:
+                future.set_exception(err)
+            return
+        self.batches += 1
+        self.faces += len(futures)
+        for future, face_chip, face_descriptor in zip(futures, chips, descriptors):
+            future.set_result((np.array(face_descriptor), face_chip))
+
+    def close(self) -> None:
+        self._running = False
+        self._queue.put(None)
+        self._thread.join(timeout=2)
@@ -0,0 +1,76 @@
+"""
+Face alignment: normalize every face ROI to the 150x150 chip the dlib ResNet model is trained on.
+"""
+
+from typing import Optional
+
+import cv2
+import dlib
+import numpy as np
+
+import package.config as config
+
+CHIP_SIZE = 150
+CHIP_PADDING = 0.25
+# Larger ROIs are downscaled before landmarking, the chip is sampled from at most this many pixels per side.
+MAX_ROI_SIDE = 2 * CHIP_SIZE
+
+
+class FaceAligner:
+    """
+    Landmark a face ROI and cut the aligned `CHIP_SIZE` x `CHIP_SIZE` face chip with `dlib.get_face_chip`. \n
+    The chip is what `compute_face_descriptor(img, shape)` extracts internally, so descriptors from chips
+    match the previous ones. ROIs larger than `max_roi_side` are downscaled first, which keeps the cost of
+    a recognition constant however close the person stands. The chip is small enough to hand to worker
+    processes, upload as the thumbnail and cache.
+    """
+
+    def __init__(self, dlib_predictor: dlib.shape_predictor, max_roi_side: int = MAX_ROI_SIDE):
+        self.dlib_predictor = dlib_predictor
+        self.max_roi_side = max_roi_side
+
+    def align(self, face_roi: np.ndarray) -> tuple[Optional[np.ndarray], Optional[dlib.full_object_detection]]:
+        """
+        Align a face ROI.
+
+        Parameters:
+            face_roi (np.ndarray): The BGR face ROI.
+
+        Returns:
+            face_chip (np.ndarray): The aligned BGR face chip, None if the image is too dark.
+            feature_coordinates (dlib.full_object_detection): The 68 landmarks in `face_roi` coordinates.
+        """
+        if np.mean(face_roi) < 10:
+            config.logger.error("The image is incorrect.")
+            return None, None
+
+        scale = self.max_roi_side / max(face_roi.shape[:2]) if self.max_roi_side > 0 else 1.0
+        if scale < 1.0:
+            face_roi = cv2.resize(face_roi, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        landmarks_frame = cv2.cvtColor(face_roi, cv2.COLOR_BGR2RGB)
+        dlib_coordinate = dlib.rectangle(0, 0, face_roi.shape[0], face_roi.shape[1])
+        feature_coordinates = self.dlib_predictor(landmarks_frame, dlib_coordinate)
+        face_chip = dlib.get_face_chip(
+            np.ascontiguousarray(face_roi), feature_coordinates, size=CHIP_SIZE, padding=CHIP_PADDING
+        )
+
+        if scale < 1.0:
+            feature_coordinates = FaceAligner._scale_landmarks(feature_coordinates, 1.0 / scale)
+        return face_chip, feature_coordinates
+
+    @staticmethod
+    def _scale_landmarks(feature_coordinates: dlib.full_object_detection, scale: float) -> dlib.full_object_detection:
+        rect = feature_coordinates.rect
+        points = dlib.points()
+        for i in range(feature_coordinates.num_parts):
+            point = feature_coordinates.part(i)
+            points.append(dlib.point(round(point.x * scale), round(point.y * scale)))
+        return dlib.full_object_detection(
+            dlib.rectangle(
+                round(rect.left() * scale),
+                round(rect.top() * scale),
+                round(rect.right() * scale),
+                round(rect.bottom() * scale),
+            ),
+            points,
+        )
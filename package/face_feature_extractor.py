@@ -2,7 +2,6 @@
 Provide FastAPI registered user face feature functionality.
 """
 
-import csv
 import hashlib
 import time
 import traceback
@@ -13,15 +12,15 @@ import dlib
 import numpy as np
 
 import package.config as config
-
-# TODO: 1. 未來將 face features 改成 key-value db
-# TODO: 2. 修正每次註冊都要重新載入 dlib 模型的問題
+import package.gallery_file as gallery_file
+from package.face_aligner import FaceAligner
+from package.model_registry import registry
 
 
 class FaceFeatureExtractor:
     """
     A class to extract face features using dlib. \n
-    It can save the extracted features to a CSV file. \n
+    It can save the extracted features to a gallery file or a legacy CSV file. \n
     CSV format: name,f1,f2,...,f128
     """
 
@@ -36,8 +35,10 @@ class FaceFeatureExtractor:
         self.user_name = (
             user_name if user_name is not None else "User_" + hashlib.md5(str(time.time()).encode()).hexdigest()[:8]
         )
-        self.dlib_predictor = dlib.shape_predictor(dlib_predictor_path)
-        self.dlib_recognition_model = dlib.face_recognition_model_v1(dlib_recognition_model_path)
+        # Shared models: a registration no longer reloads them
+        self.dlib_predictor = registry.shape_predictor(dlib_predictor_path)
+        self.dlib_recognition_model = registry.face_recognition_model(dlib_recognition_model_path)
+        self.aligner = FaceAligner(self.dlib_predictor)
 
     def get_face_roi(self, image: np.ndarray) -> tuple[bool, Optional[dict]]:
         """
@@ -52,7 +53,7 @@ class FaceFeatureExtractor:
         """
         try:
             gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            detector = dlib.get_frontal_face_detector()
+            detector = registry.frontal_face_detector()
             faces = detector(gray_image, 1)
 
             if len(faces) > 0:
@@ -75,12 +76,11 @@ class FaceFeatureExtractor:
         try:
             if face_roi is None or face_roi.size == 0:
                 return False, {"error": "No face ROI provided for feature extraction."}
-            landmarks_frame = cv2.cvtColor(face_roi, cv2.COLOR_BGR2RGB)
-            dlib_coordinate = dlib.rectangle(0, 0, face_roi.shape[0], face_roi.shape[1])
-            feature_coordinates = self.dlib_predictor(landmarks_frame, dlib_coordinate)
-            current_face_descriptor = np.array(
-                self.dlib_recognition_model.compute_face_descriptor(face_roi, feature_coordinates)
-            )
+            # Same alignment as the live recognition, so enrolled and live descriptors are comparable
+            face_chip, _ = self.aligner.align(face_roi)
+            if face_chip is None:
+                return False, {"error": "The face ROI is too dark for feature extraction."}
+            current_face_descriptor = np.array(self.dlib_recognition_model.compute_face_descriptor(face_chip))
             # save_status, message = self._save_feature(current_face_descriptor)
 
             return True, {"face_descriptor": current_face_descriptor}
@@ -91,7 +91,7 @@ class FaceFeatureExtractor:
 
     def save_feature(self, face_descriptor: np.ndarray) -> bool:
         """
-        Save face descriptor to CSV file. \n
+        Append face descriptor to the gallery file (or the legacy CSV file). \n
         CSV format: name,f1,f2,...,f128
 
         Parameters:
@@ -101,11 +101,7 @@ class FaceFeatureExtractor:
             result (bool): Save status.
         """
         try:
-            if isinstance(face_descriptor, np.ndarray):
-                face_descriptor = face_descriptor.tolist()
-            with open(self.feature_csv_path, mode="a+", newline="") as file:
-                writer = csv.writer(file)
-                writer.writerow([self.user_name] + face_descriptor)
+            gallery_file.save_descriptor(self.feature_csv_path, self.user_name, face_descriptor)
             return True, {"message": f"Feature saved successfully for {self.user_name}."}
         except Exception as err:
             return False, {"error": f"Unable to save feature for {self.user_name}. Error: {err}"}
@@ -113,28 +109,18 @@ class FaceFeatureExtractor:
     @staticmethod
     def delete_feature(feature_csv_path: str, user_name: str) -> tuple[bool, Optional[dict]]:
         """
-        Delete face feature from CSV file.
+        Delete face feature from the gallery file (or the legacy CSV file).
 
         Parameters:
             user_name (str): The name of the user whose feature is to be deleted.
-            feature_csv_path (str): The path to the CSV file containing face features.
+            feature_csv_path (str): The path to the gallery or CSV file containing face features.
 
         Returns:
             result (bool): True if deletion was successful, False otherwise.
             message (Optional[dict]): Contains a success message or an error message.
         """
-        deleted = False
         try:
-            with open(feature_csv_path) as file:
-                rows = list(csv.reader(file))
-            with open(feature_csv_path, mode="w", newline="") as file:
-                writer = csv.writer(file)
-                for row in rows:
-                    if row and row[0] == user_name:
-                        deleted = True
-                    if row and row[0] != user_name:
-                        writer.writerow(row)
-            if deleted:
+            if gallery_file.delete_descriptor(feature_csv_path, user_name):
                 return True, {"message": f"User: {user_name} feature deleted successfully."}
             else:
                 return False, {"error": f"No feature found for User: {user_name}."}
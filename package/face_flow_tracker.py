@@ -0,0 +1,248 @@
+"""
+Detect-then-track: face boxes and keypoints carried between MediaPipe detections by sparse optical flow.
+"""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# Lucas-Kanade parameters, an 11 px window on a 2 level pyramid of the half-size frame
+# follows a face moving about 20 px a frame at full size.
+LK_PARAMS = {
+    "winSize": (11, 11),
+    "maxLevel": 1,
+    "criteria": (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
+}
+# A face needs this many tracked corners, fewer cannot give a stable median motion.
+MIN_POINTS = 4
+# Pixels around the faces the flow is computed on, the furthest a face can move between two frames.
+SEARCH_MARGIN = 60
+
+
+class _Point:
+    __slots__ = ["x", "y"]
+
+    def __init__(self, x: float, y: float):
+        self.x = x
+        self.y = y
+
+
+class _BoundingBox:
+    __slots__ = ["xmin", "ymin", "width", "height"]
+
+    def __init__(self, xmin: float, ymin: float, width: float, height: float):
+        self.xmin = xmin
+        self.ymin = ymin
+        self.width = width
+        self.height = height
+
+
+class _LocationData:
+    __slots__ = ["relative_bounding_box", "relative_keypoints"]
+
+    def __init__(self, relative_bounding_box: _BoundingBox, relative_keypoints: list):
+        self.relative_bounding_box = relative_bounding_box
+        self.relative_keypoints = relative_keypoints
+
+
+class TrackedDetection:
+    """A face carried by optical flow, with the attributes of a MediaPipe detection that `FaceApp` reads."""
+
+    __slots__ = ["location_data", "score"]
+
+    def __init__(self, box: np.ndarray, keypoints: np.ndarray, score: float, width: int, height: int):
+        self.location_data = _LocationData(
+            _BoundingBox(box[0] / width, box[1] / height, (box[2] - box[0]) / width, (box[3] - box[1]) / height),
+            [_Point(x / width, y / height) for x, y in keypoints],
+        )
+        self.score = [score]
+
+
+class _FlowFace:
+    __slots__ = ["box", "keypoints", "score", "points"]
+
+    def __init__(self, box: np.ndarray, keypoints: np.ndarray, score: float, points: np.ndarray):
+        self.box = box
+        self.keypoints = keypoints
+        self.score = score
+        self.points = points
+
+
+class FlowTracker:
+    """
+    Run MediaPipe every `detection_interval` frames and follow the faces with Lucas-Kanade flow in between. \n
+    After a detection, corners inside every face box are picked on the grayscale frame downscaled by
+    `flow_scale`. On the next frames they are tracked forwards and backwards; a point is kept if it
+    returns within `max_flow_error` pixels of the downscaled frame.
+    The box and the keypoints move and scale with the median motion of the kept points, so the detection
+    range check, the eye boxes and the blink detection get a face on every frame. \n
+    A new detection is asked for when the interval is over, when no face is tracked, or when the share
+    of kept points of a face, its tracking confidence, falls below `min_confidence`.
+    An interval of 1 detects on every frame and never tracks.
+    """
+
+    def __init__(
+        self,
+        detection_interval: int = 1,
+        min_confidence: float = 0.6,
+        max_points: int = 40,
+        max_flow_error: float = 1.0,
+        flow_scale: float = 0.5,
+    ):
+        self.detection_interval = max(detection_interval, 1)
+        self.min_confidence = min_confidence
+        self.max_points = max_points
+        self.max_flow_error = max_flow_error
+        self.flow_scale = flow_scale
+        self.faces: list[_FlowFace] = []
+        self.frames_since_detection = 0
+        self.confidence = 0.0
+        self.detections = 0
+        self.tracked = 0
+        self.lost = 0
+        self._previous: Optional[np.ndarray] = None
+        self._current: Optional[np.ndarray] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.detection_interval > 1
+
+    def needs_detection(self) -> bool:
+        """True if the next frame should run MediaPipe instead of the tracker."""
+        return not self.enabled or not self.faces or self.frames_since_detection + 1 >= self.detection_interval
+
+    def _flow_image(self, gray: np.ndarray) -> np.ndarray:
+        """Downscale the frame into the buffer of the current flow image, the previous one is kept."""
+        height, width = gray.shape[:2]
+        size = (round(width * self.flow_scale), round(height * self.flow_scale))
+        if self._current is None or self._current.shape != (size[1], size[0]):
+            self._current = np.empty((size[1], size[0]), dtype=np.uint8)
+        if size == (width, height):
+            np.copyto(self._current, gray)
+        else:
+            cv2.resize(gray, size, self._current, 0, 0, cv2.INTER_AREA)
+        return self._current
+
+    def start(self, gray: np.ndarray, detections: list) -> None:
+        """
+        Pick the points to track from a fresh MediaPipe detection.
+
+        Parameters:
+            gray (np.ndarray): The grayscale frame the detections were found in.
+            detections (list): The MediaPipe detections, empty for none.
+        """
+        self.detections += 1
+        self.frames_since_detection = 0
+        self.faces = []
+        if not self.enabled:
+            return
+        height, width = gray.shape[:2]
+        flow_image = self._flow_image(gray)
+        for detection in detections:
+            relative_box = detection.location_data.relative_bounding_box
+            box = np.array(
+                [
+                    relative_box.xmin * width,
+                    relative_box.ymin * height,
+                    (relative_box.xmin + relative_box.width) * width,
+                    (relative_box.ymin + relative_box.height) * height,
+                ],
+                dtype=np.float32,
+            )
+            # Corners of the inner face only, the background does not move with it.
+            margin_x, margin_y = (box[2] - box[0]) * 0.15, (box[3] - box[1]) * 0.1
+            x1, y1 = (
+                max(int((box[0] + margin_x) * self.flow_scale), 0),
+                max(int((box[1] + margin_y) * self.flow_scale), 0),
+            )
+            x2 = min(int((box[2] - margin_x) * self.flow_scale), flow_image.shape[1])
+            y2 = min(int((box[3] - margin_y) * self.flow_scale), flow_image.shape[0])
+            if x2 <= x1 or y2 <= y1:
+                continue
+            points = cv2.goodFeaturesToTrack(flow_image[y1:y2, x1:x2], self.max_points, 0.01, 3)
+            if points is None or len(points) < MIN_POINTS:
+                continue
+            points += np.array([x1, y1], dtype=np.float32)
+            keypoints = np.array(
+                [[point.x * width, point.y * height] for point in detection.location_data.relative_keypoints],
+                dtype=np.float32,
+            )
+            self.faces.append(_FlowFace(box, keypoints, detection.score[0], points))
+        if self.faces:
+            self._previous, self._current = self._current, self._previous
+
+    def track(self, gray: np.ndarray) -> Optional[list[TrackedDetection]]:
+        """
+        Move the faces of the previous frame onto this one.
+
+        Parameters:
+            gray (np.ndarray): The grayscale frame, the same size as at `start`.
+
+        Returns:
+            detections (Optional[list[TrackedDetection]]): The tracked faces, None if tracking was lost
+                and MediaPipe has to run on this frame.
+        """
+        if not self.faces or self._previous is None:
+            return None
+        height, width = gray.shape[:2]
+        flow_image = self._flow_image(gray)
+        if flow_image.shape != self._previous.shape:
+            return None
+        counts = [len(face.points) for face in self.faces]
+        points = np.concatenate([face.points for face in self.faces])
+        # Only the area around the faces goes through the image pyramids, not the whole frame.
+        margin = SEARCH_MARGIN * self.flow_scale
+        x1, y1 = np.maximum(points.reshape(-1, 2).min(axis=0) - margin, 0).astype(int)
+        x2, y2 = np.minimum(points.reshape(-1, 2).max(axis=0) + margin, flow_image.shape[::-1]).astype(int)
+        offset = np.array([x1, y1], dtype=np.float32)
+        previous, current = self._previous[y1:y2, x1:x2], flow_image[y1:y2, x1:x2]
+        local = points - offset
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(previous, current, local, None, **LK_PARAMS)
+        returned, back_status, _ = cv2.calcOpticalFlowPyrLK(current, previous, moved, None, **LK_PARAMS)
+        error = np.linalg.norm((local - returned).reshape(-1, 2), axis=1)
+        kept = (status.ravel() == 1) & (back_status.ravel() == 1) & (error < self.max_flow_error)
+        moved += offset
+
+        detections, start = [], 0
+        confidence = 1.0
+        for face, count in zip(self.faces, counts):
+            face_kept = kept[start : start + count]
+            old, new = points[start : start + count][face_kept], moved[start : start + count][face_kept]
+            start += count
+            confidence = min(confidence, len(old) / count)
+            if len(old) < MIN_POINTS or len(old) / count < self.min_confidence:
+                self.confidence = confidence
+                self.lost += 1
+                self.faces = []
+                return None
+            old, new = old.reshape(-1, 2), new.reshape(-1, 2)
+            old_center, new_center = np.median(old, axis=0), np.median(new, axis=0)
+            old_spread = np.linalg.norm(old - old_center, axis=1)
+            new_spread = np.linalg.norm(new - new_center, axis=1)
+            valid = old_spread > 1
+            scale = float(np.median(new_spread[valid] / old_spread[valid])) if valid.any() else 1.0
+            # The box and keypoints are in frame pixels, the points in flow image pixels.
+            old_center, new_center = old_center / self.flow_scale, new_center / self.flow_scale
+            face.box = ((face.box.reshape(2, 2) - old_center) * scale + new_center).ravel()
+            face.keypoints = (face.keypoints - old_center) * scale + new_center
+            face.points = new.reshape(-1, 1, 2)
+            detections.append(TrackedDetection(face.box, face.keypoints, face.score, width, height))
+
+        self._previous, self._current = self._current, self._previous
+        self.confidence = confidence
+        self.frames_since_detection += 1
+        self.tracked += 1
+        return detections
+
+    def reset(self) -> None:
+        self.faces = []
+
+    def stats(self) -> dict:
+        return {
+            "detection_interval": self.detection_interval,
+            "detections": self.detections,
+            "tracked": self.tracked,
+            "lost": self.lost,
+            "confidence": round(self.confidence, 2),
+        }
@@ -0,0 +1,331 @@
+"""
+Registered face gallery kept as one contiguous descriptor matrix.
+"""
+
+import csv
+import itertools
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Optional
+
+import numpy as np
+
+DESCRIPTOR_DIMENSION = 128
+# Identifies a gallery object for the lifetime of the process; unlike `id()`, never reused.
+_GALLERY_TOKENS = itertools.count(1)
+
+
+class FaceGallery:
+    """
+    Registered face descriptors stored as a contiguous float32 (N, D) matrix. \n
+    `names[i]` owns row `i` of the matrix and `squared_norms[i]` caches `||row_i||^2`,
+    so a 1:N query is a single matrix-vector product:
+    `||q - g||^2 = ||q||^2 + ||g||^2 - 2 * g @ q`.
+
+    The dict interface (`items`, `keys`, `__getitem__`, `__setitem__`, ...) is kept
+    for code that still treats `registered_face_descriptor` as `{name: descriptor}`.
+    """
+
+    def __init__(self, dimension: int = DESCRIPTOR_DIMENSION, capacity: int = 0):
+        self.dimension = dimension
+        self._matrix = np.zeros((capacity, dimension), dtype=np.float32)
+        self._squared_norms = np.zeros(capacity, dtype=np.float32)
+        self._names: list[str] = []
+        self._rows: dict[str, int] = {}
+        self.token = next(_GALLERY_TOKENS)
+        self.version = 0
+
+    @classmethod
+    def from_dict(cls, descriptors: Mapping[str, np.ndarray]) -> "FaceGallery":
+        """
+        Build a gallery from a `{name: descriptor}` mapping.
+
+        Parameters:
+            descriptors (Mapping[str, np.ndarray]): The registered face descriptors.
+
+        Returns:
+            gallery (FaceGallery): The gallery holding the same descriptors.
+        """
+        if isinstance(descriptors, FaceGallery):
+            return descriptors
+        names = list(descriptors.keys())
+        if not names:
+            return cls()
+        matrix = np.asarray([descriptors[name] for name in names], dtype=np.float32)
+        return cls.from_arrays(names, matrix)
+
+    @classmethod
+    def from_arrays(cls, names: list[str], matrix: np.ndarray) -> "FaceGallery":
+        """
+        Build a gallery from a names list and a parallel (N, D) descriptor matrix. \n
+        Later duplicates of a name replace earlier rows, matching the CSV loading behaviour.
+
+        Parameters:
+            names (list[str]): The user names.
+            matrix (np.ndarray): The descriptors, one row per name.
+
+        Returns:
+            gallery (FaceGallery): The gallery.
+        """
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(names):
+            raise ValueError(f"Descriptor matrix shape {matrix.shape} does not match {len(names)} names.")
+
+        last_row = {name: row for row, name in enumerate(names)}
+        if len(last_row) != len(names):
+            keep = np.array(sorted(last_row.values()), dtype=np.intp)
+            names = [names[row] for row in keep]
+            matrix = matrix[keep]
+
+        gallery = cls(dimension=matrix.shape[1])
+        gallery._matrix = matrix
+        gallery._squared_norms = np.einsum("ij,ij->i", matrix, matrix)
+        gallery._names = list(names)
+        gallery._rows = {name: row for row, name in enumerate(gallery._names)}
+        return gallery
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The (N, D) float32 descriptor matrix."""
+        return self._matrix[: len(self._names)]
+
+    @property
+    def squared_norms(self) -> np.ndarray:
+        """The precomputed squared norm of every descriptor row."""
+        return self._squared_norms[: len(self._names)]
+
+    @property
+    def names(self) -> np.ndarray:
+        """The user names parallel to the matrix rows."""
+        return np.asarray(self._names, dtype=object)
+
+    def _ensure_capacity(self, size: int) -> None:
+        if size <= self._matrix.shape[0] and self._matrix.flags.writeable:
+            return
+        # Grow, or copy a read-only (memory-mapped) matrix before the first write.
+        capacity = max(size, 2 * self._matrix.shape[0], 16) if size > self._matrix.shape[0] else size
+        matrix = np.zeros((capacity, self.dimension), dtype=np.float32)
+        squared_norms = np.zeros(capacity, dtype=np.float32)
+        matrix[: len(self._names)] = self.matrix
+        squared_norms[: len(self._names)] = self.squared_norms
+        self._matrix = matrix
+        self._squared_norms = squared_norms
+
+    def add(self, name: str, descriptor: np.ndarray) -> None:
+        """
+        Add or replace the descriptor of a user.
+
+        Parameters:
+            name (str): The user name.
+            descriptor (np.ndarray): The face descriptor.
+        """
+        descriptor = np.asarray(descriptor, dtype=np.float32).reshape(-1)
+        if len(self._names) == 0 and self._matrix.shape[0] == 0:
+            self.dimension = descriptor.shape[0]
+            self._matrix = np.zeros((0, self.dimension), dtype=np.float32)
+        if descriptor.shape[0] != self.dimension:
+            raise ValueError(f"Descriptor dimension {descriptor.shape[0]} != gallery dimension {self.dimension}.")
+
+        row = self._rows.get(name)
+        if row is None:
+            row = len(self._names)
+            self._ensure_capacity(row + 1)
+            self._names.append(name)
+            self._rows[name] = row
+        else:
+            self._ensure_capacity(len(self._names))
+        self._matrix[row] = descriptor
+        self._squared_norms[row] = descriptor @ descriptor
+        self.version += 1
+
+    def remove(self, name: str) -> bool:
+        """
+        Remove a user by moving the last row into its slot.
+
+        Parameters:
+            name (str): The user name.
+
+        Returns:
+            result (bool): True if the user existed.
+        """
+        row = self._rows.pop(name, None)
+        if row is None:
+            return False
+        self._ensure_capacity(len(self._names))
+        last = len(self._names) - 1
+        if row != last:
+            last_name = self._names[last]
+            self._matrix[row] = self._matrix[last]
+            self._squared_norms[row] = self._squared_norms[last]
+            self._names[row] = last_name
+            self._rows[last_name] = row
+        self._names.pop()
+        self.version += 1
+        return True
+
+    def updated(self, upserts: Mapping[str, np.ndarray], removals: Iterable[str] = ()) -> "FaceGallery":
+        """
+        Return a new gallery with enrolls and deletes applied, leaving this one unchanged
+        for the readers still searching it. \n
+        When the changes only append new users and the buffer has spare rows, the new gallery
+        shares the buffer and writes past the rows of this one, so an enroll does not copy the
+        gallery. This gallery is then frozen to its own rows and copies them before any later write.
+
+        Parameters:
+            upserts (Mapping[str, np.ndarray]): The enrolled descriptors keyed by user name.
+            removals (Iterable[str]): The deleted user names.
+
+        Returns:
+            gallery (FaceGallery): The updated gallery.
+        """
+        removals = [name for name in removals if name in self._rows]
+        size = len(self._names)
+        if size == 0:
+            gallery = FaceGallery.from_dict(upserts) if upserts else FaceGallery(self.dimension)
+            gallery.version = self.version + 1
+            return gallery
+
+        gallery = FaceGallery(self.dimension)
+        gallery._names = list(self._names)
+        gallery._rows = dict(self._rows)
+        gallery.version = self.version
+        appends_only = not removals and not any(name in self._rows for name in upserts)
+        if appends_only and self._matrix.flags.writeable and size + len(upserts) <= self._matrix.shape[0]:
+            gallery._matrix = self._matrix
+            gallery._squared_norms = self._squared_norms
+            self._matrix = self._matrix[:size]
+            self._squared_norms = self._squared_norms[:size]
+            self._matrix.flags.writeable = False
+            self._squared_norms.flags.writeable = False
+        else:
+            capacity = max(size + len(upserts), self._matrix.shape[0])
+            gallery._matrix = np.zeros((capacity, self.dimension), dtype=np.float32)
+            gallery._squared_norms = np.zeros(capacity, dtype=np.float32)
+            gallery._matrix[:size] = self.matrix
+            gallery._squared_norms[:size] = self.squared_norms
+
+        for name in removals:
+            gallery.remove(name)
+        for name, descriptor in upserts.items():
+            gallery.add(name, descriptor)
+        return gallery
+
+    def squared_distances(self, descriptor: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Squared Euclidean distances from a query descriptor to every registered row.
+
+        Parameters:
+            descriptor (np.ndarray): The query face descriptor.
+            rows (Optional[np.ndarray]): Only compute the distances of these rows.
+
+        Returns:
+            distances (np.ndarray): One float32 squared distance per row.
+        """
+        query = np.asarray(descriptor, dtype=np.float32).reshape(-1)
+        if rows is None:
+            distances = self.squared_norms - 2.0 * (self.matrix @ query)
+        else:
+            distances = self._squared_norms[rows] - 2.0 * (self._matrix[rows] @ query)
+        distances += query @ query
+        np.maximum(distances, 0.0, out=distances)
+        return distances
+
+    def search(self, descriptor: np.ndarray, top_k: int = 1) -> list[tuple[str, float]]:
+        """
+        Find the `top_k` nearest registered users. \n
+        Candidates are chosen with the BLAS product and their distances recomputed exactly,
+        so thresholds compare against the same value the per-user loop used to produce.
+
+        Parameters:
+            descriptor (np.ndarray): The query face descriptor.
+            top_k (int): The number of matches to return.
+
+        Returns:
+            matches (list[tuple[str, float]]): `(name, distance)` pairs, nearest first.
+        """
+        size = len(self._names)
+        if size == 0 or top_k <= 0:
+            return []
+        top_k = min(top_k, size)
+        distances = self.squared_distances(descriptor)
+        if top_k < size:
+            candidates = np.argpartition(distances, top_k - 1)[:top_k]
+        else:
+            candidates = np.arange(size)
+        return self.rank(descriptor, candidates)
+
+    def rank(self, descriptor: np.ndarray, rows: np.ndarray) -> list[tuple[str, float]]:
+        """
+        Compute exact distances for the given rows and sort them.
+
+        Parameters:
+            descriptor (np.ndarray): The query face descriptor.
+            rows (np.ndarray): The candidate row indexes.
+
+        Returns:
+            matches (list[tuple[str, float]]): `(name, distance)` pairs, nearest first.
+        """
+        query = np.asarray(descriptor, dtype=np.float64).reshape(-1)
+        exact = np.linalg.norm(self.matrix[rows].astype(np.float64) - query, axis=1)
+        order = np.argsort(exact, kind="stable")
+        return [(self._names[rows[i]], float(exact[i])) for i in order]
+
+    def to_dict(self) -> dict[str, np.ndarray]:
+        """Return the gallery as a `{name: descriptor}` dict."""
+        return {name: self._matrix[row].copy() for name, row in self._rows.items()}
+
+    # Dict compatibility
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._names))
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._matrix[self._rows[name]]
+
+    def __setitem__(self, name: str, descriptor: np.ndarray) -> None:
+        self.add(name, descriptor)
+
+    def __delitem__(self, name: str) -> None:
+        if not self.remove(name):
+            raise KeyError(name)
+
+    def get(self, name: str, default: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        row = self._rows.get(name)
+        return default if row is None else self._matrix[row]
+
+    def keys(self) -> list[str]:
+        return list(self._names)
+
+    def values(self) -> list[np.ndarray]:
+        return [self._matrix[row] for row in range(len(self._names))]
+
+    def items(self) -> list[tuple[str, np.ndarray]]:
+        return [(name, self._matrix[row]) for row, name in enumerate(self._names)]
+
+
+def load_csv_gallery(csv_path: str) -> FaceGallery:
+    """
+    Load a gallery from the CSV model file. \n
+    CSV format: name,f1,f2,...,f128
+
+    Parameters:
+        csv_path (str): The path to the CSV file.
+
+    Returns:
+        gallery (FaceGallery): The loaded gallery, empty if the file has no valid rows.
+    """
+    names = []
+    rows = []
+    with open(csv_path, newline="") as model:
+        for row in csv.reader(model):
+            if len(row) < DESCRIPTOR_DIMENSION + 1:
+                continue
+            names.append(row[0])
+            rows.append(row[1:])
+    if not names:
+        return FaceGallery()
+    return FaceGallery.from_arrays(names, np.array(rows, dtype=np.float32))
@@ -0,0 +1,155 @@
+"""
+Cheap face quality gate, run on the MediaPipe ROI before a recognition is scheduled.
+"""
+
+from collections.abc import Sequence
+from typing import Any, Optional
+
+import cv2
+import numpy as np
+
+SAMPLE_SIZE = 64
+
+
+class FaceQuality:
+    """The quality scores of one face ROI and the gate decision, `reason` names the failed check."""
+
+    __slots__ = ["sharpness", "brightness", "symmetry", "score", "passed", "reason"]
+
+    def __init__(self, sharpness: float, brightness: float, symmetry: float, passed: bool, reason: str):
+        self.sharpness = sharpness
+        self.brightness = brightness
+        self.symmetry = symmetry
+        # Ranking score for choosing between crops of the same face.
+        self.score = sharpness * symmetry
+        self.passed = passed
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return (
+            f"FaceQuality(sharpness={self.sharpness:.1f}, brightness={self.brightness:.1f}, "
+            f"symmetry={self.symmetry:.2f}, passed={self.passed}, reason={self.reason!r})"
+        )
+
+
+class FaceQualityScorer:
+    """
+    Score a face ROI and decide whether it is worth a dlib recognition. \n
+    sharpness   Laplacian variance of a `SAMPLE_SIZE` x `SAMPLE_SIZE` gray crop, so it does not depend on the ROI size
+    brightness  the HSV value mean from `BlinkDetector.update_brightness` when known, else the gray crop mean
+    symmetry    min / max of the horizontal nose-to-eye distances of the MediaPipe keypoints, 1.0 is frontal
+
+    Faces below a threshold are skipped; the counters report how many extractions the gate saved.
+    """
+
+    def __init__(
+        self,
+        minimum_sharpness: float = 20.0,
+        minimum_brightness: float = 40.0,
+        minimum_symmetry: float = 0.4,
+        enabled: bool = True,
+    ):
+        self.minimum_sharpness = minimum_sharpness
+        self.minimum_brightness = minimum_brightness
+        self.minimum_symmetry = minimum_symmetry
+        self.enabled = enabled
+        self.evaluated = 0
+        self.skipped = {"blur": 0, "dark": 0, "pose": 0}
+        # Scratch buffers, scoring a frame allocates no image memory.
+        self._sample = np.empty((SAMPLE_SIZE, SAMPLE_SIZE, 3), dtype=np.uint8)
+        self._gray = np.empty((SAMPLE_SIZE, SAMPLE_SIZE), dtype=np.uint8)
+        self._laplacian = np.empty((SAMPLE_SIZE, SAMPLE_SIZE), dtype=np.float32)
+
+    @staticmethod
+    def symmetry(keypoints: Optional[Sequence[Any]]) -> float:
+        """
+        Frontal pose score from MediaPipe keypoints (0: right eye, 1: left eye, 2: nose tip).
+
+        Parameters:
+            keypoints (Sequence): Keypoints with `x` and `y` attributes, relative or absolute.
+
+        Returns:
+            symmetry (float): 1.0 for a frontal face, towards 0.0 as the head turns sideways.
+        """
+        if not keypoints or len(keypoints) < 3:
+            return 1.0
+        right_eye, left_eye, nose = keypoints[0], keypoints[1], keypoints[2]
+        right_distance = abs(nose.x - right_eye.x)
+        left_distance = abs(left_eye.x - nose.x)
+        largest = max(right_distance, left_distance)
+        if largest == 0:
+            return 0.0
+        return min(right_distance, left_distance) / largest
+
+    def score(
+        self, face_roi: np.ndarray, keypoints: Optional[Sequence[Any]] = None, brightness: Optional[float] = None
+    ) -> FaceQuality:
+        """
+        Score a face ROI without counting it, for ranking crops before the gate decision.
+
+        Parameters:
+            face_roi (np.ndarray): The BGR face ROI.
+            keypoints (Optional[Sequence]): The MediaPipe keypoints of the face.
+            brightness (Optional[float]): The brightness already measured by the blink detector, 0 or None if not.
+
+        Returns:
+            quality (FaceQuality): The scores and the gate decision.
+        """
+        cv2.resize(face_roi, (SAMPLE_SIZE, SAMPLE_SIZE), self._sample, 0, 0, cv2.INTER_AREA)
+        cv2.cvtColor(self._sample, cv2.COLOR_BGR2GRAY, self._gray)
+        sharpness = float(cv2.Laplacian(self._gray, cv2.CV_32F, self._laplacian).var())
+        if not brightness:
+            brightness = float(self._gray.mean())
+        symmetry = FaceQualityScorer.symmetry(keypoints)
+
+        reason = ""
+        if sharpness < self.minimum_sharpness:
+            reason = "blur"
+        elif brightness < self.minimum_brightness:
+            reason = "dark"
+        elif symmetry < self.minimum_symmetry:
+            reason = "pose"
+        passed = not self.enabled or not reason
+        return FaceQuality(sharpness, float(brightness), symmetry, passed, reason)
+
+    def record(self, quality: FaceQuality) -> bool:
+        """
+        Count a gate decision.
+
+        Parameters:
+            quality (FaceQuality): The quality of the face about to be recognized.
+
+        Returns:
+            passed (bool): True if the face should be recognized.
+        """
+        self.evaluated += 1
+        if not quality.passed:
+            self.skipped[quality.reason] += 1
+        return quality.passed
+
+    def evaluate(
+        self, face_roi: np.ndarray, keypoints: Optional[Sequence[Any]] = None, brightness: Optional[float] = None
+    ) -> FaceQuality:
+        """Score a face ROI and count the gate decision, see `score`."""
+        quality = self.score(face_roi, keypoints, brightness)
+        self.record(quality)
+        return quality
+
+    def stats(self, extraction_seconds: float = 0.0) -> dict:
+        """
+        Report the gate counters.
+
+        Parameters:
+            extraction_seconds (float): The mean time of one recognition, to estimate the saved work.
+
+        Returns:
+            stats (dict): Evaluated and skipped counts, skip ratio and saved extraction seconds.
+        """
+        skipped = sum(self.skipped.values())
+        return {
+            "evaluated": self.evaluated,
+            "skipped": skipped,
+            "skipped_by_reason": dict(self.skipped),
+            "skipped_ratio": round(skipped / self.evaluated, 3) if self.evaluated else 0.0,
+            "saved_extraction_seconds": round(skipped * extraction_seconds, 3),
+        }
@@ -0,0 +1,234 @@
+"""
+Face tracking across MediaPipe detections, with a per-track identity cache.
+"""
+
+import time
+from typing import Optional
+
+import numpy as np
+
+
+class FaceTrack:
+    """One tracked face, with the identity of its last recognition."""
+
+    __slots__ = [
+        "track_id",
+        "box",
+        "center",
+        "missed",
+        "passed",
+        "distance",
+        "name",
+        "face_chip",
+        "quality_score",
+        "recognized_at",
+        "presence",
+    ]
+
+    def __init__(self, track_id: int, box: list):
+        self.track_id = track_id
+        self.box = box
+        self.center = FaceTracker.box_center(box)
+        self.missed = 0
+        self.passed = False
+        self.distance = 999.0
+        self.name: Optional[str] = None
+        self.face_chip: Optional[np.ndarray] = None
+        self.quality_score = 0.0
+        self.recognized_at: Optional[float] = None
+        # Counts the times the face left, a recognition submitted before then is not cached.
+        self.presence = 0
+
+    @property
+    def recognized(self) -> bool:
+        return self.recognized_at is not None
+
+    def result(self) -> list:
+        """The cached recognition in the result format of the recognition executor."""
+        return [self.passed, self.distance, self.name, self.face_chip]
+
+    def forget(self) -> None:
+        """Drop the cached identity, the next face on this track may be someone else."""
+        self.presence += 1
+        self.passed = False
+        self.distance = 999.0
+        self.name = None
+        self.face_chip = None
+        self.quality_score = 0.0
+        self.recognized_at = None
+
+
+class FaceTracker:
+    """
+    Associate face boxes across frames and give every face a track ID. \n
+    A box continues the track it overlaps most (IoU at least `iou_threshold`); failing that, the nearest
+    track whose center moved less than `max_center_shift` box widths. A track not seen for `max_missed`
+    frames is dropped. \n
+    Each track caches its identity and distance for `identity_ttl` seconds. A recognition is only needed
+    for a new or expired track, or when the face quality grew by `quality_gain` times over the crop that
+    was recognized; otherwise the cached result is reused and counted as a hit. The identity is dropped
+    as soon as the face is missing from a frame (out of the detection range, or gone): another person
+    stepping into the same spot is recognized, not given the decision of the previous one.
+    """
+
+    def __init__(
+        self,
+        identity_ttl: float = 5.0,
+        iou_threshold: float = 0.3,
+        max_center_shift: float = 0.5,
+        max_missed: int = 5,
+        quality_gain: float = 1.5,
+    ):
+        self.identity_ttl = identity_ttl
+        self.iou_threshold = iou_threshold
+        self.max_center_shift = max_center_shift
+        self.max_missed = max_missed
+        self.quality_gain = quality_gain
+        self.tracks: dict[int, FaceTrack] = {}
+        self.hits = 0
+        self.misses = 0
+        self._next_id = 1
+
+    @staticmethod
+    def box_center(box: list) -> tuple[float, float]:
+        return (box[0][0] + box[1][0]) / 2, (box[0][1] + box[1][1]) / 2
+
+    @staticmethod
+    def iou(box_a: list, box_b: list) -> float:
+        """
+        Intersection over union of two `[[x1, y1], [x2, y2]]` boxes.
+
+        Parameters:
+            box_a (list): The first box.
+            box_b (list): The second box.
+
+        Returns:
+            iou (float): 0.0 for disjoint boxes, 1.0 for identical ones.
+        """
+        width = min(box_a[1][0], box_b[1][0]) - max(box_a[0][0], box_b[0][0])
+        height = min(box_a[1][1], box_b[1][1]) - max(box_a[0][1], box_b[0][1])
+        if width <= 0 or height <= 0:
+            return 0.0
+        intersection = width * height
+        area_a = (box_a[1][0] - box_a[0][0]) * (box_a[1][1] - box_a[0][1])
+        area_b = (box_b[1][0] - box_b[0][0]) * (box_b[1][1] - box_b[0][1])
+        return intersection / (area_a + area_b - intersection)
+
+    def _center_match(self, box: list, candidates: list[FaceTrack]) -> Optional[FaceTrack]:
+        center = FaceTracker.box_center(box)
+        max_shift = self.max_center_shift * (box[1][0] - box[0][0])
+        best, best_shift = None, max_shift
+        for track in candidates:
+            shift = np.hypot(center[0] - track.center[0], center[1] - track.center[1])
+            if shift <= best_shift:
+                best, best_shift = track, shift
+        return best
+
+    def update(self, boxes: list[list]) -> list[FaceTrack]:
+        """
+        Associate the face boxes of a frame with the tracks.
+
+        Parameters:
+            boxes (list): The `[[x1, y1], [x2, y2]]` face boxes of the frame.
+
+        Returns:
+            tracks (list[FaceTrack]): The track of every box, in the order of `boxes`.
+        """
+        assigned: list[Optional[FaceTrack]] = [None] * len(boxes)
+        unmatched = dict(self.tracks)
+
+        pairs = sorted(
+            (
+                (FaceTracker.iou(box, track.box), index, track_id)
+                for index, box in enumerate(boxes)
+                for track_id, track in self.tracks.items()
+            ),
+            reverse=True,
+        )
+        for overlap, index, track_id in pairs:
+            if overlap < self.iou_threshold:
+                break
+            if assigned[index] is None and track_id in unmatched:
+                assigned[index] = unmatched.pop(track_id)
+
+        for index, box in enumerate(boxes):
+            if assigned[index] is None:
+                track = self._center_match(box, list(unmatched.values()))
+                if track is not None:
+                    del unmatched[track.track_id]
+                else:
+                    track = FaceTrack(self._next_id, box)
+                    self.tracks[track.track_id] = track
+                    self._next_id += 1
+                assigned[index] = track
+            assigned[index].box = box
+            assigned[index].center = FaceTracker.box_center(box)
+            assigned[index].missed = 0
+
+        for track in unmatched.values():
+            if track.missed == 0:
+                track.forget()
+            track.missed += 1
+            if track.missed > self.max_missed:
+                del self.tracks[track.track_id]
+        return assigned
+
+    def needs_recognition(self, track: FaceTrack, quality_score: float, now: Optional[float] = None) -> bool:
+        """
+        Decide between a recognition and the cached identity, and count the cache hit or miss.
+
+        Parameters:
+            track (FaceTrack): The track of the face.
+            quality_score (float): The quality score of the crop that would be recognized.
+            now (Optional[float]): The `time.monotonic()` timestamp, for tests.
+
+        Returns:
+            result (bool): True if the face has to be recognized.
+        """
+        now = time.monotonic() if now is None else now
+        expired = not track.recognized or now - track.recognized_at > self.identity_ttl
+        improved = quality_score > track.quality_score * self.quality_gain
+        if expired or improved:
+            self.misses += 1
+            return True
+        self.hits += 1
+        return False
+
+    def remember(
+        self,
+        track_id: int,
+        result: list,
+        quality_score: float,
+        presence: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Cache a recognition on its track, if the face is still the one that was submitted.
+
+        Parameters:
+            track_id (int): The track the face belonged to when it was submitted.
+            result (list): `[passed, distance, name, face_chip]` from the recognition executor.
+            quality_score (float): The quality score of the recognized crop.
+            presence (Optional[int]): `FaceTrack.presence` when the face was submitted.
+            now (Optional[float]): The `time.monotonic()` timestamp, for tests.
+        """
+        track = self.tracks.get(track_id)
+        if track is None or (presence is not None and presence != track.presence):
+            return
+        track.passed, track.distance, track.name, track.face_chip = result[:4]
+        track.quality_score = quality_score
+        track.recognized_at = time.monotonic() if now is None else now
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of recognition triggers answered from the identity cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "tracks": len(self.tracks),
+            "identity_cache_hits": self.hits,
+            "identity_cache_misses": self.misses,
+            "identity_cache_hit_rate": round(self.hit_rate, 3),
+        }
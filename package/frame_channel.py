@@ -0,0 +1,176 @@
+"""
+Bounded capture-to-consumer frame channel with preallocated frame slots.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+FRAME_POLICIES = ("latest", "drop_oldest", "block")
+
+
+class FrameChannel:
+    """
+    Hand decoded frames from the capture thread to the detection loop through a fixed set of slots. \n
+    `latest`: a new frame replaces every frame still waiting, the consumer always gets the newest one.
+    `drop_oldest`: up to `capacity` frames wait, a new frame replaces the oldest when full.
+    `block`: up to `capacity` frames wait, the producer waits for a free slot when full.
+
+    Frames are copied into `capacity + 1` slots allocated on the first frame, nothing is pickled and
+    memory does not grow when the consumer falls behind. The frame returned by `get` is a view into
+    the slot the consumer holds, it stays valid until the next `get`. Every frame is stamped with a
+    sequence number and its capture time; its age at `get` is measured so the glass-to-result latency
+    can be watched, and `last_sequence`/`last_timestamp` describe the frame `get` returned.
+    """
+
+    def __init__(self, capacity: int = 2, policy: str = "latest"):
+        if policy not in FRAME_POLICIES:
+            raise ValueError(f"Unknown frame policy: {policy}, expected one of {FRAME_POLICIES}.")
+        self.capacity = 1 if policy == "latest" else max(capacity, 1)
+        self.policy = policy
+        self._slots: list[Optional[np.ndarray]] = [None] * (self.capacity + 1)
+        self._timestamps = [0.0] * (self.capacity + 1)
+        self._sequences = [0] * (self.capacity + 1)
+        self._free = deque(range(self.capacity + 1))
+        self._ready: deque[int] = deque()
+        self._held: Optional[int] = None
+        self._condition = threading.Condition()
+        self._closed = False
+        self._waiting = 0
+        self.put_count = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.last_age = 0.0
+        self.last_sequence = 0
+        self.last_timestamp = 0.0
+        self.max_age = 0.0
+        self._total_age = 0.0
+
+    def _take_slot(self, timeout: Optional[float]) -> Optional[int]:
+        if self.policy == "latest":
+            while self._ready:
+                self._free.append(self._ready.popleft())
+                self.dropped += 1
+        elif self.policy == "drop_oldest":
+            if len(self._ready) >= self.capacity:
+                self._free.append(self._ready.popleft())
+                self.dropped += 1
+        elif not self._condition.wait_for(
+            lambda: (len(self._ready) < self.capacity and self._free) or self._closed, timeout
+        ):
+            self.dropped += 1
+            return None
+        if self._closed:
+            return None
+        if not self._free:
+            # Every slot is being written by other producers.
+            self.dropped += 1
+            return None
+        return self._free.popleft()
+
+    def put(self, frame: np.ndarray, timeout: Optional[float] = None, timestamp: Optional[float] = None) -> bool:
+        """
+        Copy a frame into a free slot.
+
+        Parameters:
+            frame (np.ndarray): The decoded frame.
+            timeout (Optional[float]): Seconds to wait for a slot with the `block` policy, None to wait forever.
+            timestamp (Optional[float]): The `time.monotonic` capture time of the frame, now if None.
+
+        Returns:
+            result (bool): False if the frame was not queued, the channel is closed or the wait timed out.
+        """
+        shape, dtype = frame.shape, frame.dtype
+        with self._condition:
+            index = self._take_slot(timeout)
+            if index is None:
+                return False
+        slot = self._slots[index]
+        if slot is None or slot.shape != shape or slot.dtype != dtype:
+            slot = self._slots[index] = np.empty_like(frame)
+        np.copyto(slot, frame)
+        with self._condition:
+            self._timestamps[index] = time.monotonic() if timestamp is None else timestamp
+            self.put_count += 1
+            self._sequences[index] = self.put_count
+            self._ready.append(index)
+            self._condition.notify_all()
+        return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Take the next frame.
+
+        Parameters:
+            timeout (Optional[float]): Seconds to wait for a frame, None to wait forever.
+
+        Returns:
+            frame (Optional[np.ndarray]): The frame, valid until the next `get`. None on timeout or when closed.
+        """
+        with self._condition:
+            self._waiting += 1
+            try:
+                ready = self._condition.wait_for(lambda: self._ready or self._closed, timeout)
+            finally:
+                self._waiting -= 1
+            if not ready or not self._ready:
+                return None
+            index = self._ready.popleft()
+            if self._held is not None:
+                self._free.append(self._held)
+            self._held = index
+            age = time.monotonic() - self._timestamps[index]
+            self.delivered += 1
+            self.last_age = age
+            self.last_sequence = self._sequences[index]
+            self.last_timestamp = self._timestamps[index]
+            self.max_age = max(self.max_age, age)
+            self._total_age += age
+            self._condition.notify_all()
+            return self._slots[index]
+
+    def wants_frame(self) -> bool:
+        """
+        True if the consumer is ready for a new frame. With `latest`, only while it waits in `get`:
+        a frame queued while it is busy would be one processing period old when taken.
+        Otherwise, if a new frame would be queued without dropping or waiting.
+        """
+        with self._condition:
+            if self.policy == "latest":
+                return self._waiting > 0
+            return len(self._ready) < self.capacity
+
+    def empty(self) -> bool:
+        with self._condition:
+            return not self._ready
+
+    def qsize(self) -> int:
+        with self._condition:
+            return len(self._ready)
+
+    @property
+    def mean_age(self) -> float:
+        """The average seconds a delivered frame waited in the channel."""
+        return self._total_age / self.delivered if self.delivered else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "capacity": self.capacity,
+            "put": self.put_count,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "queued": self.qsize(),
+            "last_age_ms": round(self.last_age * 1000, 2),
+            "mean_age_ms": round(self.mean_age * 1000, 2),
+            "max_age_ms": round(self.max_age * 1000, 2),
+        }
+
+    def close(self) -> None:
+        """Wake up a blocked producer or consumer, later calls return at once."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
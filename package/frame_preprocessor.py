@@ -0,0 +1,85 @@
+"""
+Frame preprocessing into reused buffers: resize, mirror and the colour conversions a frame needs.
+"""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class FramePreprocessor:
+    """
+    Resize and mirror captured frames into preallocated buffers, then convert colours on demand. \n
+    The frame is resized with INTER_AREA first and mirrored at the small size, so the full-size frame
+    is read once and no full-size copy is made. `rgb` for MediaPipe and `gray` for the eyes are only
+    converted when asked for, once per frame; `rgb` can convert a region only, for detection in a crop.
+    Every result is a buffer reused by the next `process`, so preprocessing allocates no image memory
+    after the first frame.
+    """
+
+    def __init__(self, width: int, height: int, flip: bool = True):
+        self.size = (width, height)
+        self.flip = flip
+        self._resized = np.empty((height, width, 3), dtype=np.uint8)
+        self._bgr = np.empty((height, width, 3), dtype=np.uint8)
+        self._rgb = np.empty((height, width, 3), dtype=np.uint8)
+        self._gray = np.empty((height, width), dtype=np.uint8)
+        self._rgb_region: Optional[np.ndarray] = None
+        self._rgb_ready = False
+        self._rgb_region_ready: Optional[tuple] = None
+        self._gray_ready = False
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Resize and mirror a captured frame.
+
+        Parameters:
+            frame (np.ndarray): The captured BGR frame, any size.
+
+        Returns:
+            frame (np.ndarray): The BGR frame at `size`, valid until the next `process`. It may be drawn on.
+        """
+        if frame.shape[:2] == self._bgr.shape[:2]:
+            resized = frame
+        else:
+            resized = self._resized if self.flip else self._bgr
+            cv2.resize(frame, self.size, resized, 0, 0, cv2.INTER_AREA)
+        if self.flip:
+            cv2.flip(resized, 1, self._bgr)
+        elif resized is not self._bgr:
+            np.copyto(self._bgr, resized)
+        self._rgb_ready = False
+        self._rgb_region_ready = None
+        self._gray_ready = False
+        return self._bgr
+
+    def rgb(self, region: Optional[tuple] = None) -> np.ndarray:
+        """
+        The current frame in RGB, converted at the first call after `process`.
+
+        Parameters:
+            region (Optional[tuple]): x1, y1, x2, y2 to convert only that part of the frame, the whole frame if None.
+
+        Returns:
+            frame (np.ndarray): The RGB frame or region, a contiguous buffer valid until the next `process`.
+        """
+        if region is not None:
+            x1, y1, x2, y2 = region
+            if self._rgb_region is None or self._rgb_region.shape[:2] != (y2 - y1, x2 - x1):
+                self._rgb_region = np.empty((y2 - y1, x2 - x1, 3), dtype=np.uint8)
+            if self._rgb_region_ready != region:
+                cv2.cvtColor(self._bgr[y1:y2, x1:x2], cv2.COLOR_BGR2RGB, self._rgb_region)
+                self._rgb_region_ready = region
+            return self._rgb_region
+        if not self._rgb_ready:
+            cv2.cvtColor(self._bgr, cv2.COLOR_BGR2RGB, self._rgb)
+            self._rgb_ready = True
+        return self._rgb
+
+    def gray(self) -> np.ndarray:
+        """The current frame in grayscale, converted at the first call after `process`."""
+        if not self._gray_ready:
+            cv2.cvtColor(self._bgr, cv2.COLOR_BGR2GRAY, self._gray)
+            self._gray_ready = True
+        return self._gray
@@ -0,0 +1,102 @@
+"""
+Adaptive detection stride, so the detection loop keeps up with the camera on slow hosts.
+"""
+
+import math
+import time
+from typing import Optional
+
+
+class FrameScheduler:
+    """
+    Choose which frames run face detection from the measured frame rate and processing cost. \n
+    While a face is in the detection range every frame is processed. A face detected out of range is
+    processed at `target_fps`, an empty scene at `idle_fps`; 0 means no limit. Both rates are capped so
+    detection uses at most `cpu_budget` of a core: with a mean cost of `c` seconds per frame,
+    `cpu_budget / c` frames a second. The stride is the incoming frame rate divided by that rate,
+    at most `max_stride`. Costs and rates are exponential moving averages with weight `smoothing`.
+    """
+
+    def __init__(
+        self,
+        target_fps: float = 15.0,
+        idle_fps: float = 5.0,
+        cpu_budget: float = 0.8,
+        max_stride: int = 6,
+        smoothing: float = 0.2,
+    ):
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.cpu_budget = cpu_budget
+        self.max_stride = max(max_stride, 1)
+        self.smoothing = smoothing
+        self.stride = 1
+        self.face_in_range = False
+        self.frame_count = 0
+        self.processed = 0
+        self.skipped = 0
+        self.mean_cost = 0.0
+        self.arrival_fps = 0.0
+        self._last_arrival: Optional[float] = None
+
+    def _average(self, mean: float, value: float) -> float:
+        return value if mean == 0.0 else mean + self.smoothing * (value - mean)
+
+    def should_process(self, now: Optional[float] = None) -> bool:
+        """
+        Count an incoming frame and tell whether to run detection on it.
+
+        Parameters:
+            now (Optional[float]): The `time.monotonic` arrival time, now if None.
+
+        Returns:
+            result (bool): True every `stride` frames.
+        """
+        now = time.monotonic() if now is None else now
+        if self._last_arrival is not None and now > self._last_arrival:
+            self.arrival_fps = self._average(self.arrival_fps, 1 / (now - self._last_arrival))
+        self._last_arrival = now
+        self.frame_count += 1
+        if self.frame_count >= self.stride:
+            self.frame_count = 0
+            self.processed += 1
+            return True
+        self.skipped += 1
+        return False
+
+    def record(self, seconds: float, face_detected: bool, face_in_range: bool) -> int:
+        """
+        Record the cost of a processed frame and pick the stride of the next frames.
+
+        Parameters:
+            seconds (float): The detection time of the frame.
+            face_detected (bool): Whether MediaPipe found a face anywhere in the frame.
+            face_in_range (bool): Whether a face was in the detection range.
+
+        Returns:
+            stride (int): Detection runs on one of every `stride` frames.
+        """
+        self.mean_cost = self._average(self.mean_cost, max(seconds, 0.0))
+        self.face_in_range = face_in_range
+        if face_in_range:
+            self.stride = 1
+            return self.stride
+        rate = (self.target_fps if face_detected else self.idle_fps) or math.inf
+        if self.mean_cost > 0 and self.cpu_budget > 0:
+            rate = min(rate, self.cpu_budget / self.mean_cost)
+        if self.arrival_fps <= rate:
+            self.stride = 1
+        else:
+            # Tolerate the jitter of the measured rate, 30 fps at 10 fps is a stride of 3, not 4.
+            self.stride = min(math.ceil(self.arrival_fps / rate - 1e-3), self.max_stride)
+        return self.stride
+
+    def stats(self) -> dict:
+        return {
+            "stride": self.stride,
+            "face_in_range": self.face_in_range,
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "arrival_fps": round(self.arrival_fps, 2),
+            "mean_cost_ms": round(self.mean_cost * 1000, 2),
+        }
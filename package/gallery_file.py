@@ -0,0 +1,411 @@
+"""
+Binary gallery file: a versioned, memory-mappable replacement for `model.csv`.
+
+Layout (little endian):
+    header       64 bytes  magic, version, dimension, name size, count, capacity, generation
+    names table  capacity * name_size bytes, UTF-8 names padded with NUL
+    descriptors  capacity * dimension float32, starts on a 64-byte boundary
+
+Rows `[0, count)` are valid. Appends write row `count` and then bump `count`,
+so readers that mapped the file earlier keep seeing a consistent prefix.
+Growth and deletes write a new file and rename it into place with a bumped `generation`,
+so readers that mapped the old file keep its rows unchanged until they reload.
+"""
+
+import csv
+import fcntl
+import os
+import struct
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+
+import package.config as config
+import package.gallery_store as gallery_store
+from package.face_gallery import DESCRIPTOR_DIMENSION, FaceGallery, load_csv_gallery
+
+GALLERY_MAGIC = b"FRGALLRY"
+GALLERY_VERSION = 1
+GALLERY_EXTENSION = ".gallery"
+HEADER_FORMAT = "<8sIIIQQQ"  # magic, version, dimension, name_size, count, capacity, generation
+HEADER_SIZE = 64
+NAME_SIZE = 64  # Matches the `SystemLogs.name` column length
+DEFAULT_CAPACITY = 1024
+_COUNT_OFFSET = struct.calcsize("<8sIII")
+
+
+class GalleryHeader:
+    __slots__ = ["version", "dimension", "name_size", "count", "capacity", "generation"]
+
+    def __init__(self, version, dimension, name_size, count, capacity, generation):
+        self.version = version
+        self.dimension = dimension
+        self.name_size = name_size
+        self.count = count
+        self.capacity = capacity
+        self.generation = generation
+
+    @property
+    def names_offset(self) -> int:
+        return HEADER_SIZE
+
+    @property
+    def descriptors_offset(self) -> int:
+        end_of_names = HEADER_SIZE + self.capacity * self.name_size
+        return (end_of_names + 63) // 64 * 64
+
+    def pack(self) -> bytes:
+        header = struct.pack(
+            HEADER_FORMAT,
+            GALLERY_MAGIC,
+            self.version,
+            self.dimension,
+            self.name_size,
+            self.count,
+            self.capacity,
+            self.generation,
+        )
+        return header.ljust(HEADER_SIZE, b"\0")
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "GalleryHeader":
+        magic, version, dimension, name_size, count, capacity, generation = struct.unpack_from(HEADER_FORMAT, data)
+        if magic != GALLERY_MAGIC:
+            raise ValueError("Not a gallery file.")
+        if version != GALLERY_VERSION:
+            raise ValueError(f"Unsupported gallery file version: {version}")
+        return cls(version, dimension, name_size, count, capacity, generation)
+
+
+def is_gallery_file(path: str) -> bool:
+    """Check the magic bytes of a file."""
+    try:
+        with open(path, "rb") as file:
+            return file.read(len(GALLERY_MAGIC)) == GALLERY_MAGIC
+    except OSError:
+        return False
+
+
+def read_header(path: str) -> GalleryHeader:
+    """Read the header of a gallery file."""
+    with open(path, "rb") as file:
+        return GalleryHeader.unpack(file.read(HEADER_SIZE))
+
+
+def _encode_name(name: str) -> bytes:
+    encoded = name.encode("utf-8")
+    if len(encoded) > NAME_SIZE:
+        raise ValueError(f"User name longer than {NAME_SIZE} bytes: {name}")
+    return encoded.ljust(NAME_SIZE, b"\0")
+
+
+def _decode_names(table: bytes, count: int, name_size: int) -> list[str]:
+    names = np.frombuffer(table, dtype=f"S{name_size}", count=count)
+    return [name.decode("utf-8") for name in names]
+
+
+@contextmanager
+def _locked(path: str):
+    """Open a gallery file for writing under an exclusive lock (single writer across processes)."""
+    while True:
+        file = open(path, "r+b")
+        fcntl.flock(file, fcntl.LOCK_EX)
+        # A writer that grew the file replaced it while we were waiting: lock the new one.
+        if os.fstat(file.fileno()).st_ino == os.stat(path).st_ino:
+            break
+        file.close()
+    try:
+        yield file
+    finally:
+        file.flush()
+        fcntl.flock(file, fcntl.LOCK_UN)
+        file.close()
+
+
+def _write_file(
+    path: str, names: list[str], matrix: np.ndarray, capacity: int, generation: int = 0, exclusive: bool = False
+) -> None:
+    """
+    Write a complete gallery file through a temporary file and an atomic rename.
+    With `exclusive`, the file is linked into place instead and FileExistsError is raised if it exists.
+    """
+    matrix = np.asarray(matrix, dtype="<f4").reshape(len(names), -1) if names else matrix
+    dimension = matrix.shape[1]
+    header = GalleryHeader(GALLERY_VERSION, dimension, NAME_SIZE, len(names), capacity, generation)
+    names_table = bytearray(capacity * NAME_SIZE)
+    for row, name in enumerate(names):
+        names_table[row * NAME_SIZE : (row + 1) * NAME_SIZE] = _encode_name(name)
+
+    # A unique temporary file, concurrent writers of the same gallery never share one.
+    descriptor, temporary_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=os.path.dirname(path) or "."
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(header.pack())
+            file.write(names_table)
+            file.seek(header.descriptors_offset)
+            if names:
+                file.write(np.ascontiguousarray(matrix, dtype="<f4").tobytes())
+            file.truncate(header.descriptors_offset + capacity * dimension * 4)
+            file.flush()
+            os.fsync(file.fileno())
+        if exclusive:
+            os.link(temporary_path, path)
+        else:
+            os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.unlink(temporary_path)
+
+
+def create_gallery_file(
+    path: str, dimension: int = DESCRIPTOR_DIMENSION, capacity: int = DEFAULT_CAPACITY, exclusive: bool = False
+) -> None:
+    """
+    Create an empty gallery file.
+
+    Parameters:
+        path (str): The gallery file path.
+        dimension (int): The descriptor dimension.
+        capacity (int): The number of preallocated rows.
+        exclusive (bool): Raise FileExistsError instead of replacing an existing file.
+    """
+    directory_path = os.path.dirname(path)
+    if directory_path:
+        os.makedirs(directory_path, exist_ok=True)
+    _write_file(path, [], np.zeros((0, dimension), dtype="<f4"), capacity, exclusive=exclusive)
+
+
+def load_gallery_file(path: str) -> FaceGallery:
+    """
+    Map a gallery file. The descriptor block is an `np.memmap`, so loading does not copy
+    or parse the descriptors and every process shares the same page cache.
+
+    Parameters:
+        path (str): The gallery file path.
+
+    Returns:
+        gallery (FaceGallery): The gallery backed by the mapped descriptors.
+    """
+    with open(path, "rb") as file:
+        header = GalleryHeader.unpack(file.read(HEADER_SIZE))
+        names = _decode_names(file.read(header.count * header.name_size), header.count, header.name_size)
+    if header.count == 0:
+        return FaceGallery(dimension=header.dimension)
+    matrix = np.memmap(
+        path, dtype="<f4", mode="r", offset=header.descriptors_offset, shape=(header.count, header.dimension)
+    )
+    return FaceGallery.from_arrays(names, matrix)
+
+
+def read_gallery_rows(path: str, start: int) -> tuple[GalleryHeader, list[str], np.ndarray]:
+    """
+    Read the rows published after `start`, used to tail appends without mapping the whole file.
+
+    Parameters:
+        path (str): The gallery file path.
+        start (int): The first row to read.
+
+    Returns:
+        header (GalleryHeader): The header the rows were read under.
+        names (list[str]): The user names of the rows.
+        matrix (np.ndarray): The descriptors of the rows.
+    """
+    with open(path, "rb") as file:
+        header = GalleryHeader.unpack(file.read(HEADER_SIZE))
+        count = max(header.count - start, 0)
+        file.seek(header.names_offset + start * header.name_size)
+        names = _decode_names(file.read(count * header.name_size), count, header.name_size)
+        file.seek(header.descriptors_offset + start * header.dimension * 4)
+        matrix = np.frombuffer(file.read(count * header.dimension * 4), dtype="<f4")
+    return header, names, matrix.reshape(count, header.dimension)
+
+
+def append_to_gallery_file(path: str, name: str, face_descriptor: np.ndarray) -> None:
+    """
+    Append one descriptor. The file grows by doubling its capacity when full.
+
+    Parameters:
+        path (str): The gallery file path.
+        name (str): The user name.
+        face_descriptor (np.ndarray): The face descriptor.
+    """
+    descriptor = np.asarray(face_descriptor, dtype="<f4").reshape(-1)
+    with _locked(path) as file:
+        header = GalleryHeader.unpack(file.read(HEADER_SIZE))
+        if descriptor.shape[0] != header.dimension:
+            if header.count == 0:
+                header.dimension = descriptor.shape[0]
+                file.seek(0)
+                file.write(header.pack())
+            else:
+                raise ValueError(f"Descriptor dimension {descriptor.shape[0]} != gallery dimension {header.dimension}.")
+
+        if header.count >= header.capacity:
+            file.seek(header.names_offset)
+            names = _decode_names(file.read(header.count * header.name_size), header.count, header.name_size)
+            file.seek(header.descriptors_offset)
+            matrix = np.frombuffer(file.read(header.count * header.dimension * 4), dtype="<f4")
+            matrix = matrix.reshape(header.count, header.dimension)
+            _write_file(path, names, matrix, max(DEFAULT_CAPACITY, 2 * header.capacity), header.generation + 1)
+            config.logger.info(f"Gallery file grown to {max(DEFAULT_CAPACITY, 2 * header.capacity)} rows.")
+            return append_to_gallery_file(path, name, descriptor)
+
+        row = header.count
+        file.seek(header.names_offset + row * header.name_size)
+        file.write(_encode_name(name))
+        file.seek(header.descriptors_offset + row * header.dimension * 4)
+        file.write(descriptor.tobytes())
+        file.flush()
+        # Publish the row only after its data is written.
+        file.seek(_COUNT_OFFSET)
+        file.write(struct.pack("<Q", row + 1))
+
+
+def delete_from_gallery_file(path: str, name: str) -> bool:
+    """
+    Delete every row of a user by writing the other rows to a new file renamed into place.
+    Rows are never moved inside the old file, a gallery mapped from it keeps matching names to descriptors.
+
+    Parameters:
+        path (str): The gallery file path.
+        name (str): The user name.
+
+    Returns:
+        result (bool): True if the user was found.
+    """
+    with _locked(path) as file:
+        header = GalleryHeader.unpack(file.read(HEADER_SIZE))
+        names = _decode_names(file.read(header.count * header.name_size), header.count, header.name_size)
+        kept = [row for row, row_name in enumerate(names) if row_name != name]
+        if len(kept) == header.count:
+            return False
+
+        file.seek(header.descriptors_offset)
+        matrix = np.frombuffer(file.read(header.count * header.dimension * 4), dtype="<f4")
+        matrix = matrix.reshape(header.count, header.dimension)[kept]
+        _write_file(path, [names[row] for row in kept], matrix, header.capacity, header.generation + 1)
+        return True
+
+
+def convert_csv_to_gallery(csv_path: str, gallery_path: str) -> int:
+    """
+    Convert a `model.csv` file into a gallery file.
+
+    Parameters:
+        csv_path (str): The CSV model file. CSV format: name,f1,f2,...,f128
+        gallery_path (str): The output gallery file.
+
+    Returns:
+        count (int): The number of converted users.
+    """
+    gallery = load_csv_gallery(csv_path)
+    directory_path = os.path.dirname(gallery_path)
+    if directory_path:
+        os.makedirs(directory_path, exist_ok=True)
+    capacity = max(DEFAULT_CAPACITY, 2 * len(gallery))
+    _write_file(gallery_path, gallery.keys(), gallery.matrix.reshape(len(gallery), gallery.dimension), capacity)
+    return len(gallery)
+
+
+# Storage dispatch: SQLite stores (`.db`, `.sqlite`, `.sqlite3`), legacy `.csv` files, otherwise gallery files.
+def _uses_csv(path: str) -> bool:
+    if os.path.isfile(path):
+        return not is_gallery_file(path) and not gallery_store.is_store_file(path)
+    return path.lower().endswith(".csv")
+
+
+def load_gallery(path: str) -> FaceGallery:
+    """
+    Load the registered faces from a SQLite store, gallery or CSV file, creating an empty one if missing.
+
+    Parameters:
+        path (str): The `face_model` path.
+
+    Returns:
+        gallery (FaceGallery): The registered faces.
+    """
+    if gallery_store.is_store_file(path):
+        return gallery_store.open_store(path).load_gallery()
+    if not os.path.isfile(path):
+        directory_path = os.path.dirname(path)
+        if directory_path:
+            os.makedirs(directory_path, exist_ok=True)
+        if path.lower().endswith(".csv"):
+            with open(path, mode="a", newline=""):
+                pass
+        else:
+            try:
+                create_gallery_file(path, exclusive=True)
+            except FileExistsError:
+                # Created by a first enroll in the meantime.
+                return load_gallery_file(path)
+        return FaceGallery()
+    if is_gallery_file(path):
+        return load_gallery_file(path)
+    return load_csv_gallery(path)
+
+
+def save_descriptor(path: str, name: str, face_descriptor: np.ndarray) -> None:
+    """
+    Save a descriptor to the `face_model` storage.
+
+    Parameters:
+        path (str): The `face_model` path.
+        name (str): The user name.
+        face_descriptor (np.ndarray): The face descriptor.
+    """
+    if gallery_store.is_store_file(path):
+        gallery_store.open_store(path).enroll(name, face_descriptor)
+        return
+    if _uses_csv(path):
+        if isinstance(face_descriptor, np.ndarray):
+            face_descriptor = face_descriptor.tolist()
+        with open(path, mode="a+", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow([name] + list(face_descriptor))
+        return
+    if not os.path.isfile(path):
+        # Concurrent first enrolls: only one creates the file, every one appends under its lock.
+        try:
+            create_gallery_file(path, dimension=len(face_descriptor), exclusive=True)
+        except FileExistsError:
+            pass
+    append_to_gallery_file(path, name, face_descriptor)
+
+
+def delete_descriptor(path: str, name: str) -> bool:
+    """
+    Delete a user from the `face_model` storage.
+
+    Parameters:
+        path (str): The `face_model` path.
+        name (str): The user name.
+
+    Returns:
+        result (bool): True if the user was found.
+    """
+    if gallery_store.is_store_file(path):
+        return gallery_store.open_store(path).delete(name)
+    if not _uses_csv(path):
+        return delete_from_gallery_file(path, name)
+
+    with open(path, newline="") as file:
+        rows = [row for row in csv.reader(file) if row]
+    kept = [row for row in rows if row[0] != name]
+    if len(kept) == len(rows):
+        return False
+    # Renamed into place, so a watcher following the file by offset sees another file and reloads it.
+    descriptor, temporary_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=os.path.dirname(path) or "."
+    )
+    try:
+        with os.fdopen(descriptor, mode="w", newline="") as file:
+            csv.writer(file).writerows(kept)
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.unlink(temporary_path)
+    return True
@@ -0,0 +1,311 @@
+"""
+Pluggable 1:N search indexes over a `FaceGallery`.
+"""
+
+import hashlib
+import os
+import time
+from typing import Optional
+
+import numpy as np
+
+import package.config as config
+from package.face_gallery import FaceGallery
+
+ASSIGN_CHUNK_ROWS = 16384
+
+
+class BruteForceIndex:
+    """
+    Exact search: one matrix-vector product over the whole gallery. \n
+    This is the default index and the reference the approximate indexes are measured against.
+    """
+
+    kind = "brute_force"
+
+    def build(self, gallery: FaceGallery) -> None:
+        """Nothing to build for exact search."""
+
+    def refresh(self, gallery: FaceGallery) -> None:
+        """Nothing to refresh for exact search."""
+
+    def search(self, gallery: FaceGallery, descriptor: np.ndarray, top_k: int = 1) -> list[tuple[str, float]]:
+        """
+        Find the `top_k` nearest registered users.
+
+        Parameters:
+            gallery (FaceGallery): The registered faces.
+            descriptor (np.ndarray): The query face descriptor.
+            top_k (int): The number of matches to return.
+
+        Returns:
+            matches (list[tuple[str, float]]): `(name, distance)` pairs, nearest first.
+        """
+        return gallery.search(descriptor, top_k=top_k)
+
+    def save(self, path: str) -> None:
+        """Nothing to persist for exact search."""
+
+
+class IVFIndex:
+    """
+    Inverted file index: a k-means coarse quantizer splits the gallery into `n_lists` cells
+    and a query only scans the rows of its `nprobe` nearest cells. \n
+    `nprobe` is the recall/latency knob: `nprobe == n_lists` is exact search.
+    Candidate distances are recomputed exactly, so `sensitivity` keeps its meaning;
+    the only approximation is that the true nearest user may not be among the candidates. \n
+    The inverted lists belong to one version of one gallery and are reassigned by `refresh`, which
+    the `Predictor` calls when it swaps in a new gallery. A gallery changed since is searched exactly.
+    """
+
+    kind = "ivf"
+
+    def __init__(self, n_lists: Optional[int] = None, nprobe: int = 8, iterations: int = 10, seed: int = 0):
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.centroid_norms: Optional[np.ndarray] = None
+        self.list_offsets: Optional[np.ndarray] = None
+        self.list_rows: Optional[np.ndarray] = None
+        self._built_for: Optional[tuple[int, int]] = None  # (gallery token, gallery version)
+
+    @staticmethod
+    def _assign(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Nearest centroid of every row, computed in chunks to bound memory."""
+        centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+        assignments = np.empty(matrix.shape[0], dtype=np.int32)
+        for start in range(0, matrix.shape[0], ASSIGN_CHUNK_ROWS):
+            chunk = matrix[start : start + ASSIGN_CHUNK_ROWS]
+            distances = centroid_norms - 2.0 * (chunk @ centroids.T)
+            assignments[start : start + ASSIGN_CHUNK_ROWS] = np.argmin(distances, axis=1)
+        return assignments
+
+    def _train(self, matrix: np.ndarray, n_lists: int) -> np.ndarray:
+        """Train the coarse quantizer with Lloyd's k-means on a sample of the gallery."""
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(matrix.shape[0], 64 * n_lists)
+        sample = matrix[rng.choice(matrix.shape[0], sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+        for _ in range(self.iterations):
+            assignments = self._assign(sample, centroids)
+            order = np.argsort(assignments, kind="stable")
+            counts = np.bincount(assignments, minlength=n_lists)
+            empty = counts == 0
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[~empty]
+            sums = np.add.reduceat(sample[order], starts, axis=0)
+            centroids[~empty] = sums / counts[~empty, None]
+            if empty.any():
+                centroids[empty] = sample[rng.choice(sample_size, int(empty.sum()), replace=False)]
+        return centroids
+
+    def _fill_lists(self, gallery: FaceGallery) -> None:
+        """Sort the gallery rows into the inverted lists of the current centroids."""
+        self.centroid_norms = np.einsum("ij,ij->i", self.centroids, self.centroids)
+        assignments = self._assign(gallery.matrix, self.centroids)
+        self.list_rows = np.argsort(assignments, kind="stable").astype(np.int64)
+        counts = np.bincount(assignments, minlength=self.centroids.shape[0])
+        self.list_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self._built_for = (gallery.token, gallery.version)
+
+    def build(self, gallery: FaceGallery) -> None:
+        """
+        Train the coarse quantizer and fill the inverted lists.
+
+        Parameters:
+            gallery (FaceGallery): The registered faces.
+        """
+        start_time = time.time()
+        if len(gallery) == 0:
+            self.centroids = None
+            self._built_for = (gallery.token, gallery.version)
+            return
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(gallery))))
+        n_lists = min(n_lists, len(gallery))
+        self.centroids = self._train(gallery.matrix, n_lists)
+        self._fill_lists(gallery)
+        config.logger.info(
+            f"IVF index built: {len(gallery)} faces, {n_lists} lists, {round(time.time() - start_time, 3)} sec."
+        )
+
+    def refresh(self, gallery: FaceGallery) -> None:
+        """
+        Reassign the gallery rows to the existing centroids after enrolls or deletes.
+        The quantizer is only retrained by `build`.
+
+        Parameters:
+            gallery (FaceGallery): The registered faces.
+        """
+        if self.centroids is None or self.centroids.shape[1] != gallery.dimension:
+            self.build(gallery)
+        elif len(gallery) == 0:
+            self._built_for = (gallery.token, gallery.version)
+        else:
+            self._fill_lists(gallery)
+
+    def search(self, gallery: FaceGallery, descriptor: np.ndarray, top_k: int = 1) -> list[tuple[str, float]]:
+        """
+        Find the `top_k` nearest registered users among the `nprobe` nearest cells.
+
+        Parameters:
+            gallery (FaceGallery): The registered faces.
+            descriptor (np.ndarray): The query face descriptor.
+            top_k (int): The number of matches to return.
+
+        Returns:
+            matches (list[tuple[str, float]]): `(name, distance)` pairs, nearest first.
+        """
+        if self._built_for != (gallery.token, gallery.version):
+            # Changed since the last `refresh` (the predictor refreshes on every gallery swap):
+            # search it exactly rather than reassigning every row on the recognition path.
+            return gallery.search(descriptor, top_k=top_k)
+        if len(gallery) == 0 or top_k <= 0:
+            return []
+
+        query = np.asarray(descriptor, dtype=np.float32).reshape(-1)
+        cell_distances = self.centroid_norms - 2.0 * (self.centroids @ query)
+        nprobe = min(max(self.nprobe, 1), self.centroids.shape[0])
+        cells = np.argpartition(cell_distances, nprobe - 1)[:nprobe]
+        rows = np.concatenate([self.list_rows[self.list_offsets[c] : self.list_offsets[c + 1]] for c in cells])
+        if rows.size == 0:
+            return []
+
+        top_k = min(top_k, rows.size)
+        distances = gallery.squared_distances(query, rows)
+        if top_k < rows.size:
+            rows = rows[np.argpartition(distances, top_k - 1)[:top_k]]
+        return gallery.rank(query, rows)
+
+    @staticmethod
+    def _fingerprint(gallery: FaceGallery) -> str:
+        """Hash of the names and descriptors, so saved lists are only reused for the very same rows."""
+        digest = hashlib.sha1("\n".join(gallery.keys()).encode())
+        digest.update(np.ascontiguousarray(gallery.matrix, dtype="<f4").tobytes())
+        return digest.hexdigest()
+
+    def save(self, path: str, gallery: Optional[FaceGallery] = None) -> None:
+        """
+        Persist the trained index.
+
+        Parameters:
+            path (str): The output `.npz` path.
+            gallery (Optional[FaceGallery]): The gallery the inverted lists belong to.
+        """
+        if self.centroids is None:
+            return
+        directory_path = os.path.dirname(path)
+        if directory_path:
+            os.makedirs(directory_path, exist_ok=True)
+        np.savez(
+            path,
+            centroids=self.centroids,
+            list_offsets=self.list_offsets,
+            list_rows=self.list_rows,
+            nprobe=self.nprobe,
+            fingerprint=self._fingerprint(gallery) if gallery is not None else "",
+        )
+
+    @classmethod
+    def load(cls, path: str, gallery: FaceGallery, nprobe: Optional[int] = None) -> "IVFIndex":
+        """
+        Load a persisted index. The inverted lists are reused when they were saved for the
+        same gallery, otherwise the rows are reassigned to the saved centroids.
+
+        Parameters:
+            path (str): The `.npz` path written by `save`.
+            gallery (FaceGallery): The registered faces.
+            nprobe (Optional[int]): Override the saved `nprobe`.
+
+        Returns:
+            index (IVFIndex): The loaded index.
+        """
+        with np.load(path) as data:
+            index = cls(n_lists=data["centroids"].shape[0], nprobe=int(nprobe or data["nprobe"]))
+            index.centroids = data["centroids"]
+            if str(data["fingerprint"]) == cls._fingerprint(gallery):
+                index.centroid_norms = np.einsum("ij,ij->i", index.centroids, index.centroids)
+                index.list_offsets = data["list_offsets"]
+                index.list_rows = data["list_rows"]
+                index._built_for = (gallery.token, gallery.version)
+            else:
+                index.refresh(gallery)
+        return index
+
+
+def create_gallery_index(
+    gallery: FaceGallery, kind: str = "brute_force", nprobe: int = 8, index_path: Optional[str] = None
+) -> BruteForceIndex | IVFIndex:
+    """
+    Create the search index selected in the recognition config.
+
+    Parameters:
+        gallery (FaceGallery): The registered faces.
+        kind (str): "brute_force" or "ivf".
+        nprobe (int): The number of IVF cells scanned per query.
+        index_path (Optional[str]): Where the IVF index is loaded from and saved to.
+
+    Returns:
+        index (BruteForceIndex | IVFIndex): The built index.
+    """
+    if kind == BruteForceIndex.kind:
+        return BruteForceIndex()
+    if kind != IVFIndex.kind:
+        raise ValueError(f"Unknown gallery index: {kind}")
+
+    if index_path and os.path.isfile(index_path):
+        return IVFIndex.load(index_path, gallery, nprobe=nprobe)
+    index = IVFIndex(nprobe=nprobe)
+    index.build(gallery)
+    if index_path:
+        index.save(index_path, gallery)
+    return index
+
+
+def evaluate_recall(
+    gallery: FaceGallery, index: IVFIndex, queries: np.ndarray, nprobe_values: list[int], top_k: int = 1
+) -> list[dict]:
+    """
+    Measure recall@k and per-query latency of an index against exact search.
+
+    Parameters:
+        gallery (FaceGallery): The registered faces.
+        index (IVFIndex): A built index.
+        queries (np.ndarray): The (Q, D) query descriptors.
+        nprobe_values (list[int]): The `nprobe` settings to evaluate.
+        top_k (int): The number of neighbours compared.
+
+    Returns:
+        report (list[dict]): One row per `nprobe` with recall and latency in milliseconds.
+    """
+    exact = BruteForceIndex()
+    truth = []
+    exact_latencies = []
+    for query in queries:
+        start_time = time.perf_counter()
+        truth.append({name for name, _ in exact.search(gallery, query, top_k)})
+        exact_latencies.append(time.perf_counter() - start_time)
+
+    report = []
+    original_nprobe = index.nprobe
+    for nprobe in nprobe_values:
+        index.nprobe = nprobe
+        hits = 0
+        latencies = []
+        for query, expected in zip(queries, truth):
+            start_time = time.perf_counter()
+            found = {name for name, _ in index.search(gallery, query, top_k)}
+            latencies.append(time.perf_counter() - start_time)
+            hits += len(found & expected)
+        report.append(
+            {
+                "nprobe": nprobe,
+                "recall": hits / max(1, sum(len(expected) for expected in truth)),
+                "mean_latency_ms": 1000 * float(np.mean(latencies)),
+                "p95_latency_ms": 1000 * float(np.percentile(latencies, 95)),
+                "exact_mean_latency_ms": 1000 * float(np.mean(exact_latencies)),
+            }
+        )
+    index.nprobe = original_nprobe
+    return report
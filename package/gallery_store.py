@@ -0,0 +1,220 @@
+"""
+Key-value gallery store backed by SQLite: one row per user, descriptor stored as a float32 blob.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+
+from package.face_gallery import FaceGallery
+
+SQLITE_MAGIC = b"SQLite format 3\0"
+STORE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+UPSERT_STATEMENT = (
+    "INSERT INTO face_features (name, dimension, descriptor, updated_at, sequence) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(name) DO UPDATE SET dimension=excluded.dimension, descriptor=excluded.descriptor, "
+    "updated_at=excluded.updated_at, sequence=excluded.sequence"
+)
+
+_stores: dict[str, "GalleryStore"] = {}
+_stores_lock = threading.Lock()
+
+
+class GalleryStore:
+    """
+    Registered face descriptors keyed by user name. \n
+    Enroll is an upsert and delete removes the row, both a single B-tree operation,
+    so their latency does not depend on the gallery size. Writes go through one
+    connection guarded by a lock (single writer) inside `BEGIN IMMEDIATE` transactions,
+    which also serialises writers from other processes. \n
+    Every write transaction takes the next value of a store-wide sequence and stamps the rows it
+    upserts with it. Transactions are serialised, so the sequence follows commit order and
+    `changes_since` never misses a writer that waited long for the lock, unlike a wall-clock stamp.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory_path = os.path.dirname(path)
+        if directory_path:
+            os.makedirs(directory_path, exist_ok=True)
+        self._write_lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._transaction() as cursor:
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS face_features ("
+                "name TEXT PRIMARY KEY, "
+                "dimension INTEGER NOT NULL, "
+                "descriptor BLOB NOT NULL, "
+                "updated_at REAL NOT NULL, "
+                "sequence INTEGER NOT NULL DEFAULT 0)"
+            )
+            # Stores created before the sequence column.
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(face_features)")}
+            if "sequence" not in columns:
+                cursor.execute("ALTER TABLE face_features ADD COLUMN sequence INTEGER NOT NULL DEFAULT 0")
+            cursor.execute("CREATE INDEX IF NOT EXISTS face_features_sequence ON face_features (sequence)")
+            cursor.execute("CREATE TABLE IF NOT EXISTS face_sequence (value INTEGER NOT NULL)")
+            cursor.execute(
+                "INSERT INTO face_sequence SELECT COALESCE(MAX(sequence), 0) FROM face_features "
+                "WHERE NOT EXISTS (SELECT 1 FROM face_sequence)"
+            )
+
+    @contextmanager
+    def _transaction(self):
+        """A `BEGIN IMMEDIATE` transaction on the writer connection, committed unless it raises."""
+        with self._write_lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _next_sequence(cursor: sqlite3.Cursor) -> int:
+        """Take the next sequence value, inside the write transaction."""
+        cursor.execute("UPDATE face_sequence SET value = value + 1")
+        return cursor.execute("SELECT value FROM face_sequence").fetchone()[0]
+
+    def _write(self, statement: str, parameters: tuple) -> int:
+        with self._transaction() as cursor:
+            return cursor.execute(statement, parameters).rowcount
+
+    def enroll(self, name: str, face_descriptor: np.ndarray) -> None:
+        """
+        Insert or replace the descriptor of a user.
+
+        Parameters:
+            name (str): The user name.
+            face_descriptor (np.ndarray): The face descriptor.
+        """
+        descriptor = np.asarray(face_descriptor, dtype="<f4").reshape(-1)
+        with self._transaction() as cursor:
+            sequence = self._next_sequence(cursor)
+            cursor.execute(UPSERT_STATEMENT, (name, descriptor.shape[0], descriptor.tobytes(), time.time(), sequence))
+
+    def enroll_many(self, descriptors: dict[str, np.ndarray]) -> int:
+        """
+        Insert or replace many users in one transaction.
+
+        Parameters:
+            descriptors (dict[str, np.ndarray]): The face descriptors keyed by user name.
+
+        Returns:
+            count (int): The number of written users.
+        """
+        rows = []
+        for name, face_descriptor in descriptors.items():
+            descriptor = np.asarray(face_descriptor, dtype="<f4").reshape(-1)
+            rows.append((name, descriptor.shape[0], descriptor.tobytes()))
+        with self._transaction() as cursor:
+            sequence = self._next_sequence(cursor)
+            now = time.time()
+            cursor.executemany(UPSERT_STATEMENT, [(*row, now, sequence) for row in rows])
+        return len(rows)
+
+    def delete(self, name: str) -> bool:
+        """
+        Delete a user.
+
+        Parameters:
+            name (str): The user name.
+
+        Returns:
+            result (bool): True if the user existed.
+        """
+        return self._write("DELETE FROM face_features WHERE name = ?", (name,)) > 0
+
+    def get(self, name: str) -> Optional[np.ndarray]:
+        """Return the descriptor of a user, or None."""
+        row = self._connection.execute("SELECT descriptor FROM face_features WHERE name = ?", (name,)).fetchone()
+        return None if row is None else np.frombuffer(row[0], dtype="<f4")
+
+    def count(self) -> int:
+        """Return the number of enrolled users."""
+        return self._connection.execute("SELECT COUNT(*) FROM face_features").fetchone()[0]
+
+    def data_version(self) -> int:
+        """Return SQLite's data version, which changes when another connection commits."""
+        return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def sequence(self) -> int:
+        """Return the sequence value of the last committed write."""
+        return self._connection.execute("SELECT value FROM face_sequence").fetchone()[0]
+
+    def changes_since(self, sequence: int) -> tuple[dict[str, np.ndarray], int]:
+        """
+        Return the users enrolled or replaced after a sequence value.
+
+        Parameters:
+            sequence (int): The sequence value already seen, see `sequence`.
+
+        Returns:
+            descriptors (dict[str, np.ndarray]): The changed descriptors keyed by user name.
+            latest (int): The newest sequence value read, the bound of the next call.
+        """
+        rows = self._connection.execute(
+            "SELECT name, descriptor, sequence FROM face_features WHERE sequence > ?", (sequence,)
+        ).fetchall()
+        descriptors = {row[0]: np.frombuffer(row[1], dtype="<f4") for row in rows}
+        return descriptors, max((row[2] for row in rows), default=sequence)
+
+    def names(self) -> set[str]:
+        """Return the enrolled user names."""
+        return {row[0] for row in self._connection.execute("SELECT name FROM face_features")}
+
+    def load_gallery(self) -> FaceGallery:
+        """
+        Bulk-load every descriptor into the in-memory matcher.
+
+        Returns:
+            gallery (FaceGallery): The registered faces.
+        """
+        rows = self._connection.execute("SELECT name, dimension, descriptor FROM face_features").fetchall()
+        if not rows:
+            return FaceGallery()
+        names = [row[0] for row in rows]
+        matrix = np.frombuffer(b"".join(row[2] for row in rows), dtype="<f4").reshape(len(rows), rows[0][1])
+        return FaceGallery.from_arrays(names, matrix)
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def is_store_file(path: str) -> bool:
+    """Check the SQLite magic bytes of a file, or the extension of a new path."""
+    if os.path.isfile(path):
+        try:
+            with open(path, "rb") as file:
+                return file.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+        except OSError:
+            return False
+    return path.lower().endswith(STORE_EXTENSIONS)
+
+
+def open_store(path: str) -> GalleryStore:
+    """
+    Return the process-wide store of a path, so every request shares one writer connection.
+
+    Parameters:
+        path (str): The SQLite file path.
+
+    Returns:
+        store (GalleryStore): The store.
+    """
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = GalleryStore(path)
+            _stores[key] = store
+        return store
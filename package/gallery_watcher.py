@@ -0,0 +1,218 @@
+"""
+Live reload of the registered faces: follow the `face_model` storage and apply enrolls and deletes
+to a running `Predictor` without restarting detection.
+"""
+
+import csv
+import io
+import os
+import threading
+import time
+import traceback
+import zlib
+from typing import Optional
+
+import numpy as np
+
+import package.config as config
+import package.gallery_file as gallery_file
+import package.gallery_store as gallery_store
+from package.face_gallery import DESCRIPTOR_DIMENSION, FaceGallery
+
+
+def _parse_csv(data: bytes) -> tuple[list[str], list[list[str]]]:
+    """Parse complete CSV lines into names and descriptor rows, skipping rows that are too short."""
+    names, rows = [], []
+    for row in csv.reader(io.StringIO(data.decode("utf-8"))):
+        if len(row) < DESCRIPTOR_DIMENSION + 1:
+            continue
+        names.append(row[0])
+        rows.append(row[1:])
+    return names, rows
+
+
+class GalleryWatcher:
+    """
+    Poll the `face_model` storage and push its changes into a predictor. \n
+    Each backend is followed incrementally:
+        SQLite store   `PRAGMA data_version`, then only the rows written after the last sequence value read
+        gallery file   the published row count; appended rows are read from the file tail
+        CSV file       the byte offset; appended lines are parsed from the file tail
+    A delete in a gallery file bumps its generation and the file is re-mapped (no parsing).
+    A delete in a CSV file rewrites it, so the CSV is reloaded; prefer the other backends.
+    A CSV is read again whenever its size or mtime moves, and reloaded if the bytes already
+    applied changed, so a rewrite followed by an append within one poll is not mistaken for an append.
+
+    The changes are applied with `Predictor.update_gallery`, which builds the new gallery
+    aside and swaps it in, so recognition is never blocked by a reload.
+    `notify` wakes the watcher at once, e.g. right after `/api/register-face`.
+    """
+
+    def __init__(self, path: str, predictor, interval: float = 1.0):
+        self.path = path
+        self.predictor = predictor
+        self.interval = interval
+        self.reload_count = 0
+        self._poll_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._store: Optional[gallery_store.GalleryStore] = None
+        self._inode: Optional[int] = None
+        self._generation = 0
+        self._count = 0
+        self._offset = 0
+        self._checksum = 0
+        self._csv_stat: Optional[tuple[int, int, int]] = None
+        self._mark()
+
+    def _mark(self) -> None:
+        """Remember the current position of the storage; later polls only read what comes after it."""
+        if gallery_store.is_store_file(self.path):
+            # A connection of our own: data_version only moves for commits made by other connections.
+            if self._store is None:
+                self._store = gallery_store.GalleryStore(self.path)
+            self._data_version = self._store.data_version()
+            self._sequence = self._store.sequence()
+        elif not os.path.isfile(self.path):
+            return
+        elif gallery_file.is_gallery_file(self.path):
+            header = gallery_file.read_header(self.path)
+            self._inode = os.stat(self.path).st_ino
+            self._generation = header.generation
+            self._count = header.count
+        else:
+            with open(self.path, "rb") as file:
+                stat = os.fstat(file.fileno())
+                data = file.read()
+            self._inode = stat.st_ino
+            self._offset = data.rfind(b"\n") + 1
+            self._checksum = zlib.crc32(data[: self._offset])
+            self._csv_stat = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def poll(self) -> bool:
+        """
+        Apply the changes made since the last poll.
+
+        Returns:
+            result (bool): True if the gallery of the predictor was updated.
+        """
+        with self._poll_lock:
+            if self._store is not None:
+                return self._poll_store()
+            if not os.path.isfile(self.path):
+                return False
+            if gallery_file.is_gallery_file(self.path):
+                return self._poll_gallery_file()
+            return self._poll_csv()
+
+    def _poll_store(self) -> bool:
+        data_version = self._store.data_version()
+        if data_version == self._data_version:
+            return False
+        self._data_version = data_version
+        upserts, self._sequence = self._store.changes_since(self._sequence)
+
+        gallery = self.predictor.registered_face_descriptor
+        expected = len(gallery) + sum(1 for name in upserts if name not in gallery)
+        removals = []
+        if self._store.count() != expected:
+            names = self._store.names()
+            removals = [name for name in gallery.keys() if name not in names]
+        return self._apply(upserts, removals)
+
+    def _poll_gallery_file(self) -> bool:
+        inode = os.stat(self.path).st_ino
+        header = gallery_file.read_header(self.path)
+        if inode == self._inode and header.generation == self._generation:
+            if header.count <= self._count:
+                return False
+            header, names, matrix = gallery_file.read_gallery_rows(self.path, self._count)
+            if header.generation == self._generation:
+                self._count = header.count
+                return self._apply(dict(zip(names, matrix)), [])
+
+        # Deleted rows or a grown (rewritten) file: re-map it.
+        gallery = gallery_file.load_gallery_file(self.path)
+        self._inode = inode
+        self._generation = header.generation
+        # Rows appended while re-mapping are read again by the next poll, which is harmless.
+        self._count = header.count
+        return self._replace(gallery)
+
+    def _poll_csv(self) -> bool:
+        stat = os.stat(self.path)
+        if (stat.st_ino, stat.st_size, stat.st_mtime_ns) == self._csv_stat:
+            return False
+        with open(self.path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            data = file.read()
+        self._csv_stat = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        # Only consume complete lines; a row still being written is read on the next poll.
+        end = data.rfind(b"\n") + 1
+        if stat.st_ino != self._inode or end < self._offset or zlib.crc32(data[: self._offset]) != self._checksum:
+            # Rewritten (a delete) or replaced: reload what is complete.
+            names, rows = _parse_csv(data[:end])
+            self._inode = stat.st_ino
+            self._offset = end
+            self._checksum = zlib.crc32(data[:end])
+            gallery = FaceGallery.from_arrays(names, np.array(rows, dtype=np.float32)) if names else FaceGallery()
+            return self._replace(gallery)
+        if end <= self._offset:
+            return False
+
+        tail = data[self._offset : end]
+        self._offset = end
+        self._checksum = zlib.crc32(tail, self._checksum)
+        names, rows = _parse_csv(tail)
+        return self._apply({name: np.array(row, dtype=np.float32) for name, row in zip(names, rows)}, [])
+
+    def _apply(self, upserts: dict[str, np.ndarray], removals: list[str]) -> bool:
+        if not upserts and not removals:
+            return False
+        start_time = time.time()
+        self.predictor.update_gallery(upserts, removals)
+        self.reload_count += 1
+        config.logger.info(
+            f"Gallery updated: {len(upserts)} enrolled, {len(removals)} deleted, "
+            f"{len(self.predictor.registered_face_descriptor)} faces, {round(time.time() - start_time, 3)} sec."
+        )
+        return True
+
+    def _replace(self, gallery: FaceGallery) -> bool:
+        start_time = time.time()
+        self.predictor.replace_gallery(gallery)
+        self.reload_count += 1
+        config.logger.info(f"Gallery reloaded: {len(gallery)} faces, {round(time.time() - start_time, 3)} sec.")
+        return True
+
+    def notify(self) -> None:
+        """Wake the watcher to poll now instead of at the next interval."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                self.poll()
+            except Exception:
+                config.logger.error(f"Gallery reload failed: {traceback.format_exc()}")
+
+    def start(self) -> None:
+        """Poll in a daemon thread every `interval` seconds."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="GalleryWatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._store is not None:
+            self._store.close()
+            self._store = None
@@ -0,0 +1,119 @@
+"""
+Frame stamps and per-hop latency histograms, from capture to the WebSocket client.
+"""
+
+import bisect
+import threading
+import time
+from typing import Optional
+
+# Hops of a frame through the pipeline, all measured on `time.monotonic`, which every process shares.
+LATENCY_HOPS = (
+    "capture_to_detect",
+    "detect_to_recognize",
+    "recognize_to_publish",
+    "capture_to_publish",
+    "frame_to_client",
+)
+
+# Upper bounds of the histogram buckets in milliseconds, the last bucket takes everything slower.
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 35, 50, 75, 100, 150, 200, 350, 500, 750, 1000, 2000, 5000)
+
+
+class FrameStamp:
+    """The capture sequence number and the monotonic times of one frame as it moves through the pipeline."""
+
+    __slots__ = ["sequence", "captured_at", "detected_at", "recognized_at"]
+
+    def __init__(self, sequence: int, captured_at: float):
+        self.sequence = sequence
+        self.captured_at = captured_at
+        self.detected_at: Optional[float] = None
+        self.recognized_at: Optional[float] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "sequence": self.sequence,
+            "captured_at": self.captured_at,
+            "detected_at": self.detected_at,
+            "recognized_at": self.recognized_at,
+        }
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of latencies, constant memory however many samples are recorded."""
+
+    def __init__(self, bounds_ms: tuple = BUCKET_BOUNDS_MS):
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float) -> None:
+        milliseconds = max(seconds, 0.0) * 1000
+        self.counts[bisect.bisect_left(self.bounds_ms, milliseconds)] += 1
+        self.count += 1
+        self.total_ms += milliseconds
+        self.max_ms = max(self.max_ms, milliseconds)
+
+    def percentile(self, percent: float) -> float:
+        """The upper bound of the bucket holding the percentile, `max_ms` for the last bucket."""
+        if not self.count:
+            return 0.0
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return float(self.bounds_ms[index]) if index < len(self.bounds_ms) else self.max_ms
+        return self.max_ms
+
+    def stats(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 2),
+            "buckets": {
+                **{f"le_{bound}": count for bound, count in zip(self.bounds_ms, self.counts)},
+                "inf": self.counts[-1],
+            },
+        }
+
+
+class LatencyTracker:
+    """
+    One `LatencyHistogram` per hop of `LATENCY_HOPS`. \n
+    Recorded from the detection loop and from the FastAPI tasks publishing its frames and logs,
+    so every access holds a lock.
+    """
+
+    def __init__(self, hops: tuple = LATENCY_HOPS):
+        self._lock = threading.Lock()
+        self.histograms = {hop: LatencyHistogram() for hop in hops}
+
+    def record(self, hop: str, start: Optional[float], end: Optional[float] = None) -> None:
+        """
+        Record the time between two monotonic timestamps.
+
+        Parameters:
+            hop (str): One of the tracked hops.
+            start (Optional[float]): The `time.monotonic` start, None records nothing.
+            end (Optional[float]): The end, now if None.
+        """
+        if start is None:
+            return
+        end = time.monotonic() if end is None else end
+        with self._lock:
+            self.histograms[hop].record(end - start)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {hop: histogram.stats() for hop, histogram in self.histograms.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms = {hop: LatencyHistogram() for hop in self.histograms}
@@ -0,0 +1,74 @@
+"""
+Frame rate, waiting time and CPU share of a frame loop.
+"""
+
+import time
+from typing import Optional
+
+# Seconds a frame loop blocks on its channel before it checks whether it should stop.
+FRAME_WAIT_TIMEOUT = 0.1
+
+
+class LoopMeter:
+    """
+    Measure a loop that blocks for frames and processes them, over windows of `window` seconds. \n
+    `fps` counts processed frames only, not loop iterations or wait timeouts. `idle_percent` is the
+    share of the window spent blocked waiting for a frame and `cpu_percent` the CPU time of the loop
+    thread over the window, near zero while no frames arrive. Every method must be called from the
+    thread running the loop, `time.thread_time` is per thread.
+    """
+
+    def __init__(self, window: float = 1.0):
+        self.window = window
+        self.frames = 0
+        self.fps = 0
+        self.idle_percent = 0.0
+        self.cpu_percent = 0.0
+        self._window_frames = 0
+        self._window_waited = 0.0
+        self._window_started: Optional[float] = None
+        self._window_cpu = 0.0
+
+    def _roll(self, now: float) -> None:
+        if self._window_started is None:
+            self._window_started, self._window_cpu = now, time.thread_time()
+            return
+        elapsed = now - self._window_started
+        if elapsed < self.window:
+            return
+        cpu = time.thread_time()
+        self.fps = round(self._window_frames / elapsed)
+        self.idle_percent = round(min(self._window_waited / elapsed, 1.0) * 100, 1)
+        self.cpu_percent = round((cpu - self._window_cpu) / elapsed * 100, 1)
+        self._window_frames, self._window_waited = 0, 0.0
+        self._window_started, self._window_cpu = now, cpu
+
+    def waited(self, seconds: float, now: Optional[float] = None) -> None:
+        """
+        Record a wait for a frame, whether it ended with a frame or a timeout.
+
+        Parameters:
+            seconds (float): The time spent blocked.
+            now (Optional[float]): The `time.monotonic` end of the wait, now if None.
+        """
+        self._roll(time.monotonic() if now is None else now)
+        self._window_waited += max(seconds, 0.0)
+
+    def frame(self, now: Optional[float] = None) -> None:
+        """
+        Count a processed frame.
+
+        Parameters:
+            now (Optional[float]): The `time.monotonic` time the frame was done, now if None.
+        """
+        self._roll(time.monotonic() if now is None else now)
+        self.frames += 1
+        self._window_frames += 1
+
+    def stats(self) -> dict:
+        return {
+            "fps": self.fps,
+            "frames": self.frames,
+            "idle_percent": self.idle_percent,
+            "cpu_percent": self.cpu_percent,
+        }
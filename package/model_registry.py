@@ -0,0 +1,197 @@
+"""
+Process-wide registry of dlib models: each model file is loaded once and shared by every consumer.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, Optional
+
+import dlib
+
+import package.config as config
+
+SHAPE_PREDICTOR = "shape_predictor"
+FACE_RECOGNITION_MODEL = "face_recognition_model"
+FRONTAL_FACE_DETECTOR = "frontal_face_detector"
+
+_LOADERS: dict[str, Callable[[str], Any]] = {
+    SHAPE_PREDICTOR: dlib.shape_predictor,
+    FACE_RECOGNITION_MODEL: dlib.face_recognition_model_v1,
+    FRONTAL_FACE_DETECTOR: lambda _: dlib.get_frontal_face_detector(),
+}
+
+
+def _resident_bytes() -> Optional[int]:
+    """The resident set size of this process, None where `/proc` is not available."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ModelEntry:
+    __slots__ = ["kind", "path", "mtime_ns", "model", "load_time", "resident_bytes", "hits", "last_used"]
+
+    def __init__(self, kind: str, path: str, mtime_ns: int, model: Any, load_time: float, resident_bytes: int):
+        self.kind = kind
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.model = model
+        self.load_time = load_time
+        self.resident_bytes = resident_bytes
+        self.hits = 0
+        self.last_used = time.time()
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "path": self.path,
+            "load_time": round(self.load_time, 3),
+            "resident_bytes": self.resident_bytes,
+            "hits": self.hits,
+            "last_used": self.last_used,
+        }
+
+
+class ModelRegistry:
+    """
+    Load each dlib model once per process and hand out the shared instance. \n
+    Models are keyed by kind, absolute path and modification time, so replacing a model file
+    loads the new one on the next request. The models are only read after loading and are
+    shared between threads.
+
+    `evict` and `trim` drop models under memory pressure (least recently used first); consumers
+    still holding a model keep it alive, the next request loads it again.
+    Stats hooks are called with `ModelEntry.to_dict()` after every load.
+    """
+
+    def __init__(self):
+        self._models: OrderedDict[tuple[str, str], ModelEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats_hooks: list[Callable[[dict], None]] = []
+        self.loads = 0
+        self.hits = 0
+
+    def get(self, kind: str, path: str = "") -> Any:
+        """
+        Return the shared model of a file, loading it on first use.
+
+        Parameters:
+            kind (str): `shape_predictor`, `face_recognition_model` or `frontal_face_detector`.
+            path (str): The model file path, unused for the frontal face detector.
+
+        Returns:
+            model (Any): The dlib model.
+        """
+        if kind not in _LOADERS:
+            raise ValueError(f"Unknown model kind: {kind}, expected one of {tuple(_LOADERS)}.")
+        path = os.path.abspath(path) if path else ""
+        mtime_ns = os.stat(path).st_mtime_ns if path else 0
+        key = (kind, path)
+        # Loading under the lock: concurrent first requests wait for one load instead of loading twice.
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None and entry.mtime_ns == mtime_ns:
+                entry.hits += 1
+                entry.last_used = time.time()
+                self._models.move_to_end(key)
+                self.hits += 1
+                return entry.model
+
+            resident_before = _resident_bytes()
+            start_time = time.time()
+            model = _LOADERS[kind](path)
+            load_time = time.time() - start_time
+            resident_after = _resident_bytes()
+            # The RSS growth misses memory reused from earlier frees; the weights take at least the file size.
+            resident_bytes = os.path.getsize(path) if path else 0
+            if resident_before is not None and resident_after is not None:
+                resident_bytes = max(resident_after - resident_before, resident_bytes)
+
+            entry = ModelEntry(kind, path, mtime_ns, model, load_time, resident_bytes)
+            self._models[key] = entry
+            self._models.move_to_end(key)
+            self.loads += 1
+            hooks = list(self._stats_hooks)
+
+        config.logger.info(
+            f"Loaded {kind} {path} in {round(load_time, 3)} sec, {round(resident_bytes / 2**20, 1)} MB resident."
+        )
+        for hook in hooks:
+            hook(entry.to_dict())
+        return model
+
+    def shape_predictor(self, path: str) -> dlib.shape_predictor:
+        return self.get(SHAPE_PREDICTOR, path)
+
+    def face_recognition_model(self, path: str) -> dlib.face_recognition_model_v1:
+        return self.get(FACE_RECOGNITION_MODEL, path)
+
+    def frontal_face_detector(self) -> dlib.fhog_object_detector:
+        return self.get(FRONTAL_FACE_DETECTOR)
+
+    def evict(self, kind: Optional[str] = None, path: Optional[str] = None) -> int:
+        """
+        Drop the registry's reference to matching models, every model by default.
+
+        Parameters:
+            kind (Optional[str]): Only evict this kind.
+            path (Optional[str]): Only evict this file.
+
+        Returns:
+            count (int): The number of evicted models.
+        """
+        path = os.path.abspath(path) if path else path
+        with self._lock:
+            keys = [
+                key for key in self._models if (kind is None or key[0] == kind) and (path is None or key[1] == path)
+            ]
+            for key in keys:
+                del self._models[key]
+        return len(keys)
+
+    def trim(self, max_resident_bytes: int) -> int:
+        """
+        Evict the least recently used models until the registered models fit a memory budget.
+
+        Parameters:
+            max_resident_bytes (int): The memory budget.
+
+        Returns:
+            count (int): The number of evicted models.
+        """
+        evicted = 0
+        with self._lock:
+            while self._models and sum(entry.resident_bytes for entry in self._models.values()) > max_resident_bytes:
+                key, entry = self._models.popitem(last=False)
+                config.logger.info(f"Evicted {entry.kind} {entry.path}.")
+                evicted += 1
+        return evicted
+
+    def add_stats_hook(self, hook: Callable[[dict], None]) -> None:
+        """Call `hook(stats)` after every model load."""
+        with self._lock:
+            self._stats_hooks.append(hook)
+
+    def stats(self) -> dict:
+        """
+        Report the registered models.
+
+        Returns:
+            stats (dict): Load and hit counts, total resident bytes and one dict per model.
+        """
+        with self._lock:
+            models = [entry.to_dict() for entry in self._models.values()]
+        return {
+            "loads": self.loads,
+            "hits": self.hits,
+            "resident_bytes": sum(model["resident_bytes"] for model in models),
+            "models": models,
+        }
+
+
+registry = ModelRegistry()
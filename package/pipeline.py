@@ -0,0 +1,178 @@
+"""
+Stages of the frame pipeline: worker threads joined by bounded queues, each with its own timing.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+import package.config as config
+from package.frame_channel import FRAME_POLICIES
+from package.latency import LatencyHistogram
+
+
+class Stage:
+    """
+    One step of the frame pipeline: `handler` run on a worker thread of its own, fed by a bounded queue. \n
+    The queue takes the frame channel policies. `latest` keeps only the newest item, `drop_oldest` keeps
+    up to `capacity` items and drops the oldest when full, `block` makes `submit` wait up to `block_timeout`
+    for room and drops the item after it. A handler result other than None is submitted to the `next` stage. \n
+    Every stage times its handler and how long items waited in its queue, so a slow stage shows in its own
+    numbers and not in the frame rate of the stage feeding it. A stage that is never started has no worker;
+    it times the work of its caller through `process` or `record`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Optional[Callable[[Any], Any]] = None,
+        capacity: int = 2,
+        policy: str = "drop_oldest",
+        block_timeout: float = 0.1,
+    ):
+        if policy not in FRAME_POLICIES:
+            raise ValueError(f"Unknown stage policy: {policy}, expected one of {FRAME_POLICIES}.")
+        self.name = name
+        self.handler = handler
+        self.capacity = 1 if policy == "latest" else max(capacity, 1)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.next: Optional[Stage] = None
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.timing = LatencyHistogram()
+        self.waiting = LatencyHistogram()
+        self._queue: deque = deque()
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def connect(self, stage: "Stage") -> "Stage":
+        """Feed the results of this stage to `stage`, which is returned so stages can be chained."""
+        self.next = stage
+        return stage
+
+    def submit(self, item: Any) -> bool:
+        """
+        Queue an item for the worker.
+
+        Parameters:
+            item (Any): The input of the handler.
+
+        Returns:
+            result (bool): False if the item was dropped, the stage is stopped or a `block` wait timed out.
+        """
+        with self._condition:
+            self.submitted += 1
+            if self.policy == "block":
+                self._condition.wait_for(
+                    lambda: len(self._queue) < self.capacity or not self._running, self.block_timeout
+                )
+            if not self._running or (self.policy == "block" and len(self._queue) >= self.capacity):
+                self.dropped += 1
+                return False
+            if len(self._queue) >= self.capacity:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append((item, time.monotonic()))
+            self._condition.notify_all()
+            return True
+
+    def process(self, item: Any) -> Any:
+        """
+        Run the handler on an item and time it, on the calling thread.
+
+        Parameters:
+            item (Any): The input of the handler.
+
+        Returns:
+            result (Any): The handler result, None if it raised.
+        """
+        started = time.monotonic()
+        try:
+            result = self.handler(item)
+        except Exception as e:
+            config.logger.error(f"Error in pipeline stage {self.name}: {e}")
+            with self._condition:
+                self.failed += 1
+            result = None
+        self.record(time.monotonic() - started)
+        return result
+
+    def record(self, seconds: float) -> None:
+        """Count one item processed in `seconds`, for work done outside `handler`."""
+        with self._condition:
+            self.processed += 1
+            self.timing.record(seconds)
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or not self._running)
+                if not self._queue:
+                    return
+                item, queued_at = self._queue.popleft()
+                self.waiting.record(time.monotonic() - queued_at)
+                self._condition.notify_all()
+            result = self.process(item)
+            if result is not None and self.next is not None:
+                self.next.submit(result)
+
+    def start(self) -> None:
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._work, name=f"stage-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop taking items; the worker finishes the queued ones first."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        with self._condition:
+            timing, waiting = self.timing.stats(), self.waiting.stats()
+            return {
+                "policy": self.policy,
+                "capacity": self.capacity,
+                "queued": len(self._queue),
+                "submitted": self.submitted,
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "timing": {key: value for key, value in timing.items() if key != "buckets"},
+                "waiting": {key: value for key, value in waiting.items() if key != "buckets"},
+            }
+
+
+class Pipeline:
+    """The stages of a frame pipeline by name, started and stopped together in order."""
+
+    def __init__(self, *stages: Stage):
+        self.stages = {stage.name: stage for stage in stages}
+
+    def __getitem__(self, name: str) -> Stage:
+        return self.stages[name]
+
+    def start(self) -> None:
+        """Start a worker for every stage with a handler."""
+        for stage in self.stages.values():
+            if stage.handler is not None:
+                stage.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the stages in order, so what a stage finishes still reaches the stages after it."""
+        for stage in self.stages.values():
+            stage.stop(timeout)
+
+    def stats(self) -> dict:
+        return {name: stage.stats() for name, stage in self.stages.items()}
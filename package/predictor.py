@@ -1,14 +1,18 @@
-import csv
+import copy
 import time
 import traceback
+from collections.abc import Iterable, Mapping
 from multiprocessing import Queue
 from typing import Optional
 
-import cv2
 import dlib
 import numpy as np
 
 import package.config as config
+import package.gallery_file as gallery_file
+from package.face_aligner import FaceAligner
+from package.face_gallery import FaceGallery
+from package.gallery_index import BruteForceIndex, IVFIndex
 
 
 class Predictor:
@@ -16,18 +20,56 @@ class Predictor:
         self,
         dlib_predictor: dlib.shape_predictor,
         dlib_recognition_model: dlib.face_recognition_model_v1,
-        registered_face_descriptor: np.ndarray,
+        registered_face_descriptor: FaceGallery | dict,
         sensitivity: float,
+        index: Optional[BruteForceIndex | IVFIndex] = None,
     ):
         self.dlib_predictor = dlib_predictor
         self.dlib_recognition_model = dlib_recognition_model
-        self.registered_face_descriptor = registered_face_descriptor
+        self.aligner = FaceAligner(dlib_predictor)
         self.sensitivity = sensitivity
+        # The gallery and its index are swapped together as one reference, so a search never pairs
+        # a new gallery with a stale index and a reload never blocks recognition.
+        self._snapshot = (
+            FaceGallery.from_dict(registered_face_descriptor),
+            index if index is not None else BruteForceIndex(),
+        )
+
+    @property
+    def registered_face_descriptor(self) -> FaceGallery:
+        return self._snapshot[0]
+
+    @property
+    def index(self) -> BruteForceIndex | IVFIndex:
+        return self._snapshot[1]
+
+    def replace_gallery(self, gallery: FaceGallery | dict) -> None:
+        """
+        Swap in a new gallery. The index is refreshed on a copy before the swap,
+        so searches running meanwhile keep using the previous gallery and index.
+
+        Parameters:
+            gallery (FaceGallery | dict): The registered faces.
+        """
+        gallery = FaceGallery.from_dict(gallery)
+        index = copy.copy(self.index)
+        index.refresh(gallery)
+        self._snapshot = (gallery, index)
+
+    def update_gallery(self, upserts: Mapping[str, np.ndarray], removals: Iterable[str] = ()) -> None:
+        """
+        Apply enrolls and deletes to the gallery without reloading it.
+
+        Parameters:
+            upserts (Mapping[str, np.ndarray]): The enrolled descriptors keyed by user name.
+            removals (Iterable[str]): The deleted user names.
+        """
+        self.replace_gallery(self.registered_face_descriptor.updated(upserts, removals))
 
     @staticmethod
     def save_feature(out_put_path: str, face_descriptor: np.ndarray, user_name: str = "User") -> bool:
         """
-        Save face descriptor to CSV file. \n
+        Append face descriptor to the gallery file (or the legacy CSV file). \n
         CSV format: name,f1,f2,...,f128
 
         Parameters:
@@ -39,11 +81,7 @@ class Predictor:
             result (bool): Save status.
         """
         try:
-            if isinstance(face_descriptor, np.ndarray):
-                face_descriptor = face_descriptor.tolist()
-            with open(out_put_path, mode="a+", newline="") as file:
-                writer = csv.writer(file)
-                writer.writerow([user_name] + face_descriptor)
+            gallery_file.save_descriptor(out_put_path, user_name, face_descriptor)
             config.logger.info(f"Feature saved successfully for {user_name}.")
             return True
         except Exception as err:
@@ -62,17 +100,10 @@ class Predictor:
         """
         try:
             start_time = time.time()
-            result = False
             current_face_descriptor, _ = self.feature_extraction(face_roi)
-            distance, name = self.euclidean_distance(current_face_descriptor)
-            if distance <= self.sensitivity:
-                config.logger.info("pass.")
-                detection_results.put([True, distance, name])
-                result = True
-            else:
-                config.logger.info("fail.")
-                detection_results.put([False, distance, "Unknown"])
-                result = False
+            detection_result = self.verify(current_face_descriptor)
+            detection_results.put(detection_result)
+            result = detection_result[0]
             end_time = time.time()
             execution_time = round(end_time - start_time, 3)
             config.logger.info(f"Face Recognition Time: {execution_time} sec.")
@@ -82,6 +113,56 @@ class Predictor:
             config.logger.debug(error_info)
             return False
 
+    def verify(self, current_face_descriptor: np.ndarray) -> list:
+        """
+        Match a face descriptor against the registered faces.
+
+        Parameters:
+            current_face_descriptor (np.ndarray): The current face descriptor.
+
+        Returns:
+            result (list): `[passed, distance, name]`, name is "Unknown" when not passed.
+        """
+        distance, name = self.euclidean_distance(current_face_descriptor)
+        if distance <= self.sensitivity:
+            config.logger.info("pass.")
+            return [True, distance, name]
+        config.logger.info("fail.")
+        return [False, distance, "Unknown"]
+
+    def chip_descriptor(self, face_chip: np.ndarray) -> np.ndarray:
+        """
+        Get the face descriptor of an aligned 150x150 face chip.
+
+        Parameters:
+            face_chip (np.ndarray): The face chip from `FaceAligner.align`.
+
+        Returns:
+            face_descriptor (np.ndarray): The face descriptor.
+        """
+        return np.array(self.dlib_recognition_model.compute_face_descriptor(face_chip))
+
+    def extract(self, face_roi: np.ndarray) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Align a face ROI and get its descriptor, keeping the chip for thumbnails and caching.
+
+        Parameters:
+            face_roi (np.ndarray): The face ROI.
+
+        Returns:
+            face_descriptor (np.ndarray): The face descriptor, None on failure.
+            face_chip (np.ndarray): The aligned face chip, None on failure.
+        """
+        try:
+            face_chip, _ = self.aligner.align(face_roi)
+            if face_chip is None:
+                return None, None
+            return self.chip_descriptor(face_chip), face_chip
+        except Exception:
+            error_info = traceback.format_exc()
+            config.logger.debug(error_info)
+            return None, None
+
     def feature_extraction(
         self, face_roi: np.ndarray
     ) -> tuple[Optional[np.ndarray], Optional[dlib.full_object_detection]]:
@@ -95,15 +176,10 @@ class Predictor:
             face_descriptor (np.ndarray): The face descriptor.
         """
         try:
-            if np.mean(face_roi) < 10:
-                config.logger.error("The image is incorrect.")
+            face_chip, feature_coordinates = self.aligner.align(face_roi)
+            if face_chip is None:
                 return None, None
-            landmarks_frame = cv2.cvtColor(face_roi, cv2.COLOR_BGR2RGB)
-            dlib_coordinate = dlib.rectangle(0, 0, face_roi.shape[0], face_roi.shape[1])
-            feature_coordinates = self.dlib_predictor(landmarks_frame, dlib_coordinate)
-            current_face_descriptor = np.array(
-                self.dlib_recognition_model.compute_face_descriptor(face_roi, feature_coordinates)
-            )
+            current_face_descriptor = self.chip_descriptor(face_chip)
             return current_face_descriptor, feature_coordinates
         except Exception:
             error_info = traceback.format_exc()
@@ -122,18 +198,12 @@ class Predictor:
             matched_name (str): The name of the matched face.
         """
         try:
-            if len(self.registered_face_descriptor) == 0:
+            matches = self.nearest_faces(current_face_descriptor, top_k=1)
+            if not matches:
                 config.logger.error("Model data is empty.")
                 return 999, "Unknown"
 
-            min_dist = float("inf")
-            matched_name = None
-
-            for name, features in self.registered_face_descriptor.items():
-                dist = np.linalg.norm(current_face_descriptor - features)
-                if dist < min_dist:
-                    min_dist = dist
-                    matched_name = name
+            matched_name, min_dist = matches[0]
 
             config.logger.debug(f"Minimum distance: {min_dist}, matched: {matched_name}")
             return min_dist, matched_name
@@ -141,3 +211,17 @@ class Predictor:
             error_info = traceback.format_exc()
             config.logger.debug(error_info)
             return None, None
+
+    def nearest_faces(self, current_face_descriptor: np.ndarray, top_k: int = 5) -> list[tuple[str, float]]:
+        """
+        Find the `top_k` registered faces nearest to the current face descriptor.
+
+        Parameters:
+            current_face_descriptor (np.ndarray): The current face descriptor.
+            top_k (int): The number of candidates to return.
+
+        Returns:
+            matches (list[tuple[str, float]]): `(name, distance)` pairs, nearest first.
+        """
+        gallery, index = self._snapshot
+        return index.search(gallery, current_face_descriptor, top_k=top_k)
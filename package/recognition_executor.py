@@ -0,0 +1,198 @@
+"""
+Persistent workers for face recognition, so the detection loop only hands a face ROI over and keeps running.
+"""
+
+import multiprocessing
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Optional
+
+import numpy as np
+
+import package.config as config
+from package.descriptor_batcher import DescriptorBatcher
+from package.model_registry import registry
+from package.predictor import Predictor
+
+EXECUTOR_KINDS = ("thread", "process")
+
+# Process workers: the dlib models are loaded once per worker by `_init_worker`.
+_worker_predictor: Optional[Predictor] = None
+
+
+def _init_worker(dlib_predictor_path: str, dlib_recognition_model_path: str) -> None:
+    global _worker_predictor
+    _worker_predictor = Predictor(
+        registry.shape_predictor(dlib_predictor_path),
+        registry.face_recognition_model(dlib_recognition_model_path),
+        {},
+        0,
+    )
+
+
+def _extract_in_worker(face_roi: np.ndarray) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    return _worker_predictor.extract(face_roi)
+
+
+class RecognitionExecutor:
+    """
+    Run descriptor extraction on a fixed pool of workers instead of one thread per recognition. \n
+    `thread`: a thread pool sharing the predictor of the app. With `batch_size > 1` the faces go to
+    a `DescriptorBatcher` instead, which computes them in batched dlib calls.
+    `process`: a process pool; every worker loads the dlib models once at start, so dlib no longer
+    competes with the detection loop for the GIL. Only the face ROI goes to the worker and only the
+    128-d descriptor and the 150x150 face chip come back.
+
+    Matching runs in the app process against the live gallery, and the result
+    `[passed, distance, name, face_chip, descriptor, tag, recognized_at]` is put on an in-process queue,
+    `recognized_at` being the `time.monotonic` end of the matching.
+    At most `queue_size` jobs are pending; `submit` drops a face rather than block the loop.
+    A job not finished within `timeout` seconds is abandoned and its result discarded. A job still
+    queued is cancelled; a running one cannot be interrupted and keeps its slot until it finishes,
+    so `queue_size` bounds the work actually in flight.
+    """
+
+    def __init__(
+        self,
+        predictor: Predictor,
+        results: Any,
+        kind: str = "thread",
+        workers: int = 2,
+        queue_size: int = 4,
+        timeout: float = 5.0,
+        dlib_predictor_path: Optional[str] = None,
+        dlib_recognition_model_path: Optional[str] = None,
+        batch_size: int = 1,
+        batch_wait_ms: float = 5.0,
+    ):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown recognition executor: {kind}, expected one of {EXECUTOR_KINDS}.")
+        self.predictor = predictor
+        self.results = results
+        self.kind = kind
+        self.queue_size = max(queue_size, 1)
+        self.timeout = timeout
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.timed_out = 0
+        self.failed = 0
+        self.recognition_seconds = 0.0
+        # Reentrant: cancelling an expired job runs its done callback in the thread holding the lock.
+        self._lock = threading.RLock()
+        self._pending: dict[Future, float] = {}
+        # Running jobs past their deadline, their results are discarded.
+        self._expired: set[Future] = set()
+        self._batcher: Optional[DescriptorBatcher] = None
+
+        if kind == "process":
+            if not dlib_predictor_path or not dlib_recognition_model_path:
+                raise ValueError("The process executor needs the dlib model paths.")
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(dlib_predictor_path, dlib_recognition_model_path),
+            )
+        elif batch_size > 1:
+            self._executor = None
+            self._batcher = DescriptorBatcher(predictor, batch_size, batch_wait_ms)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Recognition")
+        config.logger.info(
+            f"Recognition executor: {kind}, {workers} workers, queue size {self.queue_size}, batch size {batch_size}"
+        )
+
+    def _expire(self, now: float) -> None:
+        for future, deadline in list(self._pending.items()):
+            if now < deadline or future in self._expired:
+                continue
+            self.timed_out += 1
+            config.logger.warning("Face recognition timed out.")
+            if future.cancel():
+                self._pending.pop(future, None)
+            else:
+                self._expired.add(future)
+
+    def submit(self, face_roi: np.ndarray, tag: Any = None) -> bool:
+        """
+        Queue a face ROI for recognition without blocking.
+
+        Parameters:
+            face_roi (np.ndarray): The face ROI. It is copied, the frame may be drawn on afterwards.
+            tag (Any): Returned with the result, e.g. to find the track of the face.
+
+        Returns:
+            result (bool): False if the queue is full and the face was dropped.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            if len(self._pending) >= self.queue_size:
+                self.dropped += 1
+                return False
+            face_roi = np.array(face_roi, copy=True)
+            if self._batcher is not None:
+                future = self._batcher.submit(face_roi)
+            elif self.kind == "process":
+                future = self._executor.submit(_extract_in_worker, face_roi)
+            else:
+                future = self._executor.submit(self.predictor.extract, face_roi)
+            self._pending[future] = now + self.timeout
+            self.submitted += 1
+        future.add_done_callback(lambda done: self._on_done(done, tag))
+        return True
+
+    def _on_done(self, future: Future, tag: Any = None) -> None:
+        with self._lock:
+            deadline = self._pending.pop(future, None)
+            if future in self._expired:
+                # Already counted as timed out, it only held its slot until now.
+                self._expired.discard(future)
+                return
+            if deadline is None or future.cancelled():
+                return
+            now = time.monotonic()
+            if now > deadline:
+                # A late answer could belong to someone who already left.
+                self.timed_out += 1
+                config.logger.warning("Face recognition timed out.")
+                return
+            self.recognition_seconds += now - (deadline - self.timeout)
+        try:
+            descriptor, face_chip = future.result()
+            result = (
+                self.predictor.verify(descriptor) + [face_chip, descriptor, tag, time.monotonic()]
+                if descriptor is not None
+                else None
+            )
+        except Exception:
+            config.logger.debug(traceback.format_exc())
+            result = None
+        with self._lock:
+            if result is None:
+                self.failed += 1
+                return
+            self.completed += 1
+        self.results.put(result)
+
+    @property
+    def mean_recognition_seconds(self) -> float:
+        """The average time from submit to descriptor of the completed jobs."""
+        with self._lock:
+            finished = self.completed + self.failed
+            return self.recognition_seconds / finished if finished else 0.0
+
+    @property
+    def pending(self) -> int:
+        """The number of queued or running jobs."""
+        with self._lock:
+            return len(self._pending)
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._batcher is not None:
+            self._batcher.close()
+        else:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
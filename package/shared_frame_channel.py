@@ -0,0 +1,252 @@
+"""
+Frame channel over shared memory, for a capture process feeding the detection process.
+"""
+
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from package.frame_channel import FRAME_POLICIES
+
+# Largest frame a slot holds, 1080p BGR.
+MAX_FRAME_BYTES = 1920 * 1080 * 3
+
+# Channel header: sequence of the next frame, slot held by the consumer, frames put, closed flag, last read sequence,
+# consumer waiting in `get`.
+_NEXT_SEQUENCE, _HELD, _PUT_COUNT, _CLOSED, _LAST_READ, _WAITING = range(6)
+_META_SIZE = 8
+# Slot header: frame sequence (0 empty, -1 being written), height, width, channels.
+_SEQUENCE, _HEIGHT, _WIDTH, _CHANNELS = range(4)
+_SLOT_HEADER_SIZE = 4
+_ALIGNMENT = 64
+
+
+class SharedFrameChannel:
+    """
+    `FrameChannel` across processes: frames are written into `capacity + 1` slots of one
+    `multiprocessing.shared_memory` block and never pickled or sent through a pipe. \n
+    Every slot has a small header with the frame sequence number, the put timestamp and the frame shape.
+    The producer picks a slot under a shared lock, copies the frame in, then publishes its sequence number.
+    The consumer takes the oldest unread frame, or the newest one with the `latest` policy, and holds that
+    slot until its next `get`; frames skipped in the sequence are counted as dropped. \n
+    One producer and one consumer. The process creating the channel owns the memory and unlinks it on `close`;
+    the channel is handed to the other process as a `multiprocessing.Process` argument.
+    """
+
+    def __init__(self, capacity: int = 2, policy: str = "latest", max_frame_bytes: int = MAX_FRAME_BYTES):
+        if policy not in FRAME_POLICIES:
+            raise ValueError(f"Unknown frame policy: {policy}, expected one of {FRAME_POLICIES}.")
+        self.capacity = 1 if policy == "latest" else max(capacity, 1)
+        self.policy = policy
+        self.max_frame_bytes = max_frame_bytes
+        self.slots = self.capacity + 1
+        self._shm = shared_memory.SharedMemory(create=True, size=self._layout_size())
+        self._owner = True
+        self._condition = multiprocessing.get_context("spawn").Condition()
+        self._attach()
+        self._meta[:] = 0
+        self._meta[_NEXT_SEQUENCE] = 1
+        self._meta[_HELD] = -1
+        self._headers[:] = 0
+        self._init_counters()
+
+    def _layout_size(self) -> int:
+        slot_bytes = -(-self.max_frame_bytes // _ALIGNMENT) * _ALIGNMENT
+        return self._data_offset() + self.slots * slot_bytes
+
+    def _data_offset(self) -> int:
+        header_bytes = 8 * (_META_SIZE + self.slots * (_SLOT_HEADER_SIZE + 1))
+        return -(-header_bytes // _ALIGNMENT) * _ALIGNMENT
+
+    def _attach(self) -> None:
+        buffer = self._shm.buf
+        self._meta = np.ndarray((_META_SIZE,), np.int64, buffer, 0)
+        offset = 8 * _META_SIZE
+        self._headers = np.ndarray((self.slots, _SLOT_HEADER_SIZE), np.int64, buffer, offset)
+        offset += 8 * self.slots * _SLOT_HEADER_SIZE
+        self._timestamps = np.ndarray((self.slots,), np.float64, buffer, offset)
+        slot_bytes = -(-self.max_frame_bytes // _ALIGNMENT) * _ALIGNMENT
+        self._data = np.ndarray((self.slots, slot_bytes), np.uint8, buffer, self._data_offset())
+
+    def _init_counters(self) -> None:
+        self.delivered = 0
+        self.dropped = 0
+        self.last_age = 0.0
+        self.last_sequence = 0
+        self.last_timestamp = 0.0
+        self.max_age = 0.0
+        self._total_age = 0.0
+
+    def __getstate__(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "policy": self.policy,
+            "max_frame_bytes": self.max_frame_bytes,
+            "slots": self.slots,
+            "name": self._shm.name,
+            "condition": self._condition,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.capacity = state["capacity"]
+        self.policy = state["policy"]
+        self.max_frame_bytes = state["max_frame_bytes"]
+        self.slots = state["slots"]
+        self._condition = state["condition"]
+        # Child processes share the resource tracker of the owner, which unlinks the block.
+        self._shm = shared_memory.SharedMemory(name=state["name"])
+        self._owner = False
+        self._attach()
+        self._init_counters()
+
+    def _unread(self) -> list[int]:
+        last_read = self._meta[_LAST_READ]
+        return [index for index in range(self.slots) if self._headers[index, _SEQUENCE] > last_read]
+
+    def _take_slot(self, timeout: Optional[float]) -> Optional[int]:
+        def has_room() -> bool:
+            return len(self._unread()) < self.capacity or self._meta[_CLOSED]
+
+        if self.policy == "block" and not self._condition.wait_for(has_room, timeout):
+            return None
+        if self._meta[_CLOSED]:
+            return None
+        unread = self._unread()
+        if len(unread) >= self.capacity:
+            # Overwrite the oldest unread frame, the consumer sees the gap in the sequence.
+            return min(unread, key=lambda index: self._headers[index, _SEQUENCE])
+        held = self._meta[_HELD]
+        for index in range(self.slots):
+            if index != held and index not in unread and self._headers[index, _SEQUENCE] != -1:
+                return index
+        return None
+
+    def put(self, frame: np.ndarray, timeout: Optional[float] = None, timestamp: Optional[float] = None) -> bool:
+        """
+        Copy a frame into a free slot.
+
+        Parameters:
+            frame (np.ndarray): The decoded uint8 frame, at most `max_frame_bytes`.
+            timeout (Optional[float]): Seconds to wait for a slot with the `block` policy, None to wait forever.
+            timestamp (Optional[float]): The `time.monotonic` capture time of the frame, now if None.
+
+        Returns:
+            result (bool): False if the frame was not queued, the channel is closed or the wait timed out.
+        """
+        if frame.dtype != np.uint8 or frame.nbytes > self.max_frame_bytes:
+            raise ValueError(f"Frame {frame.shape} {frame.dtype} does not fit a {self.max_frame_bytes} bytes slot.")
+        with self._condition:
+            index = self._take_slot(timeout)
+            if index is None:
+                return False
+            self._headers[index, _SEQUENCE] = -1
+        shape = frame.shape if frame.ndim == 3 else (*frame.shape, 1)
+        np.copyto(self._data[index, : frame.nbytes].reshape(frame.shape), frame)
+        with self._condition:
+            self._headers[index, _HEIGHT : _CHANNELS + 1] = shape
+            self._timestamps[index] = time.monotonic() if timestamp is None else timestamp
+            self._headers[index, _SEQUENCE] = self._meta[_NEXT_SEQUENCE]
+            self._meta[_NEXT_SEQUENCE] += 1
+            self._meta[_PUT_COUNT] += 1
+            self._condition.notify_all()
+        return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Take the next frame.
+
+        Parameters:
+            timeout (Optional[float]): Seconds to wait for a frame, None to wait forever.
+
+        Returns:
+            frame (Optional[np.ndarray]): A view of the frame in shared memory, valid until the next `get`.
+                None on timeout or when closed.
+        """
+        with self._condition:
+            self._meta[_WAITING] = 1
+            try:
+                ready = self._condition.wait_for(lambda: self._unread() or self._meta[_CLOSED], timeout)
+            finally:
+                self._meta[_WAITING] = 0
+            if not ready:
+                return None
+            unread = self._unread()
+            if not unread:
+                return None
+            pick = max if self.policy == "latest" else min
+            index = pick(unread, key=lambda slot: self._headers[slot, _SEQUENCE])
+            sequence = self._headers[index, _SEQUENCE]
+            self.dropped += int(sequence - self._meta[_LAST_READ] - 1)
+            self._meta[_LAST_READ] = sequence
+            self._meta[_HELD] = index
+            height, width, channels = (int(value) for value in self._headers[index, _HEIGHT : _CHANNELS + 1])
+            timestamp = float(self._timestamps[index])
+            age = time.monotonic() - timestamp
+            self._condition.notify_all()
+        self.delivered += 1
+        self.last_age = age
+        self.last_sequence = int(sequence)
+        self.last_timestamp = timestamp
+        self.max_age = max(self.max_age, age)
+        self._total_age += age
+        frame = self._data[index, : height * width * channels].reshape(height, width, channels)
+        return frame if channels > 1 else frame[:, :, 0]
+
+    def wants_frame(self) -> bool:
+        """True if the consumer is ready for a new frame; with `latest`, only while it waits in `get`."""
+        with self._condition:
+            if self.policy == "latest":
+                return bool(self._meta[_WAITING])
+            return len(self._unread()) < self.capacity
+
+    def empty(self) -> bool:
+        with self._condition:
+            return not self._unread()
+
+    def qsize(self) -> int:
+        with self._condition:
+            return len(self._unread())
+
+    @property
+    def put_count(self) -> int:
+        return int(self._meta[_PUT_COUNT])
+
+    @property
+    def mean_age(self) -> float:
+        """The average seconds a delivered frame waited in the channel."""
+        return self._total_age / self.delivered if self.delivered else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "capacity": self.capacity,
+            "put": self.put_count,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "queued": self.qsize(),
+            "last_age_ms": round(self.last_age * 1000, 2),
+            "mean_age_ms": round(self.mean_age * 1000, 2),
+            "max_age_ms": round(self.max_age * 1000, 2),
+        }
+
+    def close(self) -> None:
+        """Wake up a blocked producer or consumer; the owner also frees the shared memory."""
+        with self._condition:
+            self._meta[_CLOSED] = 1
+            self._condition.notify_all()
+        if self._owner:
+            # Views into the block must go before it can be closed.
+            self._meta = np.ones(_META_SIZE, dtype=np.int64)
+            self._headers = np.zeros((self.slots, _SLOT_HEADER_SIZE), dtype=np.int64)
+            self._timestamps = self._data = None
+            try:
+                self._shm.unlink()
+                self._shm.close()
+            except FileNotFoundError:
+                pass
+            except BufferError:
+                # A frame returned by `get` is still referenced, the mapping goes with it.
+                pass
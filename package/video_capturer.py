@@ -1,31 +1,56 @@
+import multiprocessing
 import threading
 import time
-from multiprocessing import Queue
-
-import cv2
+from typing import Any, Optional, Union
 
 import package.config as config
+from package.frame_channel import FrameChannel
+from package.shared_frame_channel import MAX_FRAME_BYTES, SharedFrameChannel
+from package.video_source import ReplaySource, describe_capture, open_video_source
 
 
 class VideoCapturer:
     """
-    Video Capturer class to capture video frames from RTSP or webcam. \n
-    Though `vide_queue` to store frames and `stop_event` to signal when to stop capturing.
+    Video Capturer class to capture video frames from RTSP, webcam or a recording replayed by `open_video_source`. \n
+    Though `vide_queue`, a bounded `FrameChannel`, to pass frames and `stop_event` to signal when to stop capturing. \n
+    Every frame is grabbed to keep the stream current, but only decoded when it is used:
+    `decimation` 0 retrieves a frame whenever the consumer is ready for one, N retrieves every N-th frame.
+    With the `latest` policy the consumer is ready only while it waits for a frame, so the frame it gets
+    was grabbed a moment ago rather than one processing period ago. With `block` or a recording,
+    0 decodes every frame; replay a recording with `fast` pacing and `block` to process every frame.
     """
 
-    def __init__(self, rtsp: str, video_queue: Queue, status_alive: bool = True):
+    def __init__(
+        self,
+        rtsp: str,
+        video_queue: Union[FrameChannel, SharedFrameChannel],
+        status_alive: bool = True,
+        stop_event: Optional[Any] = None,
+        decimation: int = 1,
+        source_options: Optional[dict] = None,
+    ):
         self.rtsp = rtsp
         self.video_queue = video_queue
         self.status_alive = status_alive
-        self.stop_event = threading.Event()
+        self.stop_event = stop_event or threading.Event()
+        self.decimation = max(decimation, 0)
+        self.source_options = source_options or {}
+        self.grabbed = 0
+        self.retrieved = 0
+
+    def _should_retrieve(self) -> bool:
+        if self.decimation == 0:
+            # `block` never drops a frame: every one is decoded and `put` waits for room.
+            return self.video_queue.policy == "block" or self.video_queue.wants_frame()
+        return (self.grabbed - 1) % self.decimation == 0
 
     def get_video(self) -> None:
         """
         Get video stream. Initialize VideoCapturer and input video queue and signal queue.
 
         Parameters:
-            rtsp (str): The RTSP URL.
-            video_queue (Queue): The video queue.
+            rtsp (str): The RTSP URL, web camera ID or recording.
+            video_queue (FrameChannel): The video frame channel.
 
         Returns:
             None
@@ -33,20 +58,50 @@ class VideoCapturer:
         Methods:
             Use video_queue.get() directly to get frames.
         """
+        self.cap = None
         try:
-            self.cap = cv2.VideoCapture(self.rtsp, cv2.CAP_AVFOUNDATION)
-            if not self.cap.isOpened():
+            try:
+                self.cap = open_video_source(self.rtsp, **self.source_options)
+            except Exception as e:
+                # E.g. a missing or broken recording: the same as a camera that does not open.
+                config.logger.debug(f"Error opening {self.rtsp}: {e}")
+            if self.cap is None or not self.cap.isOpened():
                 print(f"Cannot open camera: {self.rtsp}")
                 return
+            capture = describe_capture(self.cap)
+            config.logger.info(f"Capturing {self.rtsp}: {capture}")
+            max_frame_bytes = getattr(self.video_queue, "max_frame_bytes", 0)
+            if max_frame_bytes and capture["width"] * capture["height"] * 3 > max_frame_bytes:
+                config.logger.error(
+                    f"{self.rtsp} delivers {capture['width']}x{capture['height']} frames, larger than the "
+                    f"{max_frame_bytes} bytes slots of the capture process; set capture_width and capture_height "
+                    f"to the camera resolution or turn capture_process off."
+                )
+                return
+            if self.decimation == 0 and isinstance(self.cap, ReplaySource):
+                # A recording is replayed frame by frame, decoding on demand would depend on the consumer timing.
+                self.decimation = 1
 
             while not self.stop_event.is_set():
-                ret, frame = self.cap.read()
+                if not self.cap.grab():
+                    print("No frame received, breaking...")
+                    break
+                captured_at = time.monotonic()
+                self.grabbed += 1
+                if not self._should_retrieve():
+                    continue
+                ret, frame = self.cap.retrieve()
                 if not ret:
                     print("No frame received, breaking...")
                     break
-                frame = cv2.flip(frame, 1)
-                self.video_queue.put(frame)
+                self.retrieved += 1
+                # Mirrored by the `FramePreprocessor` of the consumer, after downscaling.
+                # Never blocks for long, the stop event is checked at least every second.
+                self.video_queue.put(frame, timeout=1.0, timestamp=captured_at)
                 time.sleep(0.001)
+        except ValueError as e:
+            # A frame larger than the shared memory slots, when the source did not report its resolution.
+            config.logger.error(f"Video capturer stopped: {e}")
         except BrokenPipeError as e:
             config.logger.debug(f"WebSocket connection broken in VideoCapturer: {e}")
             config.logger.info("Video capturer closed unexpectedly.")
@@ -54,10 +109,90 @@ class VideoCapturer:
             config.logger.debug(f"Error in VideoCapturer: {e}")
             config.logger.info("Video capturer closed unexpectedly.")
         finally:
-            if self.cap:
+            if self.cap is not None:
                 self.cap.release()
             self.status_alive = False
-            config.logger.debug("Video capturer thread stopped.")
+            config.logger.debug(f"Video capturer thread stopped, retrieved {self.retrieved} of {self.grabbed} frames.")
+
+    def stop(self):
+        self.stop_event.set()
+
+
+def _capture_main(rtsp: str, video_queue: SharedFrameChannel, stop_event: Any, options: dict) -> None:
+    VideoCapturer(rtsp, video_queue, stop_event=stop_event, **options).get_video()
+
+
+class CaptureProcess:
+    """
+    Run a `VideoCapturer` in its own process, so decoding does not share the GIL with MediaPipe and dlib. \n
+    Frames come back through a `SharedFrameChannel`. Same interface as `VideoCapturer`: `get_video`
+    starts the process and returns when it ends, `stop` asks it to end.
+    """
+
+    def __init__(self, rtsp: str, video_queue: SharedFrameChannel, status_alive: bool = True, **options):
+        context = multiprocessing.get_context("spawn")
+        self.rtsp = rtsp
+        self.video_queue = video_queue
+        self.status_alive = status_alive
+        self.stop_event = context.Event()
+        self._process = context.Process(
+            target=_capture_main,
+            args=(rtsp, video_queue, self.stop_event, options),
+            name="VideoCapturer",
+            daemon=True,
+        )
+
+    def get_video(self) -> None:
+        self._process.start()
+        self._process.join()
+        self.status_alive = False
+        config.logger.debug("Video capturer process stopped.")
 
     def stop(self):
         self.stop_event.set()
+
+
+def capture_source(video_config: Any) -> Union[str, int]:
+    """The recording to replay if `video_file` is set, else the RTSP URL or the web camera ID."""
+    # FIXME: rtsp 或 web_camera 資料型態不一致，需統一資料型態處理方法
+    if video_config.video_file:
+        return video_config.video_file
+    return video_config.rtsp if video_config.rtsp else video_config.web_camera
+
+
+def create_capture(
+    video_source: Union[str, int], video_config: Any
+) -> tuple[Union[FrameChannel, SharedFrameChannel], Union[VideoCapturer, CaptureProcess]]:
+    """
+    Create the frame channel and the capturer feeding it, in a thread or in a capture process.
+
+    Parameters:
+        video_source (Union[str, int]): The RTSP URL, the web camera ID or a recording, see `capture_source`.
+        video_config (Any): The video configuration with the frame buffer, capture process, backend and replay settings.
+
+    Returns:
+        video_queue (Union[FrameChannel, SharedFrameChannel]): The channel to take frames from.
+        video_capture (Union[VideoCapturer, CaptureProcess]): The capturer, run `get_video` in a thread.
+    """
+    options = {
+        "decimation": video_config.capture_decimation,
+        "source_options": {
+            "fps": video_config.video_fps,
+            "pacing": video_config.video_pacing,
+            "loop": video_config.video_loop,
+            "backend": video_config.capture_backend,
+            "buffer_size": video_config.capture_buffer_size,
+            "width": video_config.capture_width,
+            "height": video_config.capture_height,
+            "ffmpeg_options": video_config.ffmpeg_options,
+        },
+    }
+    if video_config.capture_process:
+        # Slots for 1080p, or for the requested resolution if larger.
+        max_frame_bytes = max(MAX_FRAME_BYTES, video_config.capture_width * video_config.capture_height * 3)
+        video_queue = SharedFrameChannel(
+            video_config.frame_buffer_size, video_config.frame_buffer_policy, max_frame_bytes
+        )
+        return video_queue, CaptureProcess(video_source, video_queue, **options)
+    video_queue = FrameChannel(video_config.frame_buffer_size, video_config.frame_buffer_policy)
+    return video_queue, VideoCapturer(video_source, video_queue, **options)
@@ -0,0 +1,260 @@
+"""
+Video sources: cameras and streams on a selectable OpenCV backend, and replayable video files,
+image directories and `.npz` frame archives.
+"""
+
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Optional, Union
+
+import cv2
+import numpy as np
+
+import package.config as config
+
+PACING_MODES = ("realtime", "fast")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+CAPTURE_BACKENDS = {
+    "any": cv2.CAP_ANY,
+    "ffmpeg": cv2.CAP_FFMPEG,
+    "v4l2": cv2.CAP_V4L2,
+    "gstreamer": cv2.CAP_GSTREAMER,
+    "avfoundation": cv2.CAP_AVFOUNDATION,
+}
+
+
+class ReplaySource(ABC):
+    """
+    A `cv2.VideoCapture`-like source over recorded frames, for benchmarks and regression tests without a camera. \n
+    `realtime` pacing releases frames at `fps` like a camera, `fast` as fast as they are read.
+    With `loop` the source starts over at the end instead of ending the stream.
+    Subclasses implement `_count` and `_frame`.
+    """
+
+    def __init__(self, fps: float = 30.0, pacing: str = "realtime", loop: bool = False):
+        if pacing not in PACING_MODES:
+            raise ValueError(f"Unknown pacing: {pacing}, expected one of {PACING_MODES}.")
+        self.fps = fps if fps > 0 else 30.0
+        self.pacing = pacing
+        self.loop = loop
+        self.position = 0
+        self._grabbed: Optional[int] = None
+        self._next_time: Optional[float] = None
+
+    @abstractmethod
+    def _count(self) -> int:
+        """The number of recorded frames."""
+
+    @abstractmethod
+    def _frame(self, index: int) -> Optional[np.ndarray]:
+        """The frame at `index`, None if it cannot be read."""
+
+    def isOpened(self) -> bool:
+        return self._count() > 0
+
+    def _wait(self) -> None:
+        now = time.monotonic()
+        if self._next_time is None:
+            self._next_time = now
+        elif self._next_time > now:
+            time.sleep(self._next_time - now)
+        self._next_time = max(self._next_time + 1 / self.fps, time.monotonic() - 1 / self.fps)
+
+    def grab(self) -> bool:
+        if self.position >= self._count():
+            if not self.loop or self._count() == 0:
+                return False
+            self.position = 0
+        if self.pacing == "realtime":
+            self._wait()
+        self._grabbed = self.position
+        self.position += 1
+        return True
+
+    def retrieve(self) -> tuple[bool, Optional[np.ndarray]]:
+        if self._grabbed is None:
+            return False, None
+        frame = self._frame(self._grabbed)
+        return frame is not None, frame
+
+    def read(self) -> tuple[bool, Optional[np.ndarray]]:
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self._count())
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        if prop_id in (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT) and self._count():
+            frame = self._frame(0)
+            if frame is not None:
+                return float(frame.shape[1] if prop_id == cv2.CAP_PROP_FRAME_WIDTH else frame.shape[0])
+        return 0.0
+
+    def release(self) -> None:
+        self.position = self._count()
+
+
+class NpzSource(ReplaySource):
+    """Frames of a `.npz` archive: every array with 3 dimensions is a frame, a 4-dimensional one a frame stack."""
+
+    def __init__(self, path: str, fps: float = 30.0, pacing: str = "realtime", loop: bool = False):
+        super().__init__(fps, pacing, loop)
+        self.frames: list[np.ndarray] = []
+        with np.load(path) as archive:
+            for name in sorted(archive.files):
+                array = archive[name]
+                if array.ndim == 4:
+                    self.frames.extend(array)
+                elif array.ndim == 3:
+                    self.frames.append(array)
+
+    def _count(self) -> int:
+        return len(self.frames)
+
+    def _frame(self, index: int) -> Optional[np.ndarray]:
+        return self.frames[index]
+
+
+class ImageDirectorySource(ReplaySource):
+    """The images of a directory in file name order, decoded when retrieved."""
+
+    def __init__(self, path: str, fps: float = 30.0, pacing: str = "realtime", loop: bool = False):
+        super().__init__(fps, pacing, loop)
+        self.paths = sorted(
+            os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+
+    def _count(self) -> int:
+        return len(self.paths)
+
+    def _frame(self, index: int) -> Optional[np.ndarray]:
+        return cv2.imread(self.paths[index])
+
+
+class VideoFileSource(ReplaySource):
+    """A video file decoded by OpenCV, paced at the frame rate of the file unless `fps` is given."""
+
+    def __init__(self, path: str, fps: float = 0.0, pacing: str = "realtime", loop: bool = False):
+        self.cap = cv2.VideoCapture(path)
+        super().__init__(fps or self.cap.get(cv2.CAP_PROP_FPS), pacing, loop)
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def grab(self) -> bool:
+        if self.pacing == "realtime":
+            self._wait()
+        if self.cap.grab():
+            self.position += 1
+            return True
+        if not self.loop or self.position == 0:
+            return False
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self.position = 0
+        return self.grab()
+
+    def retrieve(self) -> tuple[bool, Optional[np.ndarray]]:
+        return self.cap.retrieve()
+
+    def get(self, prop_id: int) -> float:
+        return self.fps if prop_id == cv2.CAP_PROP_FPS else self.cap.get(prop_id)
+
+    def release(self) -> None:
+        self.cap.release()
+
+
+def open_capture(
+    source: Union[str, int],
+    backend: str = "any",
+    buffer_size: int = 0,
+    width: int = 0,
+    height: int = 0,
+    fps: float = 0.0,
+    ffmpeg_options: Optional[str] = None,
+) -> cv2.VideoCapture:
+    """
+    Open a camera or a stream on an OpenCV backend and request its buffering, resolution and frame rate.
+
+    Parameters:
+        source (Union[str, int]): A web camera ID or an RTSP/HTTP URL.
+        backend (str): One of `CAPTURE_BACKENDS`, `any` lets OpenCV choose.
+        buffer_size (int): Frames buffered by the backend, `CAP_PROP_BUFFERSIZE`; 0 keeps the default.
+        width (int): Requested frame width, 0 keeps the default.
+        height (int): Requested frame height, 0 keeps the default.
+        fps (float): Requested frame rate, 0 keeps the default.
+        ffmpeg_options (Optional[str]): FFmpeg options as `key;value|key;value`,
+            e.g. `rtsp_transport;tcp|fflags;nobuffer|flags;low_delay`.
+
+    Returns:
+        cap (cv2.VideoCapture): The capture, check `isOpened()`. Backends ignore what they do not support,
+            `describe_capture` tells what was negotiated.
+    """
+    if backend not in CAPTURE_BACKENDS:
+        raise ValueError(f"Unknown capture backend: {backend}, expected one of {tuple(CAPTURE_BACKENDS)}.")
+    if ffmpeg_options:
+        # Read by the FFmpeg backend when a capture is opened.
+        os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = ffmpeg_options
+    cap = cv2.VideoCapture(source, CAPTURE_BACKENDS[backend])
+    if not cap.isOpened():
+        return cap
+    for name, prop_id, value in (
+        ("buffer size", cv2.CAP_PROP_BUFFERSIZE, buffer_size),
+        ("width", cv2.CAP_PROP_FRAME_WIDTH, width),
+        ("height", cv2.CAP_PROP_FRAME_HEIGHT, height),
+        ("fps", cv2.CAP_PROP_FPS, fps),
+    ):
+        if value > 0 and not cap.set(prop_id, value):
+            config.logger.warning(f"Capture backend {cap.getBackendName()} ignored the requested {name} {value}.")
+    return cap
+
+
+def describe_capture(cap: Union[cv2.VideoCapture, ReplaySource]) -> dict:
+    """The backend, resolution, frame rate and buffer size a source actually runs with."""
+    if isinstance(cap, ReplaySource):
+        backend = type(cap).__name__
+    else:
+        try:
+            backend = cap.getBackendName()
+        except cv2.error:
+            backend = "unknown"
+    return {
+        "backend": backend,
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": round(cap.get(cv2.CAP_PROP_FPS), 2),
+        "buffer_size": int(cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+    }
+
+
+def open_video_source(
+    source: Union[str, int], fps: float = 0.0, pacing: str = "realtime", loop: bool = False, **capture_options
+) -> Union[cv2.VideoCapture, ReplaySource]:
+    """
+    Open a camera, a stream or a recording.
+
+    Parameters:
+        source (Union[str, int]): A web camera ID, an RTSP/HTTP URL, a video file, an image directory or an `.npz`.
+        fps (float): The replay frame rate, 0 for the rate of the video file or 30 for images;
+            the requested frame rate of a camera or stream, 0 for its default.
+        pacing (str): `realtime` or `fast`, for recordings.
+        loop (bool): Replay recordings endlessly.
+        capture_options: The backend, buffer size, resolution and FFmpeg options of `open_capture`,
+            for cameras and streams.
+
+    Returns:
+        cap (Union[cv2.VideoCapture, ReplaySource]): The opened source, check `isOpened()`.
+    """
+    if isinstance(source, str) and "://" not in source:
+        if os.path.isdir(source):
+            return ImageDirectorySource(source, fps or 30.0, pacing, loop)
+        if source.lower().endswith(".npz"):
+            return NpzSource(source, fps or 30.0, pacing, loop)
+        if os.path.isfile(source):
+            return VideoFileSource(source, fps, pacing, loop)
+    return open_capture(source, fps=fps, **capture_options)
@@ -4,29 +4,36 @@ Video streaming for app_server.
 
 import asyncio
 import base64
-import queue
 import threading
 import time
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import cv2
 import numpy as np
 
 import package.config as config
 import package.video_capturer as video_capturer
+from package.frame_preprocessor import FramePreprocessor
+from package.loop_meter import FRAME_WAIT_TIMEOUT, LoopMeter
 
 
 class VideoStream:
-    def __init__(self, config_source: Optional[Any] = None, frame_queue: Optional[Any] = None):
+    def __init__(
+        self,
+        config_source: Optional[Any] = None,
+        frame_queue: Optional[Any] = None,
+        frame_demand: Optional[Callable[[], bool]] = None,
+    ):
         self.frame_queue = frame_queue
+        self.frame_demand = frame_demand
         self.video_config = config_source.video_config
 
-        self.fps = 0
-        self.fps_count = 0
+        self.loop_meter = LoopMeter()
+        self.stream_skipped = 0
+        self.frame_preprocessor = FramePreprocessor(self.video_config.image_width, self.video_config.image_height)
 
-        self.video_queue = queue.Queue()
-        video_source = self.video_config.rtsp if self.video_config.rtsp else self.video_config.web_camera
-        self.video_capture = video_capturer.VideoCapturer(video_source, self.video_queue)
+        video_source = video_capturer.capture_source(self.video_config)
+        self.video_queue, self.video_capture = video_capturer.create_capture(video_source, self.video_config)
         self.video_capturer_thread = threading.Thread(target=self.video_capture.get_video)
         self.video_capturer_thread.start()
 
@@ -36,6 +43,7 @@ class VideoStream:
 
     def stop(self):
         self.running = False
+        self.video_queue.close()
         if hasattr(self, "video_capturer_thread") and self.video_capturer_thread.is_alive():
             self.video_capture.stop()
             self.video_capturer_thread.join(timeout=2)
@@ -55,37 +63,40 @@ class VideoStream:
         except Exception as e:
             config.logger.error(f"Error putting frame to queue: {e}")
 
-    def _fps_counter(self):
-        if time.time() - self.start_time >= 1:
-            self.fps = self.fps_count
-            self.fps_count = 0
-            self.start_time = time.time()
+    def _stream_wanted(self) -> bool:
+        """True if a streamed frame would be watched: a client wants frames and the stream queue has room."""
+        if self.frame_queue is None or self.frame_queue.full():
+            return False
+        return self.frame_demand is None or self.frame_demand()
 
     def run(self):
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
 
-        self.start_time = time.time()
         while self.running:
             if self.video_capture.stop_event.is_set():
                 break
 
-            if not self.video_queue.empty():
-                self.fps_count += 1
-                self._fps_counter()
-
-                frame = cv2.resize(
-                    self.video_queue.get(),
-                    (self.video_config.image_width, self.video_config.image_height),
-                    interpolation=cv2.INTER_AREA,
-                )
-
-                if frame is not None:
-                    try:
-                        if self.fps_count % 3 == 0:
-                            loop.run_until_complete(self._put_frame_async(frame))
-                    except Exception as e:
-                        config.logger.error(f"Error processing frame: {e}")
+            # Block until the capture publishes a frame, the timeout only lets the loop see `running`.
+            wait_started = time.monotonic()
+            captured = self.video_queue.get(timeout=FRAME_WAIT_TIMEOUT)
+            self.loop_meter.waited(time.monotonic() - wait_started)
+            if captured is None:
+                continue
+
+            # Only every third frame is streamed, and only while a client watches it
+            self.loop_meter.frame()
+            if self.loop_meter.frames % 3 != 0:
+                continue
+            if not self._stream_wanted():
+                self.stream_skipped += 1
+                continue
+
+            frame = self.frame_preprocessor.process(captured)
+            try:
+                loop.run_until_complete(self._put_frame_async(frame))
+            except Exception as e:
+                config.logger.error(f"Error processing frame: {e}")
 
         if loop:
             print("Stopping event loop...")
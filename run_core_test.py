@@ -1,9 +1,32 @@
 import logging
 import unittest
 
+from tests_core.test_best_shot import TestBestShot
 from tests_core.test_calculation import TestCalculation
 from tests_core.test_coordinate_detection import TesttestCoordinateDetection
+from tests_core.test_descriptor_batcher import TestDescriptorBatcher
+from tests_core.test_face_aligner import TestFaceAligner
+from tests_core.test_face_flow_tracker import TestFaceFlowTracker
+from tests_core.test_face_gallery import TestFaceGallery
+from tests_core.test_face_quality import TestFaceQuality
+from tests_core.test_face_tracker import TestFaceTracker
+from tests_core.test_frame_channel import TestFrameChannel
+from tests_core.test_frame_preprocessor import TestFramePreprocessor
+from tests_core.test_frame_scheduler import TestFrameScheduler
+from tests_core.test_gallery_file import TestGalleryFile
+from tests_core.test_gallery_index import TestGalleryIndex
+from tests_core.test_gallery_store import TestGalleryStore
+from tests_core.test_gallery_watcher import TestGalleryWatcher
+from tests_core.test_latency import TestLatency
+from tests_core.test_loop_meter import TestLoopMeter
+from tests_core.test_model_registry import TestModelRegistry
+from tests_core.test_overlay import TestOverlay
+from tests_core.test_pipeline import TestPipeline
 from tests_core.test_predictor import TestPredictor
+from tests_core.test_recognition_executor import TestRecognitionExecutor
+from tests_core.test_shared_frame_channel import TestSharedFrameChannel
+from tests_core.test_video_capturer import TestVideoCapturer
+from tests_core.test_video_source import TestVideoSource
 
 if __name__ == "__main__":
     logging.disable(logging.CRITICAL)  # Disable logging during tests
@@ -12,9 +35,32 @@ if __name__ == "__main__":
     suite_test = unittest.TestSuite()
     suite_test.addTests(
         [
+            loader.loadTestsFromTestCase(TestBestShot),
             loader.loadTestsFromTestCase(TestCalculation),
             loader.loadTestsFromTestCase(TestPredictor),
             loader.loadTestsFromTestCase(TesttestCoordinateDetection),
+            loader.loadTestsFromTestCase(TestFaceGallery),
+            loader.loadTestsFromTestCase(TestGalleryIndex),
+            loader.loadTestsFromTestCase(TestGalleryFile),
+            loader.loadTestsFromTestCase(TestGalleryStore),
+            loader.loadTestsFromTestCase(TestGalleryWatcher),
+            loader.loadTestsFromTestCase(TestLatency),
+            loader.loadTestsFromTestCase(TestLoopMeter),
+            loader.loadTestsFromTestCase(TestOverlay),
+            loader.loadTestsFromTestCase(TestPipeline),
+            loader.loadTestsFromTestCase(TestRecognitionExecutor),
+            loader.loadTestsFromTestCase(TestSharedFrameChannel),
+            loader.loadTestsFromTestCase(TestVideoCapturer),
+            loader.loadTestsFromTestCase(TestVideoSource),
+            loader.loadTestsFromTestCase(TestDescriptorBatcher),
+            loader.loadTestsFromTestCase(TestModelRegistry),
+            loader.loadTestsFromTestCase(TestFaceAligner),
+            loader.loadTestsFromTestCase(TestFaceFlowTracker),
+            loader.loadTestsFromTestCase(TestFaceQuality),
+            loader.loadTestsFromTestCase(TestFaceTracker),
+            loader.loadTestsFromTestCase(TestFrameChannel),
+            loader.loadTestsFromTestCase(TestFramePreprocessor),
+            loader.loadTestsFromTestCase(TestFrameScheduler),
         ]
     )
     test_result = runner.run(suite_test)
@@ -0,0 +1,91 @@
+"""
+Descriptor batch benchmark.
+This script reports dlib descriptor throughput against the batch size, for direct batched calls
+and through the `DescriptorBatcher` fed by concurrent submitters.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import cv2
+import dlib
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.descriptor_batcher import DescriptorBatcher  # noqa: E402
+from package.predictor import Predictor  # noqa: E402
+
+
+def batched_throughput(predictor: Predictor, face_roi: np.ndarray, batch_size: int, faces: int) -> float:
+    """Faces per second of direct batched `compute_face_descriptor` calls over aligned chips."""
+    face_chip, _ = predictor.aligner.align(face_roi)
+    chips = [face_chip] * batch_size
+    rounds = max(1, faces // batch_size)
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        predictor.dlib_recognition_model.compute_face_descriptor(chips)
+    return rounds * batch_size / (time.perf_counter() - start_time)
+
+
+def batcher_throughput(
+    predictor: Predictor, face_roi: np.ndarray, batch_size: int, faces: int, submitters: int, wait_ms: float
+) -> tuple[float, float]:
+    """Faces per second and mean batch size through the batcher with concurrent submitters."""
+    batcher = DescriptorBatcher(predictor, batch_size, wait_ms)
+    per_submitter = max(1, faces // submitters)
+
+    def submit_faces():
+        for _ in range(per_submitter):
+            batcher.extract(face_roi)
+
+    threads = [threading.Thread(target=submit_faces) for _ in range(submitters)]
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed_time = time.perf_counter() - start_time
+    batcher.close()
+    return per_submitter * submitters / elapsed_time, batcher.mean_batch_size
+
+
+def main():
+    """Main function to run the benchmark."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="dlib descriptor throughput versus batch size benchmark.")
+    parser.add_argument("--dlib-predictor", default="models/dlib/shape_predictor_68_face_landmarks.dat")
+    parser.add_argument("--dlib-recognition-model", default="models/dlib/dlib_face_recognition_resnet_model_v1.dat")
+    parser.add_argument("--image", default="tests_core/test_data/test_image.npz", help="npz with a `test_img` face.")
+    parser.add_argument("--roi-size", type=int, default=160, help="Face ROI side in pixels.")
+    parser.add_argument("--faces", type=int, default=64, help="Faces per measurement.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--submitters", type=int, default=8, help="Concurrent submitters for the batcher.")
+    parser.add_argument("--wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    predictor = Predictor(
+        dlib.shape_predictor(args.dlib_predictor),
+        dlib.face_recognition_model_v1(args.dlib_recognition_model),
+        {},
+        0,
+    )
+    face_roi = cv2.resize(np.load(args.image)["test_img"], (args.roi_size, args.roi_size))
+
+    print(f"cpus={os.cpu_count()} roi={args.roi_size}px faces={args.faces} submitters={args.submitters}")
+    print(f"{'batch':>6} {'direct f/s':>11} {'speedup':>8} {'batcher f/s':>12} {'mean batch':>11}")
+    baseline = None
+    for batch_size in args.batch_sizes:
+        direct = batched_throughput(predictor, face_roi, batch_size, args.faces)
+        baseline = baseline or direct
+        through_batcher, mean_batch = batcher_throughput(
+            predictor, face_roi, batch_size, args.faces, args.submitters, args.wait_ms
+        )
+        print(f"{batch_size:>6} {direct:>11.2f} {direct / baseline:>8.2f} {through_batcher:>12.2f} {mean_batch:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
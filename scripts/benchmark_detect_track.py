@@ -0,0 +1,132 @@
+"""
+Detect-then-track benchmark.
+This script replays a recording through the `FramePreprocessor` and compares MediaPipe on every frame
+with MediaPipe every N frames and `FlowTracker` in between, for frames per second and for how far
+the tracked boxes drift from the boxes MediaPipe finds on the same frames.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.face_flow_tracker import FlowTracker  # noqa: E402
+from package.face_tracker import FaceTracker  # noqa: E402
+from package.frame_preprocessor import FramePreprocessor  # noqa: E402
+from package.video_source import open_video_source  # noqa: E402
+
+TEST_IMAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests_core/test_data")
+
+
+def synthetic_recording(path: str, frames: int, size: tuple) -> None:
+    """A face panning and zooming slowly across the frame, saved as an `.npz` to replay."""
+    image = cv2.imread(os.path.join(TEST_IMAGE, "Steven_Paul_Jobs.jpg"))
+    width, height = size
+    recording = np.empty((frames, height, width, 3), dtype=np.uint8)
+    for index in range(frames):
+        phase = 2 * np.pi * index / frames
+        scale = 0.6 + 0.05 * np.sin(phase)
+        matrix = np.array(
+            [[scale, 0, 60 * np.sin(phase) + width * 0.1], [0, scale, 30 * np.cos(phase) + height * 0.02]]
+        )
+        cv2.warpAffine(image, matrix, size, recording[index], borderMode=cv2.BORDER_REPLICATE)
+    np.savez(path, frames=recording)
+
+
+def face_boxes(detections: list, size: tuple) -> list:
+    width, height = size
+    boxes = []
+    for detection in detections:
+        box = detection.location_data.relative_bounding_box
+        x1, y1 = int(box.xmin * width), int(box.ymin * height)
+        boxes.append([[x1, y1], [int(x1 + box.width * width), int(y1 + box.height * height)]])
+    return boxes
+
+
+def replay(source: str, size: tuple, detection_interval: int, min_confidence: float) -> tuple[float, float, list, dict]:
+    """Frames per second and CPU milliseconds per frame of the detection step, and the first face box of every frame."""
+    cap = open_video_source(source, pacing="fast")
+    preprocessor = FramePreprocessor(*size)
+    flow_tracker = FlowTracker(detection_interval, min_confidence)
+    boxes, elapsed_time, cpu_time, frames = [], 0.0, 0.0, 0
+    with mp.solutions.face_detection.FaceDetection(model_selection=0, min_detection_confidence=0.5) as detector:
+        while True:
+            ret, captured = cap.read()
+            if not ret:
+                break
+            preprocessor.process(captured)
+            start_time, cpu_start = time.perf_counter(), time.process_time()
+            detections = None
+            if not flow_tracker.needs_detection():
+                detections = flow_tracker.track(preprocessor.gray())
+            if detections is None:
+                detections = detector.process(preprocessor.rgb()).detections or []
+                flow_tracker.start(preprocessor.gray(), detections)
+            elapsed_time += time.perf_counter() - start_time
+            cpu_time += time.process_time() - cpu_start
+            frames += 1
+            found = face_boxes(detections, size)
+            boxes.append(found[0] if found else None)
+    cap.release()
+    return frames / elapsed_time, 1000 * cpu_time / frames, boxes, flow_tracker.stats()
+
+
+def best_replay(source: str, size: tuple, detection_interval: int, min_confidence: float, repeat: int) -> tuple:
+    """The fastest of `repeat` replays, the others were slowed down by the rest of the host."""
+    return max(
+        (replay(source, size, detection_interval, min_confidence) for _ in range(repeat)), key=lambda run: run[0]
+    )
+
+
+def main():
+    """Main function to run the benchmark."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MediaPipe on every frame against detect-then-track.")
+    parser.add_argument("--source", help="Video file, image directory or .npz to replay, a synthetic face if unset.")
+    parser.add_argument("--frames", type=int, default=240, help="Frames of the synthetic recording.")
+    parser.add_argument("--image-width", type=int, default=640)
+    parser.add_argument("--image-height", type=int, default=480)
+    parser.add_argument("--intervals", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--min-confidence", type=float, default=0.6)
+    parser.add_argument("--repeat", type=int, default=3, help="Replays per interval, the fastest is reported.")
+    args = parser.parse_args()
+    size = (args.image_width, args.image_height)
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = args.source
+        if source is None:
+            source = os.path.join(directory, "synthetic.npz")
+            synthetic_recording(source, args.frames, size)
+
+        print(f"cpus={os.cpu_count()} source={args.source or 'synthetic'} image={size[0]}x{size[1]}")
+        print(
+            f"{'interval':>8} {'fps':>8} {'speedup':>8} {'cpu ms':>7} {'mean IoU':>9} {'min IoU':>8} "
+            f"{'detections':>11} {'lost':>5}"
+        )
+        baseline = best_replay(source, size, 1, args.min_confidence, args.repeat)
+        baseline_fps, reference = baseline[0], baseline[2]
+        for interval in args.intervals:
+            fps, cpu_ms, boxes, stats = (
+                baseline if interval == 1 else best_replay(source, size, interval, args.min_confidence, args.repeat)
+            )
+            overlaps = [
+                FaceTracker.iou(box, expected)
+                for box, expected in zip(boxes, reference)
+                if box is not None and expected is not None
+            ]
+            print(
+                f"{interval:>8} {fps:>8.1f} {fps / baseline_fps:>7.2f}x {cpu_ms:>7.2f} "
+                f"{np.mean(overlaps or [0]):>9.3f} {np.min(overlaps or [0]):>8.3f} {stats['detections']:>11} "
+                f"{stats['lost']:>5}"
+            )
+
+
+if __name__ == "__main__":
+    main()
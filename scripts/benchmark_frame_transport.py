@@ -0,0 +1,150 @@
+"""
+Frame transport benchmark.
+This script compares the previous unbounded `multiprocessing.Queue`, the in-process `FrameChannel`
+and the `SharedFrameChannel` fed by a capture process, for CPU time and frame latency
+while a consumer slower than the camera takes the frames.
+"""
+
+import multiprocessing
+import os
+import resource
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.frame_channel import FrameChannel  # noqa: E402
+from package.shared_frame_channel import SharedFrameChannel  # noqa: E402
+
+
+def produce(channel, frame_shape: tuple, fps: float, seconds: float, timestamped: bool) -> None:
+    """Put synthetic frames at the camera rate, like `VideoCapturer.get_video`."""
+    frame = np.random.default_rng(0).integers(0, 256, frame_shape, dtype=np.uint8)
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        frame_time = time.monotonic()
+        channel.put((time.monotonic(), frame) if timestamped else frame)
+        time.sleep(max(0.0, 1 / fps - (time.monotonic() - frame_time)))
+    if timestamped:
+        channel.put(None)
+    else:
+        channel.close()
+
+
+def consume(take, work_ms: float, image_size: tuple) -> tuple[int, list[float]]:
+    """Take frames until the producer is done, resizing each one and simulating the detection work."""
+    delivered, ages = 0, []
+    while True:
+        item = take()
+        if item is None:
+            return delivered, ages
+        frame, age = item
+        cv2.resize(frame, image_size, interpolation=cv2.INTER_AREA)
+        delivered += 1
+        ages.append(age)
+        time.sleep(work_ms / 1000)
+
+
+def children_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_queue(args) -> dict:
+    video_queue = multiprocessing.get_context("spawn").Queue()
+    producer = multiprocessing.get_context("spawn").Process(
+        target=produce, args=(video_queue, args.frame_shape, args.fps, args.seconds, True)
+    )
+
+    def take():
+        item = video_queue.get()
+        return None if item is None else (item[1], time.monotonic() - item[0])
+
+    return measure(producer, take, args)
+
+
+def run_frame_channel(args) -> dict:
+    channel = FrameChannel(args.capacity, args.policy)
+    producer = threading.Thread(target=produce, args=(channel, args.frame_shape, args.fps, args.seconds, False))
+
+    def take():
+        frame = channel.get()
+        return None if frame is None else (frame, channel.last_age)
+
+    return measure(producer, take, args, channel)
+
+
+def run_shared_channel(args) -> dict:
+    channel = SharedFrameChannel(args.capacity, args.policy, int(np.prod(args.frame_shape)))
+    producer = multiprocessing.get_context("spawn").Process(
+        target=produce, args=(channel, args.frame_shape, args.fps, args.seconds, False)
+    )
+
+    def take():
+        frame = channel.get()
+        return None if frame is None else (frame, channel.last_age)
+
+    result = measure(producer, take, args, channel)
+    channel.close()
+    return result
+
+
+def measure(producer, take, args, channel=None) -> dict:
+    cpu_start, children_start = time.process_time(), children_cpu()
+    start_time = time.monotonic()
+    producer.start()
+    delivered, ages = consume(take, args.work_ms, (args.image_width, args.image_height))
+    producer.join()
+    elapsed_time = time.monotonic() - start_time
+    cpu = time.process_time() - cpu_start + children_cpu() - children_start
+    ages_ms = np.array(ages or [0.0]) * 1000
+    return {
+        "delivered fps": delivered / elapsed_time,
+        "dropped": channel.dropped if channel is not None else 0,
+        "cpu %": 100 * cpu / elapsed_time,
+        "mean ms": float(ages_ms.mean()),
+        "p95 ms": float(np.percentile(ages_ms, 95)),
+        "max ms": float(ages_ms.max()),
+    }
+
+
+def main():
+    """Main function to run the benchmark."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Frame transport CPU and latency benchmark.")
+    parser.add_argument("--width", type=int, default=1280, help="Captured frame width.")
+    parser.add_argument("--height", type=int, default=720, help="Captured frame height.")
+    parser.add_argument("--image-width", type=int, default=640, help="Detection frame width.")
+    parser.add_argument("--image-height", type=int, default=480, help="Detection frame height.")
+    parser.add_argument("--fps", type=float, default=30.0, help="Camera frame rate.")
+    parser.add_argument("--work-ms", type=float, default=50.0, help="Simulated detection time per frame.")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--capacity", type=int, default=2)
+    parser.add_argument("--policy", default="latest", choices=["latest", "drop_oldest", "block"])
+    args = parser.parse_args()
+    args.frame_shape = (args.height, args.width, 3)
+
+    print(
+        f"cpus={os.cpu_count()} frame={args.width}x{args.height} fps={args.fps} work={args.work_ms}ms "
+        f"policy={args.policy} capacity={args.capacity}"
+    )
+    print(f"{'transport':>22} {'fps':>6} {'dropped':>8} {'cpu %':>6} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for name, run in (
+        ("multiprocessing.Queue", run_queue),
+        ("FrameChannel", run_frame_channel),
+        ("SharedFrameChannel", run_shared_channel),
+    ):
+        result = run(args)
+        print(
+            f"{name:>22} {result['delivered fps']:>6.1f} {result['dropped']:>8} {result['cpu %']:>6.1f} "
+            f"{result['mean ms']:>9.1f} {result['p95 ms']:>9.1f} {result['max ms']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Gallery index benchmark.
+This script reports recall and latency of the IVF index against exact brute-force search.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.face_gallery import FaceGallery  # noqa: E402
+from package.gallery_index import IVFIndex, evaluate_recall  # noqa: E402
+
+
+def synthetic_gallery(size: int, dimension: int, seed: int) -> tuple[FaceGallery, np.ndarray]:
+    """Create clustered descriptors resembling dlib embeddings and noisy queries of enrolled users."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(0, 0.1, (max(1, size // 50), dimension))
+    matrix = centers[rng.integers(0, centers.shape[0], size)] + rng.normal(0, 0.04, (size, dimension))
+    gallery = FaceGallery.from_arrays([f"User_{i}" for i in range(size)], matrix)
+    return gallery, matrix
+
+
+def main():
+    """Main function to run the benchmark."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gallery index recall versus latency benchmark.")
+    parser.add_argument("--size", type=int, default=100000, help="Number of enrolled faces.")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries.")
+    parser.add_argument("--lists", type=int, default=None, help="Number of IVF lists (default sqrt(size)).")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--top-k", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    gallery, matrix = synthetic_gallery(args.size, 128, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    picked = rng.choice(args.size, args.queries, replace=False)
+    queries = matrix[picked] + rng.normal(0, 0.02, (args.queries, 128))
+
+    index = IVFIndex(n_lists=args.lists)
+    index.build(gallery)
+
+    report = evaluate_recall(gallery, index, queries, args.nprobe, top_k=args.top_k)
+    print(f"gallery={args.size} lists={index.centroids.shape[0]} exact={report[0]['exact_mean_latency_ms']:.3f} ms")
+    print(f"{'nprobe':>8} {'recall':>8} {'mean ms':>10} {'p95 ms':>10}")
+    for row in report:
+        print(
+            f"{row['nprobe']:>8} {row['recall']:>8.3f} {row['mean_latency_ms']:>10.3f} {row['p95_latency_ms']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Gallery conversion script.
+This script converts a `model.csv` face feature file into the binary gallery format or a SQLite gallery store.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package.face_gallery import load_csv_gallery  # noqa: E402
+from package.gallery_file import GALLERY_EXTENSION, convert_csv_to_gallery  # noqa: E402
+from package.gallery_store import is_store_file, open_store  # noqa: E402
+
+
+def main():
+    """Main function to handle gallery conversion."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert model.csv into a gallery file or SQLite gallery store.")
+    parser.add_argument("csv_path", help="Path to the CSV model file (name,f1,...,f128).")
+    parser.add_argument(
+        "--output",
+        "-o",
+        help=f"Output path, `.db` for a SQLite store (default: <csv_path>{GALLERY_EXTENSION}).",
+    )
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.csv_path):
+        print(f"Error: CSV file not found: {args.csv_path}")
+        sys.exit(1)
+
+    output = args.output or os.path.splitext(args.csv_path)[0] + GALLERY_EXTENSION
+    if is_store_file(output):
+        count = open_store(output).enroll_many(load_csv_gallery(args.csv_path).to_dict())
+    else:
+        count = convert_csv_to_gallery(args.csv_path, output)
+    print(f"Converted {count} users into {output}")
+    print(f"Set `face_model` to {output} to use it.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Latency API tests."""
+
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+
+class TestLatencyAPI:
+    def test_latency_without_face_detection(self, client: TestClient):
+        response = client.get("/api/latency")
+        assert response.status_code == 200
+        assert response.json() == {"face_detection_running": False, "hops": {}}
+
+    def test_latency_with_face_detection_stopped(self, client: TestClient, monkeypatch):
+        from main import manager
+
+        # The manager outlives a stopped FaceApp.
+        stopped = SimpleNamespace(face_app=None, latency_stats=lambda: {})
+        monkeypatch.setattr(manager, "face_app_manager", stopped)
+        response = client.get("/api/latency")
+        assert response.json() == {"face_detection_running": False, "hops": {}}
+
+    def test_latency_method_not_allowed(self, client: TestClient):
+        response = client.post("/api/latency")
+        assert response.status_code == 405
+
+    def test_stats_without_face_detection(self, client: TestClient):
+        response = client.get("/api/stats")
+        assert response.status_code == 200
+        assert response.json() == {"face_detection_running": False, "detection": {}, "recognition": {}}
+
+    def test_stats_with_face_detection_stopped(self, client: TestClient, monkeypatch):
+        from main import manager
+
+        stopped = SimpleNamespace(face_app=None, detection_stats=lambda: {}, recognition_stats=lambda: {})
+        monkeypatch.setattr(manager, "face_app_manager", stopped)
+        response = client.get("/api/stats")
+        assert response.json()["face_detection_running"] is False
@@ -51,3 +51,19 @@ class TestWebSocket:
             data = websocket.receive_text()
             response = json.loads(data)
             assert response["type"] == "pong"
+
+    def test_websocket_frame_subscription(self, client: TestClient):
+        from main import manager
+
+        with client.websocket_connect("/ws") as websocket:
+            assert manager.wants_frames()
+
+            websocket.send_text(json.dumps({"type": "unsubscribe_frames"}))
+            response = json.loads(websocket.receive_text())
+            assert response == {"type": "frames", "subscribed": False}
+            assert not manager.wants_frames()
+
+            websocket.send_text(json.dumps({"type": "subscribe_frames"}))
+            response = json.loads(websocket.receive_text())
+            assert response == {"type": "frames", "subscribed": True}
+            assert manager.wants_frames()
@@ -0,0 +1,78 @@
+import time
+import unittest
+
+import cv2
+import numpy as np
+
+from package import best_shot, face_quality
+
+
+class TestBestShot(unittest.TestCase):
+    def setUp(self):
+        self.scorer = face_quality.FaceQualityScorer()
+        self.buffer = best_shot.BestShotBuffer(capacity=4)
+        self.image = np.load("./tests_core/test_data/test_image.npz")["test_img"][60:330, 150:420].copy()
+        self.blurred = cv2.GaussianBlur(self.image, (0, 0), 3)
+
+    def push(self, face_roi: np.ndarray) -> None:
+        self.buffer.push(face_roi, self.scorer.score(face_roi))
+
+    # test best
+    def test_best_correctness(self):
+        self.push(self.blurred)
+        self.push(self.image)
+        self.push(self.blurred)
+        face_crop, quality = self.buffer.best()
+        np.testing.assert_array_equal(face_crop, self.image)
+        self.assertEqual(quality.score, self.scorer.score(self.image).score)
+
+    def test_best_output_type(self):
+        self.push(self.image)
+        face_crop, quality = self.buffer.best()
+        self.assertIsInstance(face_crop, np.ndarray)
+        self.assertEqual(face_crop.dtype, np.uint8)
+        self.assertIsInstance(quality, face_quality.FaceQuality)
+
+    def test_best_invalid_input(self):
+        with self.assertRaises(Exception):
+            self.buffer.push("invalid_input", self.scorer.score(self.image))
+
+    def test_best_boundary_zero(self):
+        self.assertEqual(self.buffer.best(), (None, None))
+        # A crop that passes the gate wins over a sharper one that does not.
+        self.push(self.image)
+        dark = (self.image * 0.3).astype(np.uint8)
+        self.buffer.push(dark, face_quality.FaceQuality(1e6, 20.0, 1.0, False, "dark"))
+        np.testing.assert_array_equal(self.buffer.best()[0], self.image)
+        self.buffer.reset()
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(self.buffer.best(), (None, None))
+
+    def test_best_performance(self):
+        large_roi = cv2.resize(self.image, None, fx=2, fy=2)
+        start_time = time.time()
+        for _ in range(8):
+            self.push(large_roi)
+        self.buffer.best()
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.05 秒內完成
+        self.assertLess(elapsed_time, 0.05, "Performance degraded, took too long to process.")
+
+    # test push
+    def test_push_correctness(self):
+        # The ring keeps the last `capacity` crops.
+        self.push(self.image)
+        for _ in range(4):
+            self.push(self.blurred)
+        self.assertEqual(len(self.buffer), 4)
+        np.testing.assert_array_equal(self.buffer.best()[0], self.blurred)
+
+    def test_push_boundary_zero(self):
+        # Large crops are downscaled into the fixed slots, the buffer memory does not grow.
+        slots = self.buffer._slots
+        large_roi = cv2.resize(self.image, None, fx=4, fy=4)
+        self.push(large_roi)
+        face_crop, _ = self.buffer.best()
+        self.assertEqual(max(face_crop.shape[:2]), best_shot.MAX_ROI_SIDE)
+        self.assertTrue(np.shares_memory(face_crop, slots))
+        self.assertIs(self.buffer._slots, slots)
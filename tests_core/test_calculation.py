@@ -266,3 +266,41 @@ class TestCalculation(unittest.TestCase):
         elapsed_time = time.time() - start_time
         # 性能判斷, 假設期望在 0.1 秒內完成
         self.assertLess(elapsed_time, 0.1, "Performance degraded, took too long to process.")
+
+    # test detection_region
+    def test_detection_region_correctness(self):
+        self.assertEqual(self.calculation.detection_region([200, 150], [500, 550], 40), (160, 110, 540, 590))
+        # Clipped to the image, corners in any order.
+        self.assertEqual(self.calculation.detection_region([700, 780], [20, 10], 100), (0, 0, 774, 800))
+
+    def test_detection_region_boundary_zero(self):
+        self.assertEqual(self.calculation.detection_region([0, 0], [0, 0], 0), (0, 0, 0, 0))
+
+    # test map_detections
+    def test_map_detections_correctness(self):
+        # The face found in a crop lands where it is found in the whole image, up to MediaPipe's own jitter.
+        calculation_hw = calculation.Calculation(self.test_img.shape[1], self.test_img.shape[0])
+        expected_box, _ = calculation_hw.get_face_boundingbox(self.bounding_box_mp)
+        region = calculation_hw.detection_region(*expected_box, 80)
+        x1, y1, x2, y2 = region
+        rgb = numpy.ascontiguousarray(cv2.cvtColor(self.test_img, cv2.COLOR_BGR2RGB)[y1:y2, x1:x2])
+        with mp.solutions.face_detection.FaceDetection(model_selection=0, min_detection_confidence=0.5) as detector:
+            detections = detector.process(rgb).detections
+        mapped = calculation_hw.map_detections(detections, region)
+        self.assertEqual(len(mapped), 1)
+        face_bounding_box, _ = calculation_hw.get_face_boundingbox(mapped[0].location_data.relative_bounding_box)
+        numpy.testing.assert_allclose(face_bounding_box, expected_box, atol=16)
+        for point, expected in zip(
+            mapped[0].location_data.relative_keypoints, self.detection_mp.location_data.relative_keypoints
+        ):
+            self.assertAlmostEqual(point.x, expected.x, delta=0.03)
+            self.assertAlmostEqual(point.y, expected.y, delta=0.03)
+
+    def test_map_detections_boundary_zero(self):
+        # The whole image as the region changes nothing.
+        mapped = self.calculation.map_detections([self.detection_mp], (0, 0, 774, 800))
+        self.assertEqual(
+            self.calculation.get_face_boundingbox(mapped[0].location_data.relative_bounding_box),
+            self.calculation.get_face_boundingbox(self.bounding_box_mp),
+        )
+        self.assertEqual(self.calculation.map_detections([], (0, 0, 10, 10)), [])
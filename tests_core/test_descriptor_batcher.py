@@ -0,0 +1,59 @@
+import threading
+import time
+import unittest
+
+import dlib
+import numpy as np
+
+from package import descriptor_batcher, predictor
+
+
+class TestDescriptorBatcher(unittest.TestCase):
+    def setUp(self):
+        dlib_predictor = dlib.shape_predictor("models/dlib/shape_predictor_68_face_landmarks.dat")
+        dlib_recognition_model = dlib.face_recognition_model_v1("models/dlib/dlib_face_recognition_resnet_model_v1.dat")
+        self.predictor = predictor.Predictor(dlib_predictor, dlib_recognition_model, {}, 0.4)
+        self.image = np.load("./tests_core/test_data/test_image.npz")["test_img"][200:500, 250:550].copy()
+        self.batcher = descriptor_batcher.DescriptorBatcher(self.predictor, max_batch=4, max_wait_ms=50)
+
+    def tearDown(self):
+        self.batcher.close()
+
+    # test extract
+    def test_extract_correctness(self):
+        expected, _ = self.predictor.feature_extraction(self.image)
+        futures = [self.batcher.submit(self.image) for _ in range(4)]
+        for future in futures:
+            face_descriptor, face_chip = future.result(timeout=30)
+            np.testing.assert_allclose(face_descriptor, expected, atol=1e-6)
+            self.assertEqual(face_chip.shape, (150, 150, 3))
+        self.assertEqual(self.batcher.batches, 1)
+        self.assertEqual(self.batcher.mean_batch_size, 4)
+
+    def test_extract_output_type(self):
+        face_descriptor, _ = self.batcher.extract(self.image, timeout=30)
+        self.assertIsInstance(face_descriptor, np.ndarray)
+        self.assertEqual(face_descriptor.shape, (128,))
+
+    def test_extract_invalid_input(self):
+        self.assertEqual(self.batcher.extract(np.zeros((50, 50, 3), dtype=np.uint8), timeout=30), (None, None))
+        with self.assertRaises(Exception):
+            self.batcher.extract("invalid_input", timeout=30)
+        self.assertIsNotNone(self.batcher.extract(self.image, timeout=30)[0])
+
+    def test_extract_boundary_zero(self):
+        self.assertEqual(self.batcher.mean_batch_size, 0.0)
+        batcher = descriptor_batcher.DescriptorBatcher(self.predictor, max_batch=0, max_wait_ms=0)
+        self.assertIsNotNone(batcher.extract(self.image, timeout=30)[0])
+        batcher.close()
+
+    def test_extract_performance(self):
+        threads = [threading.Thread(target=self.batcher.extract, args=(self.image,)) for _ in range(4)]
+        start_time = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 3 秒內完成
+        self.assertLess(elapsed_time, 3, "Performance degraded, took too long to process.")
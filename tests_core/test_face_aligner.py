@@ -0,0 +1,55 @@
+import time
+import unittest
+
+import cv2
+import dlib
+import numpy as np
+
+from package import face_aligner
+
+
+class TestFaceAligner(unittest.TestCase):
+    def setUp(self):
+        self.dlib_predictor = dlib.shape_predictor("models/dlib/shape_predictor_68_face_landmarks.dat")
+        self.dlib_recognition_model = dlib.face_recognition_model_v1(
+            "models/dlib/dlib_face_recognition_resnet_model_v1.dat"
+        )
+        self.aligner = face_aligner.FaceAligner(self.dlib_predictor)
+        self.image = np.load("./tests_core/test_data/test_image.npz")["test_img"][60:330, 150:420].copy()
+
+    # test align
+    def test_align_correctness(self):
+        face_chip, feature_coordinates = self.aligner.align(self.image)
+        # Without downscaling the chip is what dlib extracts internally from the ROI.
+        expected = np.array(self.dlib_recognition_model.compute_face_descriptor(self.image, feature_coordinates))
+        actual = np.array(self.dlib_recognition_model.compute_face_descriptor(face_chip))
+        np.testing.assert_allclose(actual, expected, atol=1e-6)
+
+    def test_align_output_type(self):
+        face_chip, feature_coordinates = self.aligner.align(self.image)
+        self.assertEqual(face_chip.shape, (face_aligner.CHIP_SIZE, face_aligner.CHIP_SIZE, 3))
+        self.assertEqual(face_chip.dtype, np.uint8)
+        self.assertIsInstance(feature_coordinates, dlib.full_object_detection)
+
+    def test_align_invalid_input(self):
+        self.assertEqual(self.aligner.align(np.zeros((100, 100, 3), dtype=np.uint8)), (None, None))
+        with self.assertRaises(Exception):
+            self.aligner.align("invalid_input")
+
+    def test_align_boundary_zero(self):
+        # Landmarks of a downscaled ROI are mapped back to the ROI coordinates.
+        large_roi = cv2.resize(self.image, None, fx=4, fy=4)
+        _, feature_coordinates = self.aligner.align(large_roi)
+        _, small_coordinates = self.aligner.align(cv2.resize(large_roi, (300, 300), interpolation=cv2.INTER_AREA))
+        scale = large_roi.shape[0] / 300
+        for i in (8, 30, 36, 45):
+            self.assertAlmostEqual(feature_coordinates.part(i).x, small_coordinates.part(i).x * scale, delta=scale)
+            self.assertAlmostEqual(feature_coordinates.part(i).y, small_coordinates.part(i).y * scale, delta=scale)
+
+    def test_align_performance(self):
+        large_roi = cv2.resize(self.image, None, fx=4, fy=4)
+        start_time = time.time()
+        self.aligner.align(large_roi)
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.05 秒內完成
+        self.assertLess(elapsed_time, 0.05, "Performance degraded, took too long to process.")
@@ -0,0 +1,84 @@
+import time
+import unittest
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from package import calculation, face_flow_tracker
+
+
+def shifted(gray: np.ndarray, dx: float, dy: float) -> np.ndarray:
+    matrix = np.array([[1, 0, dx], [0, 1, dy]], dtype=np.float32)
+    return cv2.warpAffine(gray, matrix, gray.shape[::-1], borderMode=cv2.BORDER_REPLICATE)
+
+
+class TestFaceFlowTracker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        image = np.load("./tests_core/test_data/test_image.npz")["test_img"]
+        cls.gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        with mp.solutions.face_detection.FaceDetection(model_selection=0, min_detection_confidence=0.5) as detector:
+            cls.detections = list(detector.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB)).detections)
+
+    def setUp(self):
+        self.tracker = face_flow_tracker.FlowTracker(detection_interval=5)
+        self.tracker.start(self.gray, self.detections)
+        self.height, self.width = self.gray.shape
+
+    def box(self, detection) -> np.ndarray:
+        box = detection.location_data.relative_bounding_box
+        return np.array([box.xmin * self.width, box.ymin * self.height, box.width * self.width])
+
+    # test track
+    def test_track_correctness(self):
+        tracked = self.tracker.track(shifted(self.gray, 8, 5))
+        self.assertEqual(len(tracked), 1)
+        moved = self.box(tracked[0]) - self.box(self.detections[0])
+        np.testing.assert_allclose(moved, [8, 5, 0], atol=1.5)
+        eye = tracked[0].location_data.relative_keypoints[0]
+        expected = self.detections[0].location_data.relative_keypoints[0]
+        self.assertAlmostEqual((eye.x - expected.x) * self.width, 8, delta=1.5)
+        # Detection is due again after the interval.
+        for step in range(2, 5):
+            self.tracker.track(shifted(self.gray, 8 + step, 5))
+        self.assertTrue(self.tracker.needs_detection())
+
+    def test_track_output_type(self):
+        tracked = self.tracker.track(shifted(self.gray, 2, 2))
+        self.assertIsInstance(tracked, list)
+        self.assertIsInstance(tracked[0], face_flow_tracker.TrackedDetection)
+        self.assertIsInstance(tracked[0].score[0], float)
+        # The eye boxes of the blink detection take a tracked face like a MediaPipe one.
+        bounding_box_height = tracked[0].location_data.relative_bounding_box.height
+        eye_left, eye_right = calculation.Calculation(self.width, self.height).get_eyes_boundingbox(
+            tracked[0], bounding_box_height
+        )
+        self.assertIsInstance(eye_left, list)
+        self.assertIsInstance(self.tracker.stats(), dict)
+
+    def test_track_invalid_input(self):
+        # Nothing to track before a detection, and an interval of 1 never tracks.
+        self.assertIsNone(face_flow_tracker.FlowTracker(detection_interval=5).track(self.gray))
+        disabled = face_flow_tracker.FlowTracker(detection_interval=1)
+        disabled.start(self.gray, self.detections)
+        self.assertTrue(disabled.needs_detection())
+        self.assertIsNone(disabled.track(self.gray))
+
+    def test_track_boundary_zero(self):
+        # A scene cut loses the face, an empty detection leaves nothing to track.
+        noise = np.random.default_rng(0).integers(0, 256, self.gray.shape, dtype=np.uint8)
+        self.assertIsNone(self.tracker.track(noise))
+        self.assertEqual(self.tracker.lost, 1)
+        self.tracker.start(self.gray, [])
+        self.assertTrue(self.tracker.needs_detection())
+
+    def test_track_performance(self):
+        frames = [shifted(self.gray, step % 4, step % 3) for step in range(20)]
+        start_time = time.time()
+        for frame in frames:
+            self.tracker.start(self.gray, self.detections)
+            self.tracker.track(frame)
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.2 秒內完成
+        self.assertLess(elapsed_time, 0.2, "Performance degraded, took too long to process.")
@@ -0,0 +1,80 @@
+import time
+import unittest
+
+import numpy as np
+
+from package import face_gallery
+
+
+class TestFaceGallery(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.descriptors = {f"user_{i}": rng.normal(0, 0.1, 128) for i in range(2000)}
+        self.gallery = face_gallery.FaceGallery.from_dict(self.descriptors)
+        self.query = self.descriptors["user_42"] + 0.001
+
+    # test search
+    def test_search_correctness(self):
+        matches = self.gallery.search(self.query, top_k=3)
+        self.assertEqual(matches[0][0], "user_42")
+        expected = sorted(
+            (float(np.linalg.norm(self.query - features)), name) for name, features in self.descriptors.items()
+        )[:3]
+        for (name, distance), (expected_distance, expected_name) in zip(matches, expected):
+            self.assertEqual(name, expected_name)
+            self.assertAlmostEqual(distance, expected_distance, places=5)
+
+    def test_search_output_type(self):
+        matches = self.gallery.search(self.query, top_k=2)
+        self.assertIsInstance(matches, list)
+        self.assertIsInstance(matches[0][0], str)
+        self.assertIsInstance(matches[0][1], float)
+        self.assertEqual(self.gallery.matrix.dtype, np.float32)
+        self.assertTrue(self.gallery.matrix.flags["C_CONTIGUOUS"])
+
+    def test_search_invalid_input(self):
+        with self.assertRaises(Exception):
+            self.gallery.search("invalid_input")
+        with self.assertRaises(Exception):
+            self.gallery.search(np.zeros(5))
+
+    def test_search_boundary_zero(self):
+        self.assertEqual(face_gallery.FaceGallery().search(self.query), [])
+        self.assertEqual(self.gallery.search(self.query, top_k=0), [])
+
+    def test_search_performance(self):
+        start_time = time.time()
+        self.gallery.search(self.query, top_k=5)
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.01 秒內完成
+        self.assertLess(elapsed_time, 0.01, "Performance degraded, took too long to process.")
+
+    # test dict interface
+    def test_dict_interface_correctness(self):
+        gallery = face_gallery.FaceGallery.from_dict({"a": np.ones(4), "b": np.zeros(4)})
+        gallery["c"] = np.full(4, 2.0)
+        del gallery["a"]
+        self.assertEqual(sorted(gallery.keys()), ["b", "c"])
+        self.assertEqual(len(gallery), 2)
+        self.assertNotIn("a", gallery)
+        np.testing.assert_array_equal(gallery["c"], np.full(4, 2.0))
+        self.assertEqual(gallery.search(np.full(4, 2.0))[0], ("c", 0.0))
+
+    # test updated
+    def test_updated_correctness(self):
+        gallery = face_gallery.FaceGallery(dimension=4, capacity=8)
+        gallery.add("a", np.ones(4))
+        gallery.add("b", np.zeros(4))
+        appended = gallery.updated({"c": np.full(4, 2.0)})
+        self.assertEqual(sorted(appended.keys()), ["a", "b", "c"])
+        self.assertEqual(sorted(gallery.keys()), ["a", "b"])
+        self.assertIs(appended.matrix.base, gallery.matrix.base)
+
+        # The frozen gallery copies before writing, so it cannot clobber the appended rows.
+        gallery.add("d", np.full(4, 3.0))
+        np.testing.assert_array_equal(appended["c"], np.full(4, 2.0))
+
+        removed = appended.updated({"a": np.full(4, 5.0)}, ["b", "missing"])
+        self.assertEqual(sorted(removed.keys()), ["a", "c"])
+        np.testing.assert_array_equal(appended["a"], np.ones(4))
+        np.testing.assert_array_equal(removed["a"], np.full(4, 5.0))
@@ -0,0 +1,93 @@
+import time
+import unittest
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from package import face_quality
+
+
+def keypoints(right_eye_x: float, left_eye_x: float, nose_x: float) -> list:
+    return [
+        SimpleNamespace(x=right_eye_x, y=0.4),
+        SimpleNamespace(x=left_eye_x, y=0.4),
+        SimpleNamespace(x=nose_x, y=0.6),
+    ]
+
+
+class TestFaceQuality(unittest.TestCase):
+    def setUp(self):
+        self.scorer = face_quality.FaceQualityScorer()
+        self.image = np.load("./tests_core/test_data/test_image.npz")["test_img"][60:330, 150:420].copy()
+        self.frontal = keypoints(0.3, 0.7, 0.5)
+
+    # test evaluate
+    def test_evaluate_correctness(self):
+        self.assertTrue(self.scorer.evaluate(self.image, self.frontal).passed)
+        self.assertEqual(self.scorer.evaluate(cv2.GaussianBlur(self.image, (0, 0), 8)).reason, "blur")
+        self.assertEqual(self.scorer.evaluate((self.image * 0.2).astype(np.uint8)).reason, "dark")
+        self.assertEqual(self.scorer.evaluate(self.image, keypoints(0.3, 0.7, 0.34)).reason, "pose")
+        # The blink detector brightness is used when known.
+        self.assertEqual(self.scorer.evaluate(self.image, self.frontal, 20.0).reason, "dark")
+        self.assertEqual(self.scorer.evaluate(self.image, self.frontal, 0).brightness, np.mean(self.scorer._gray))
+
+    def test_evaluate_output_type(self):
+        quality = self.scorer.evaluate(self.image, self.frontal)
+        self.assertIsInstance(quality, face_quality.FaceQuality)
+        self.assertIsInstance(quality.sharpness, float)
+        self.assertIsInstance(quality.brightness, float)
+        self.assertIsInstance(quality.symmetry, float)
+        self.assertAlmostEqual(quality.score, quality.sharpness * quality.symmetry)
+
+    def test_evaluate_invalid_input(self):
+        with self.assertRaises(Exception):
+            self.scorer.evaluate("invalid_input")
+        with self.assertRaises(Exception):
+            self.scorer.evaluate(np.zeros((0, 0, 3), dtype=np.uint8))
+
+    def test_evaluate_boundary_zero(self):
+        # A disabled gate scores but lets everything through.
+        scorer = face_quality.FaceQualityScorer(enabled=False)
+        quality = scorer.evaluate(np.zeros((100, 100, 3), dtype=np.uint8))
+        self.assertTrue(quality.passed)
+        self.assertEqual(quality.reason, "blur")
+        self.assertEqual(scorer.stats()["skipped"], 0)
+
+    def test_evaluate_performance(self):
+        large_roi = cv2.resize(self.image, None, fx=2, fy=2)
+        start_time = time.time()
+        self.scorer.evaluate(large_roi, self.frontal)
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.01 秒內完成
+        self.assertLess(elapsed_time, 0.01, "Performance degraded, took too long to process.")
+
+    # test symmetry
+    def test_symmetry_correctness(self):
+        self.assertAlmostEqual(face_quality.FaceQualityScorer.symmetry(self.frontal), 1.0)
+        self.assertAlmostEqual(face_quality.FaceQualityScorer.symmetry(keypoints(0.2, 0.8, 0.6)), 0.5)
+        self.assertAlmostEqual(face_quality.FaceQualityScorer.symmetry(keypoints(0.2, 0.8, 0.4)), 0.5)
+
+    def test_symmetry_boundary_zero(self):
+        self.assertEqual(face_quality.FaceQualityScorer.symmetry(None), 1.0)
+        self.assertEqual(face_quality.FaceQualityScorer.symmetry(keypoints(0.5, 0.5, 0.5)), 0.0)
+
+    # test score
+    def test_score_correctness(self):
+        # Scoring does not count, the gate decision is recorded separately.
+        quality = self.scorer.score(self.image, keypoints(0.3, 0.7, 0.3))
+        self.assertEqual(self.scorer.stats()["evaluated"], 0)
+        self.assertFalse(self.scorer.record(quality))
+        self.assertEqual(self.scorer.stats()["skipped_by_reason"]["pose"], 1)
+
+    # test stats
+    def test_stats_correctness(self):
+        self.scorer.evaluate(self.image, self.frontal)
+        self.scorer.evaluate(self.image, keypoints(0.3, 0.7, 0.3))
+        self.scorer.evaluate(np.full((100, 100, 3), 128, dtype=np.uint8))
+        stats = self.scorer.stats(extraction_seconds=0.25)
+        self.assertEqual(stats["evaluated"], 3)
+        self.assertEqual(stats["skipped"], 2)
+        self.assertEqual(stats["skipped_by_reason"], {"blur": 1, "dark": 0, "pose": 1})
+        self.assertAlmostEqual(stats["skipped_ratio"], 0.667)
+        self.assertAlmostEqual(stats["saved_extraction_seconds"], 0.5)
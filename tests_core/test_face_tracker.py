@@ -0,0 +1,104 @@
+import time
+import unittest
+
+import numpy as np
+
+from package import face_tracker
+
+
+class TestFaceTracker(unittest.TestCase):
+    def setUp(self):
+        self.tracker = face_tracker.FaceTracker(identity_ttl=5.0, quality_gain=1.5)
+        self.box = [[100, 100], [200, 200]]
+        self.other_box = [[400, 100], [500, 200]]
+        self.result = [True, 0.3, "test_user", np.zeros((150, 150, 3), dtype=np.uint8)]
+
+    # test update
+    def test_update_correctness(self):
+        first, second = self.tracker.update([self.box, self.other_box])
+        self.assertNotEqual(first.track_id, second.track_id)
+        # Overlapping boxes keep their track, in any order.
+        moved = self.tracker.update([[[405, 105], [505, 205]], [[110, 100], [210, 200]]])
+        self.assertEqual([track.track_id for track in moved], [second.track_id, first.track_id])
+        # A small face moving fast has no overlap but is still close to its last center.
+        small = [[0, 0], [40, 40]]
+        track = self.tracker.update([small])[0]
+        self.assertIs(self.tracker.update([[[15, 0], [55, 40]]])[0], track)
+
+    def test_update_output_type(self):
+        tracks = self.tracker.update([self.box])
+        self.assertIsInstance(tracks, list)
+        self.assertIsInstance(tracks[0], face_tracker.FaceTrack)
+        self.assertIsInstance(tracks[0].track_id, int)
+
+    def test_update_invalid_input(self):
+        with self.assertRaises(Exception):
+            self.tracker.update(["invalid_input"])
+
+    def test_update_boundary_zero(self):
+        track = self.tracker.update([self.box])[0]
+        for _ in range(self.tracker.max_missed):
+            self.assertEqual(self.tracker.update([]), [])
+        self.assertIn(track.track_id, self.tracker.tracks)
+        self.tracker.update([])
+        self.assertEqual(self.tracker.tracks, {})
+        self.assertIsNot(self.tracker.update([self.box])[0], track)
+
+    def test_update_performance(self):
+        boxes = [[[x, 100], [x + 50, 150]] for x in range(0, 600, 60)]
+        self.tracker.update(boxes)
+        start_time = time.time()
+        self.tracker.update(boxes)
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.005 秒內完成
+        self.assertLess(elapsed_time, 0.005, "Performance degraded, took too long to process.")
+
+    # test needs_recognition
+    def test_needs_recognition_correctness(self):
+        track = self.tracker.update([self.box])[0]
+        self.assertTrue(self.tracker.needs_recognition(track, 100.0, now=0.0))
+        self.tracker.remember(track.track_id, self.result, 100.0, now=0.0)
+        self.assertFalse(self.tracker.needs_recognition(track, 120.0, now=1.0))
+        self.assertEqual(track.result(), self.result)
+        # A much better crop or an expired identity is recognized again.
+        self.assertTrue(self.tracker.needs_recognition(track, 200.0, now=1.0))
+        self.assertTrue(self.tracker.needs_recognition(track, 100.0, now=6.0))
+        self.assertEqual(self.tracker.hits, 1)
+        self.assertEqual(self.tracker.misses, 3)
+        self.assertEqual(self.tracker.hit_rate, 0.25)
+
+    def test_needs_recognition_boundary_zero(self):
+        tracker = face_tracker.FaceTracker(identity_ttl=0.0)
+        track = tracker.update([self.box])[0]
+        tracker.remember(track.track_id, self.result, 100.0, now=0.0)
+        self.assertTrue(tracker.needs_recognition(track, 100.0, now=0.001))
+        self.assertEqual(tracker.stats()["identity_cache_hit_rate"], 0.0)
+
+    # test remember
+    def test_remember_invalid_input(self):
+        # The track left before its recognition finished.
+        self.tracker.remember(42, self.result, 100.0)
+        self.assertEqual(self.tracker.tracks, {})
+        # The face left and came back while it was recognized: the result may be someone else's.
+        track = self.tracker.update([self.box])[0]
+        presence = track.presence
+        self.tracker.update([])
+        self.tracker.update([self.box])
+        self.tracker.remember(track.track_id, self.result, 100.0, presence)
+        self.assertFalse(track.recognized)
+
+    def test_remember_face_left(self):
+        # A face missing from one frame loses its identity, another person in the same spot is recognized.
+        track = self.tracker.update([self.box])[0]
+        self.tracker.remember(track.track_id, self.result, 100.0, track.presence, now=0.0)
+        self.assertFalse(self.tracker.needs_recognition(track, 100.0, now=1.0))
+        self.tracker.update([])
+        self.assertIs(self.tracker.update([[[110, 100], [210, 200]]])[0], track)
+        self.assertTrue(self.tracker.needs_recognition(track, 100.0, now=1.0))
+        self.assertIsNone(track.name)
+
+    # test iou
+    def test_iou_correctness(self):
+        self.assertEqual(face_tracker.FaceTracker.iou(self.box, self.box), 1.0)
+        self.assertEqual(face_tracker.FaceTracker.iou(self.box, self.other_box), 0.0)
+        self.assertAlmostEqual(face_tracker.FaceTracker.iou(self.box, [[150, 100], [250, 200]]), 1 / 3)
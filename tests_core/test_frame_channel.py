@@ -0,0 +1,137 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from package import frame_channel
+
+
+def frame(value: int) -> np.ndarray:
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+class TestFrameChannel(unittest.TestCase):
+    # test put / get
+    def test_get_correctness(self):
+        channel = frame_channel.FrameChannel(capacity=3, policy="drop_oldest")
+        for value in range(5):
+            self.assertTrue(channel.put(frame(value)))
+        # The two oldest frames were dropped, the others arrive in order.
+        self.assertEqual([int(channel.get(timeout=1)[0, 0, 0]) for _ in range(3)], [2, 3, 4])
+        self.assertEqual(channel.dropped, 2)
+        self.assertEqual(channel.delivered, 3)
+
+        latest = frame_channel.FrameChannel(capacity=3, policy="latest")
+        for value in range(5):
+            latest.put(frame(value))
+        self.assertEqual(int(latest.get(timeout=1)[0, 0, 0]), 4)
+        self.assertTrue(latest.empty())
+        self.assertEqual(latest.dropped, 4)
+
+    def test_get_output_type(self):
+        channel = frame_channel.FrameChannel()
+        channel.put(frame(1))
+        received = channel.get(timeout=1)
+        self.assertIsInstance(received, np.ndarray)
+        self.assertEqual(received.shape, (48, 64, 3))
+        self.assertIsInstance(channel.stats(), dict)
+
+    def test_get_invalid_input(self):
+        with self.assertRaises(ValueError):
+            frame_channel.FrameChannel(policy="invalid_input")
+        with self.assertRaises(Exception):
+            frame_channel.FrameChannel().put("invalid_input")
+
+    def test_get_boundary_zero(self):
+        channel = frame_channel.FrameChannel(capacity=1, policy="block")
+        self.assertIsNone(channel.get(timeout=0))
+        self.assertTrue(channel.put(frame(1)))
+        # Full: the producer waits for the consumer, then gives up.
+        self.assertFalse(channel.put(frame(2), timeout=0.01))
+        self.assertEqual(channel.dropped, 1)
+        consumer = threading.Timer(0.05, channel.get)
+        consumer.start()
+        self.assertTrue(channel.put(frame(3), timeout=1))
+        consumer.join()
+        channel.close()
+        self.assertFalse(channel.put(frame(4)))
+        self.assertEqual(int(channel.get()[0, 0, 0]), 3)
+        self.assertIsNone(channel.get())
+
+    def test_get_performance(self):
+        channel = frame_channel.FrameChannel(capacity=2, policy="drop_oldest")
+        large_frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        start_time = time.time()
+        for _ in range(10):
+            channel.put(large_frame)
+            channel.get(timeout=1)
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.1 秒內完成
+        self.assertLess(elapsed_time, 0.1, "Performance degraded, took too long to process.")
+
+    def test_put_correctness(self):
+        # Slots are reused: memory does not grow under overload, and the held frame is never overwritten.
+        channel = frame_channel.FrameChannel(capacity=2, policy="drop_oldest")
+        channel.put(frame(1))
+        held = channel.get(timeout=1)
+        slots = set()
+        for value in range(2, 50):
+            channel.put(frame(value))
+            slots.update(id(slot) for slot in channel._slots if slot is not None)
+        self.assertEqual(len(slots), 3)
+        self.assertEqual(int(held[0, 0, 0]), 1)
+        self.assertEqual(channel.qsize(), 2)
+        self.assertGreaterEqual(channel.stats()["max_age_ms"], 0.0)
+
+    def test_put_timestamp(self):
+        # The capture sequence and timestamp travel with the frame, dropped frames leave a gap.
+        channel = frame_channel.FrameChannel(policy="latest")
+        captured_at = time.monotonic() - 0.05
+        channel.put(frame(1), timestamp=captured_at - 0.01)
+        channel.put(frame(2), timestamp=captured_at)
+        channel.get(timeout=1)
+        self.assertEqual(channel.last_sequence, 2)
+        self.assertEqual(channel.last_timestamp, captured_at)
+        self.assertGreaterEqual(channel.last_age, 0.05)
+
+    def test_put_boundary_zero(self):
+        # A consumer slower than the camera still gets fresh frames with the latest policy.
+        channel = frame_channel.FrameChannel(policy="latest")
+        stop = threading.Event()
+
+        def produce():
+            while not stop.is_set():
+                channel.put(frame(1))
+                time.sleep(0.001)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        for _ in range(10):
+            channel.get(timeout=1)
+            time.sleep(0.02)
+        stop.set()
+        producer.join()
+        self.assertLess(channel.max_age, 0.02)
+        self.assertGreater(channel.dropped, 0)
+
+    # test wants_frame
+    def test_wants_frame_correctness(self):
+        channel = frame_channel.FrameChannel(capacity=2, policy="drop_oldest")
+        self.assertTrue(channel.wants_frame())
+        channel.put(frame(1))
+        self.assertTrue(channel.wants_frame())
+        channel.put(frame(2))
+        self.assertFalse(channel.wants_frame())
+        channel.get(timeout=1)
+        self.assertTrue(channel.wants_frame())
+        # With `latest`, only while the consumer waits in `get`.
+        latest = frame_channel.FrameChannel(policy="latest")
+        self.assertFalse(latest.wants_frame())
+        waiter = threading.Thread(target=latest.get, args=(1,))
+        waiter.start()
+        time.sleep(0.05)
+        self.assertTrue(latest.wants_frame())
+        latest.put(frame(1))
+        waiter.join()
+        self.assertFalse(latest.wants_frame())
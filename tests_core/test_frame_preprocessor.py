@@ -0,0 +1,66 @@
+import time
+import tracemalloc
+import unittest
+
+import cv2
+import numpy as np
+
+from package import frame_preprocessor
+
+
+class TestFramePreprocessor(unittest.TestCase):
+    def setUp(self):
+        self.preprocessor = frame_preprocessor.FramePreprocessor(640, 480)
+        self.frame = cv2.resize(np.load("./tests_core/test_data/test_image.npz")["test_img"], (1280, 720))
+
+    # test process
+    def test_process_correctness(self):
+        frame = self.preprocessor.process(self.frame)
+        expected = cv2.resize(cv2.flip(self.frame, 1), (640, 480), interpolation=cv2.INTER_AREA)
+        np.testing.assert_array_equal(frame, expected)
+        np.testing.assert_array_equal(self.preprocessor.rgb(), cv2.cvtColor(expected, cv2.COLOR_BGR2RGB))
+        np.testing.assert_array_equal(self.preprocessor.gray(), cv2.cvtColor(expected, cv2.COLOR_BGR2GRAY))
+        # A region is converted into its own contiguous buffer.
+        region = self.preprocessor.rgb((100, 50, 300, 250))
+        self.assertTrue(region.flags["C_CONTIGUOUS"])
+        np.testing.assert_array_equal(region, cv2.cvtColor(expected[50:250, 100:300], cv2.COLOR_BGR2RGB))
+
+    def test_process_output_type(self):
+        frame = self.preprocessor.process(self.frame)
+        self.assertEqual(frame.shape, (480, 640, 3))
+        self.assertEqual(self.preprocessor.rgb().shape, (480, 640, 3))
+        self.assertEqual(self.preprocessor.gray().shape, (480, 640))
+        self.assertEqual(frame.dtype, np.uint8)
+
+    def test_process_invalid_input(self):
+        with self.assertRaises(Exception):
+            self.preprocessor.process("invalid_input")
+
+    def test_process_boundary_zero(self):
+        # A frame already at the target size is only mirrored, or copied when not mirroring.
+        small = cv2.resize(self.frame, (640, 480))
+        np.testing.assert_array_equal(self.preprocessor.process(small), cv2.flip(small, 1))
+        preprocessor = frame_preprocessor.FramePreprocessor(640, 480, flip=False)
+        np.testing.assert_array_equal(preprocessor.process(small), small)
+        # Conversions follow the latest frame.
+        preprocessor.rgb()
+        preprocessor.process(np.zeros_like(small))
+        self.assertEqual(preprocessor.rgb().max(), 0)
+
+    def test_process_performance(self):
+        self.preprocessor.process(self.frame)
+        self.preprocessor.rgb()
+        self.preprocessor.gray()
+        tracemalloc.start()
+        start_time = time.time()
+        for _ in range(10):
+            self.preprocessor.process(self.frame)
+            self.preprocessor.rgb()
+            self.preprocessor.gray()
+        elapsed_time = time.time() - start_time
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # No frame-sized allocation per frame.
+        self.assertLess(peak, 64 * 1024)
+        # 性能判斷, 假設期望在 0.1 秒內完成
+        self.assertLess(elapsed_time, 0.1, "Performance degraded, took too long to process.")
@@ -0,0 +1,59 @@
+import time
+import unittest
+
+from package import frame_scheduler
+
+
+class TestFrameScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = frame_scheduler.FrameScheduler(target_fps=15, idle_fps=5, cpu_budget=0.8, max_stride=6)
+
+    def run_frames(self, frames: int, fps: float, cost: float, face_detected: bool, face_in_range: bool) -> int:
+        processed = 0
+        for index in range(frames):
+            if self.scheduler.should_process(index / fps):
+                processed += 1
+                self.scheduler.record(cost, face_detected, face_in_range)
+        return processed
+
+    # test record
+    def test_record_correctness(self):
+        # An empty scene at 30 fps drops to the idle rate of 5 fps.
+        self.run_frames(60, 30, 0.01, False, False)
+        self.assertEqual(self.scheduler.stride, 6)
+        # A face out of range is detected at the target rate, one in range on every frame.
+        self.run_frames(60, 30, 0.01, True, False)
+        self.assertEqual(self.scheduler.stride, 2)
+        # The first frame may still fall in the previous stride.
+        self.assertGreaterEqual(self.run_frames(30, 30, 0.01, True, True), 29)
+        self.assertEqual(self.scheduler.stride, 1)
+
+    def test_record_output_type(self):
+        self.scheduler.should_process(0.0)
+        self.assertIsInstance(self.scheduler.record(0.01, False, False), int)
+        self.assertIsInstance(self.scheduler.stats(), dict)
+        self.assertIsInstance(self.scheduler.should_process(0.1), bool)
+
+    def test_record_invalid_input(self):
+        with self.assertRaises(TypeError):
+            self.scheduler.record("invalid_input", False, False)
+
+    def test_record_boundary_zero(self):
+        # Without limits every frame is detected, a slow host is held to the CPU budget.
+        unlimited = frame_scheduler.FrameScheduler(target_fps=0, idle_fps=0, cpu_budget=0)
+        for index in range(30):
+            self.assertTrue(unlimited.should_process(index / 30))
+            unlimited.record(0.0, False, False)
+        self.assertEqual(unlimited.stride, 1)
+        budget = frame_scheduler.FrameScheduler(target_fps=0, idle_fps=0, cpu_budget=0.5)
+        for index in range(60):
+            if budget.should_process(index / 30):
+                budget.record(0.05, True, False)
+        self.assertEqual(budget.stride, 3)
+
+    def test_record_performance(self):
+        start_time = time.time()
+        self.run_frames(10000, 30, 0.01, True, False)
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.1 秒內完成
+        self.assertLess(elapsed_time, 0.1, "Performance degraded, took too long to process.")
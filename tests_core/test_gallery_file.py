@@ -0,0 +1,112 @@
+import csv
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from package import gallery_file
+
+
+class TestGalleryFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.directory.name, "model.csv")
+        self.gallery_path = os.path.join(self.directory.name, "model.gallery")
+        rng = np.random.default_rng(0)
+        self.descriptors = {f"user_{i}": rng.normal(0, 0.1, 128) for i in range(20)}
+        with open(self.csv_path, mode="w", newline="") as file:
+            writer = csv.writer(file)
+            for name, features in self.descriptors.items():
+                writer.writerow([name] + features.tolist())
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # test convert_csv_to_gallery / load_gallery
+    def test_load_gallery_correctness(self):
+        count = gallery_file.convert_csv_to_gallery(self.csv_path, self.gallery_path)
+        self.assertEqual(count, 20)
+        self.assertTrue(gallery_file.is_gallery_file(self.gallery_path))
+        self.assertFalse(gallery_file.is_gallery_file(self.csv_path))
+
+        gallery = gallery_file.load_gallery(self.gallery_path)
+        csv_gallery = gallery_file.load_gallery(self.csv_path)
+        self.assertEqual(gallery.keys(), csv_gallery.keys())
+        np.testing.assert_array_equal(gallery.matrix, csv_gallery.matrix)
+
+    def test_load_gallery_output_type(self):
+        gallery_file.convert_csv_to_gallery(self.csv_path, self.gallery_path)
+        gallery = gallery_file.load_gallery(self.gallery_path)
+        base = gallery.matrix
+        while not isinstance(base, np.memmap) and base.base is not None:
+            base = base.base
+        self.assertIsInstance(base, np.memmap)
+        self.assertEqual(gallery.matrix.dtype, np.float32)
+
+    def test_load_gallery_invalid_input(self):
+        with self.assertRaises(ValueError):
+            gallery_file.load_gallery_file(self.csv_path)
+        gallery_file.create_gallery_file(self.gallery_path)
+        with self.assertRaises(ValueError):
+            gallery_file.append_to_gallery_file(self.gallery_path, "x" * 65, np.zeros(128))
+
+    def test_load_gallery_boundary_zero(self):
+        missing_path = os.path.join(self.directory.name, "new", "model.gallery")
+        gallery = gallery_file.load_gallery(missing_path)
+        self.assertEqual(len(gallery), 0)
+        self.assertTrue(gallery_file.is_gallery_file(missing_path))
+
+    def test_load_gallery_performance(self):
+        gallery_file.convert_csv_to_gallery(self.csv_path, self.gallery_path)
+        start_time = time.time()
+        gallery_file.load_gallery(self.gallery_path)
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.1 秒內完成
+        self.assertLess(elapsed_time, 0.1, "Performance degraded, took too long to process.")
+
+    # test save_descriptor / delete_descriptor
+    def test_save_delete_descriptor_correctness(self):
+        gallery_file.create_gallery_file(self.gallery_path, capacity=4)
+        for name in list(self.descriptors)[:6]:
+            gallery_file.save_descriptor(self.gallery_path, name, self.descriptors[name])
+        self.assertEqual(gallery_file.read_header(self.gallery_path).capacity, gallery_file.DEFAULT_CAPACITY)
+
+        self.assertTrue(gallery_file.delete_descriptor(self.gallery_path, "user_1"))
+        self.assertFalse(gallery_file.delete_descriptor(self.gallery_path, "user_1"))
+        gallery = gallery_file.load_gallery(self.gallery_path)
+        self.assertEqual(sorted(gallery.keys()), ["user_0", "user_2", "user_3", "user_4", "user_5"])
+        np.testing.assert_allclose(gallery["user_5"], self.descriptors["user_5"], rtol=1e-6)
+
+        self.assertTrue(gallery_file.delete_descriptor(self.csv_path, "user_1"))
+        self.assertNotIn("user_1", gallery_file.load_gallery(self.csv_path))
+
+    def test_save_delete_descriptor_boundary_zero(self):
+        # A gallery loaded before a delete keeps matching its names to their own descriptors.
+        gallery_file.convert_csv_to_gallery(self.csv_path, self.gallery_path)
+        gallery = gallery_file.load_gallery(self.gallery_path)
+        self.assertTrue(gallery_file.delete_descriptor(self.gallery_path, "user_3"))
+        for name in self.descriptors:
+            np.testing.assert_allclose(gallery[name], self.descriptors[name], rtol=1e-6)
+        reloaded = gallery_file.load_gallery(self.gallery_path)
+        self.assertNotIn("user_3", reloaded)
+        np.testing.assert_allclose(reloaded["user_19"], self.descriptors["user_19"], rtol=1e-6)
+        self.assertEqual([entry for entry in os.listdir(self.directory.name) if entry.endswith(".tmp")], [])
+
+    def test_save_descriptor_concurrent_first_enroll(self):
+        # Enrolls racing to create the file all end up in it.
+        names = list(self.descriptors)[:8]
+        barrier = threading.Barrier(len(names))
+
+        def enroll(name):
+            barrier.wait()
+            gallery_file.save_descriptor(self.gallery_path, name, self.descriptors[name])
+
+        threads = [threading.Thread(target=enroll, args=(name,)) for name in names]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(gallery_file.load_gallery(self.gallery_path).keys()), sorted(names))
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from package import face_gallery, gallery_index
+
+
+class TestGalleryIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        centers = rng.normal(0, 0.1, (40, 128))
+        self.matrix = centers[rng.integers(0, 40, 4000)] + rng.normal(0, 0.04, (4000, 128))
+        self.gallery = face_gallery.FaceGallery.from_arrays([f"user_{i}" for i in range(4000)], self.matrix)
+        self.queries = self.matrix[:50] + rng.normal(0, 0.01, (50, 128))
+        self.ivf = gallery_index.IVFIndex(n_lists=32, nprobe=4)
+        self.ivf.build(self.gallery)
+
+    # test IVFIndex.search
+    def test_ivf_search_correctness(self):
+        report = gallery_index.evaluate_recall(self.gallery, self.ivf, self.queries, [4, 32])
+        self.assertGreaterEqual(report[0]["recall"], 0.9)
+        self.assertEqual(report[1]["recall"], 1.0)
+        name, distance = self.ivf.search(self.gallery, self.queries[7])[0]
+        self.assertEqual(name, "user_7")
+        self.assertAlmostEqual(distance, float(np.linalg.norm(self.queries[7] - self.matrix[7])), places=5)
+
+    def test_ivf_search_output_type(self):
+        matches = self.ivf.search(self.gallery, self.queries[0], top_k=3)
+        self.assertEqual(len(matches), 3)
+        self.assertIsInstance(matches[0][1], float)
+
+    def test_ivf_search_invalid_input(self):
+        with self.assertRaises(Exception):
+            self.ivf.search(self.gallery, "invalid_input")
+        with self.assertRaises(ValueError):
+            gallery_index.create_gallery_index(self.gallery, "invalid_input")
+
+    def test_ivf_search_boundary_zero(self):
+        self.assertEqual(self.ivf.search(face_gallery.FaceGallery(), self.queries[0]), [])
+        self.assertEqual(self.ivf.search(self.gallery, self.queries[0], top_k=0), [])
+
+    def test_ivf_search_performance(self):
+        start_time = time.time()
+        self.ivf.search(self.gallery, self.queries[0])
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.01 秒內完成
+        self.assertLess(elapsed_time, 0.01, "Performance degraded, took too long to process.")
+
+    # test persistence and refresh
+    def test_ivf_save_load_refresh(self):
+        with tempfile.TemporaryDirectory() as directory:
+            index_path = os.path.join(directory, "index.npz")
+            self.ivf.save(index_path, self.gallery)
+            loaded = gallery_index.IVFIndex.load(index_path, self.gallery)
+            np.testing.assert_array_equal(loaded.list_rows, self.ivf.list_rows)
+            # Same names, other descriptors: the saved lists are not reused.
+            shuffled = face_gallery.FaceGallery.from_arrays(self.gallery.keys(), self.matrix[::-1])
+            loaded = gallery_index.IVFIndex.load(index_path, shuffled)
+            self.assertEqual(loaded.search(shuffled, self.queries[7])[0][0], "user_3992")
+
+        # A changed gallery is searched exactly until it is refreshed, search never rebuilds the lists.
+        list_rows = self.ivf.list_rows
+        self.gallery.add("new_user", self.queries[3] + 0.5)
+        self.assertEqual(self.ivf.search(self.gallery, self.queries[3] + 0.5)[0][0], "new_user")
+        self.assertIs(self.ivf.list_rows, list_rows)
+        self.ivf.refresh(self.gallery)
+        self.assertEqual(self.ivf.search(self.gallery, self.queries[3] + 0.5)[0][0], "new_user")
+        self.gallery.remove("new_user")
+        self.assertEqual(self.ivf.search(self.gallery, self.queries[3])[0][0], "user_3")
+        # A new gallery at the same version is another gallery, even if it reuses the memory of this one.
+        other = face_gallery.FaceGallery.from_arrays(["user_0"], self.matrix[:1])
+        other.version = self.gallery.version
+        self.assertNotEqual(other.token, self.gallery.token)
+        self.assertEqual(self.ivf.search(other, self.queries[3])[0][0], "user_0")
@@ -0,0 +1,100 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from package import gallery_file, gallery_store
+
+
+class TestGalleryStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store_path = os.path.join(self.directory.name, "model.db")
+        self.store = gallery_store.GalleryStore(self.store_path)
+        rng = np.random.default_rng(0)
+        self.descriptors = {f"user_{i}": rng.normal(0, 0.1, 128) for i in range(500)}
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    # test enroll / delete / load_gallery
+    def test_enroll_delete_correctness(self):
+        self.store.enroll_many(self.descriptors)
+        self.store.enroll("user_1", np.ones(128))
+        self.assertTrue(self.store.delete("user_2"))
+        self.assertFalse(self.store.delete("user_2"))
+        self.assertEqual(self.store.count(), 499)
+
+        gallery = self.store.load_gallery()
+        self.assertEqual(len(gallery), 499)
+        self.assertNotIn("user_2", gallery)
+        np.testing.assert_array_equal(gallery["user_1"], np.ones(128, dtype=np.float32))
+        self.assertEqual(gallery.search(self.descriptors["user_7"])[0][0], "user_7")
+
+    def test_enroll_output_type(self):
+        self.store.enroll("user_0", self.descriptors["user_0"])
+        self.assertEqual(self.store.get("user_0").dtype, np.float32)
+        self.assertIsNone(self.store.get("invalid_input"))
+
+    def test_enroll_concurrent_writers(self):
+        threads = [
+            threading.Thread(target=self.store.enroll, args=(name, features))
+            for name, features in list(self.descriptors.items())[:50]
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.store.count(), 50)
+
+    def test_changes_since_correctness(self):
+        # Writes are ordered by commit, whatever clock their rows were stamped with.
+        self.store.enroll("user_0", self.descriptors["user_0"])
+        sequence = self.store.sequence()
+        self.assertEqual(self.store.changes_since(sequence), ({}, sequence))
+        self.store.enroll_many({name: self.descriptors[name] for name in ["user_1", "user_2"]})
+        self.store._connection.execute("UPDATE face_features SET updated_at = 0")
+        changes, latest = self.store.changes_since(sequence)
+        self.assertEqual(sorted(changes), ["user_1", "user_2"])
+        self.assertEqual(latest, self.store.sequence())
+
+    def test_changes_since_old_store(self):
+        # A store written before the sequence column is upgraded when opened.
+        path = os.path.join(self.directory.name, "old.db")
+        connection = sqlite3.connect(path)
+        connection.execute(
+            "CREATE TABLE face_features (name TEXT PRIMARY KEY, dimension INTEGER NOT NULL, "
+            "descriptor BLOB NOT NULL, updated_at REAL NOT NULL)"
+        )
+        connection.execute(
+            "INSERT INTO face_features VALUES (?, ?, ?, ?)", ("user_0", 128, np.zeros(128, "<f4").tobytes(), 0.0)
+        )
+        connection.commit()
+        connection.close()
+        store = gallery_store.GalleryStore(path)
+        store.enroll("user_1", self.descriptors["user_1"])
+        self.assertEqual(list(store.changes_since(0)[0]), ["user_1"])
+        self.assertEqual(len(store.load_gallery()), 2)
+        store.close()
+
+    def test_load_gallery_boundary_zero(self):
+        self.assertEqual(len(self.store.load_gallery()), 0)
+        new_path = os.path.join(self.directory.name, "new", "model.sqlite3")
+        self.assertTrue(gallery_store.is_store_file(new_path))
+        self.assertEqual(len(gallery_file.load_gallery(new_path)), 0)
+        gallery_file.save_descriptor(new_path, "user_0", self.descriptors["user_0"])
+        self.assertTrue(gallery_file.delete_descriptor(new_path, "user_0"))
+
+    def test_enroll_delete_performance(self):
+        self.store.enroll_many(self.descriptors)
+        start_time = time.time()
+        self.store.enroll("new_user", self.descriptors["user_0"])
+        self.store.delete("new_user")
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.1 秒內完成
+        self.assertLess(elapsed_time, 0.1, "Performance degraded, took too long to process.")
@@ -0,0 +1,111 @@
+import csv
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from package import gallery_file, gallery_index, gallery_store, gallery_watcher, predictor
+
+
+class TestGalleryWatcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.descriptors = {f"user_{i}": rng.normal(0, 0.1, 128) for i in range(30)}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _watch(self, file_name: str, initial: int = 20, index=None):
+        path = os.path.join(self.directory.name, file_name)
+        for name in list(self.descriptors)[:initial]:
+            gallery_file.save_descriptor(path, name, self.descriptors[name])
+        face_predictor = predictor.Predictor(None, None, gallery_file.load_gallery(path), 0.4, index)
+        return path, face_predictor, gallery_watcher.GalleryWatcher(path, face_predictor)
+
+    def _assert_matches(self, face_predictor, names):
+        self.assertEqual(sorted(face_predictor.registered_face_descriptor.keys()), sorted(names))
+        for name in names:
+            self.assertEqual(face_predictor.nearest_faces(self.descriptors[name], top_k=1)[0][0], name)
+
+    # test poll
+    def test_poll_correctness(self):
+        for file_name in ["model.db", "model.gallery", "model.csv"]:
+            path, face_predictor, watcher = self._watch(file_name)
+            self.assertFalse(watcher.poll())
+
+            for name in ["user_20", "user_21"]:
+                gallery_file.save_descriptor(path, name, self.descriptors[name])
+            self.assertTrue(watcher.poll(), file_name)
+            self._assert_matches(face_predictor, [f"user_{i}" for i in range(22)])
+
+            gallery_file.delete_descriptor(path, "user_3")
+            self.assertTrue(watcher.poll(), file_name)
+            self._assert_matches(face_predictor, [f"user_{i}" for i in range(22) if i != 3])
+            watcher.stop()
+
+    def test_poll_ivf_index(self):
+        index = gallery_index.IVFIndex(n_lists=4, nprobe=4)
+        path, face_predictor, watcher = self._watch("model.gallery", index=index)
+        index.build(face_predictor.registered_face_descriptor)
+        searched_index = face_predictor.index
+        gallery_file.save_descriptor(path, "user_25", self.descriptors["user_25"])
+        watcher.poll()
+        self.assertIsNot(face_predictor.index, searched_index)
+        self._assert_matches(face_predictor, [f"user_{i}" for i in range(20)] + ["user_25"])
+
+    def test_poll_store_late_commit(self):
+        # A writer that stamped its row long before it got the lock and committed is still picked up.
+        path, face_predictor, watcher = self._watch("model.db")
+        store = gallery_store.GalleryStore(path)
+        store.enroll("user_20", self.descriptors["user_20"])
+        store._connection.execute("UPDATE face_features SET updated_at = 0 WHERE name = 'user_20'")
+        self.assertTrue(watcher.poll())
+        self._assert_matches(face_predictor, [f"user_{i}" for i in range(21)])
+        store.close()
+        watcher.stop()
+
+    def test_poll_csv_partial_line(self):
+        path, face_predictor, watcher = self._watch("model.csv")
+        with open(path, "a", newline="") as file:
+            csv.writer(file).writerow(["user_20"] + self.descriptors["user_20"].tolist())
+            file.write("user_21,0.1,0.2")
+        self.assertTrue(watcher.poll())
+        self.assertIn("user_20", face_predictor.registered_face_descriptor)
+        self.assertNotIn("user_21", face_predictor.registered_face_descriptor)
+
+    def test_poll_csv_rewritten_in_place(self):
+        # A rewrite followed by an enroll within one poll: the file only looks appended to.
+        path, face_predictor, watcher = self._watch("model.csv")
+        with open(path, newline="") as file:
+            rows = [row for row in csv.reader(file) if row[0] != "user_3"]
+        with open(path, "w", newline="") as file:
+            csv.writer(file).writerows(rows)
+        for name in ["user_20", "user_21"]:
+            gallery_file.save_descriptor(path, name, self.descriptors[name])
+        self.assertTrue(watcher.poll())
+        self._assert_matches(face_predictor, [f"user_{i}" for i in range(22) if i != 3])
+        self.assertFalse(watcher.poll())
+
+    def test_poll_boundary_zero(self):
+        path, face_predictor, watcher = self._watch("model.gallery", initial=0)
+        self.assertEqual(len(face_predictor.registered_face_descriptor), 0)
+        gallery_file.save_descriptor(path, "user_0", self.descriptors["user_0"])
+        self.assertTrue(watcher.poll())
+        self._assert_matches(face_predictor, ["user_0"])
+
+    def test_notify_performance(self):
+        path, face_predictor, watcher = self._watch("model.gallery")
+        watcher.interval = 60
+        watcher.start()
+        gallery_file.save_descriptor(path, "user_20", self.descriptors["user_20"])
+        start_time = time.time()
+        watcher.notify()
+        while "user_20" not in face_predictor.registered_face_descriptor and time.time() - start_time < 1:
+            time.sleep(0.001)
+        elapsed_time = time.time() - start_time
+        watcher.stop()
+        # 性能判斷, 假設期望在 0.1 秒內完成
+        self.assertLess(elapsed_time, 0.1, "Performance degraded, took too long to process.")
@@ -0,0 +1,56 @@
+import time
+import unittest
+
+from package import latency
+
+
+class TestLatency(unittest.TestCase):
+    def setUp(self):
+        self.tracker = latency.LatencyTracker()
+
+    # test record
+    def test_record_correctness(self):
+        for milliseconds in (3, 3, 3, 40, 600):
+            self.tracker.record("capture_to_detect", 10.0, 10.0 + milliseconds / 1000)
+        stats = self.tracker.stats()["capture_to_detect"]
+        self.assertEqual(stats["count"], 5)
+        self.assertAlmostEqual(stats["mean_ms"], 129.8, places=1)
+        self.assertEqual(stats["p50_ms"], 5.0)
+        self.assertEqual(stats["p95_ms"], 750.0)
+        self.assertAlmostEqual(stats["max_ms"], 600.0, places=1)
+        self.assertEqual(stats["buckets"]["le_5"], 3)
+        self.assertEqual(stats["buckets"]["le_50"], 1)
+        self.assertEqual(self.tracker.stats()["detect_to_recognize"]["count"], 0)
+
+    def test_record_output_type(self):
+        self.tracker.record("frame_to_client", time.monotonic())
+        stats = self.tracker.stats()
+        self.assertEqual(tuple(stats), latency.LATENCY_HOPS)
+        self.assertIsInstance(stats["frame_to_client"], dict)
+        self.assertIsInstance(stats["frame_to_client"]["p99_ms"], float)
+        self.assertIsInstance(latency.FrameStamp(1, 2.0).as_dict(), dict)
+
+    def test_record_invalid_input(self):
+        with self.assertRaises(KeyError):
+            self.tracker.record("invalid_input", 0.0, 1.0)
+        # A missing start, e.g. a cached identity that was not recognized, records nothing.
+        self.tracker.record("recognize_to_publish", None)
+        self.assertEqual(self.tracker.stats()["recognize_to_publish"]["count"], 0)
+
+    def test_record_boundary_zero(self):
+        self.tracker.record("capture_to_detect", 1.0, 1.0)
+        # Clock skew never records a negative latency.
+        self.tracker.record("capture_to_detect", 2.0, 1.0)
+        stats = self.tracker.stats()["capture_to_detect"]
+        self.assertEqual(stats["buckets"]["le_1"], 2)
+        self.assertEqual(stats["max_ms"], 0.0)
+        self.tracker.reset()
+        self.assertEqual(self.tracker.stats()["capture_to_detect"]["p50_ms"], 0.0)
+
+    def test_record_performance(self):
+        start_time = time.time()
+        for index in range(10000):
+            self.tracker.record("capture_to_publish", 0.0, index / 1000)
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.1 秒內完成
+        self.assertLess(elapsed_time, 0.1, "Performance degraded, took too long to process.")
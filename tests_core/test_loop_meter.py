@@ -0,0 +1,61 @@
+import threading
+import time
+import unittest
+
+from package import frame_channel, loop_meter
+
+
+class TestLoopMeter(unittest.TestCase):
+    def setUp(self):
+        self.meter = loop_meter.LoopMeter()
+
+    # test frame
+    def test_frame_correctness(self):
+        # Only processed frames count, wait timeouts in between do not.
+        for index in range(31):
+            self.meter.waited(0.02, now=index / 30)
+            if index % 2 == 0:
+                self.meter.frame(now=index / 30)
+        self.assertEqual(self.meter.fps, 15)
+        self.assertEqual(self.meter.frames, 16)
+        self.assertAlmostEqual(self.meter.idle_percent, 60.0, delta=1.0)
+
+    def test_frame_output_type(self):
+        self.meter.frame(now=0.0)
+        self.meter.frame(now=1.0)
+        stats = self.meter.stats()
+        self.assertEqual(set(stats), {"fps", "frames", "idle_percent", "cpu_percent"})
+        self.assertIsInstance(stats["fps"], int)
+        self.assertIsInstance(stats["cpu_percent"], float)
+
+    def test_frame_boundary_zero(self):
+        # No frame at all: the rate falls to zero once a window passes.
+        self.meter.frame(now=0.0)
+        self.meter.frame(now=1.0)
+        self.assertEqual(self.meter.fps, 1)
+        self.meter.waited(1.0, now=2.0)
+        self.meter.waited(1.0, now=3.0)
+        self.assertEqual(self.meter.fps, 0)
+        self.assertEqual(self.meter.idle_percent, 100.0)
+
+    def test_frame_performance(self):
+        # A loop blocked on an empty channel uses next to no CPU.
+        channel = frame_channel.FrameChannel()
+        meter = loop_meter.LoopMeter(window=0.5)
+
+        def idle_loop():
+            deadline = time.monotonic() + 0.6
+            while time.monotonic() < deadline:
+                wait_started = time.monotonic()
+                if channel.get(timeout=loop_meter.FRAME_WAIT_TIMEOUT) is None:
+                    meter.waited(time.monotonic() - wait_started)
+
+        start_time = time.time()
+        thread = threading.Thread(target=idle_loop)
+        thread.start()
+        thread.join()
+        elapsed_time = time.time() - start_time
+        self.assertLess(meter.cpu_percent, 5.0)
+        self.assertGreater(meter.idle_percent, 90.0)
+        # 性能判斷, 假設期望在 1 秒內完成
+        self.assertLess(elapsed_time, 1, "Performance degraded, took too long to process.")
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import dlib
+
+from package import model_registry
+
+DLIB_PREDICTOR_PATH = "models/dlib/shape_predictor_68_face_landmarks.dat"
+DLIB_RECOGNITION_MODEL_PATH = "models/dlib/dlib_face_recognition_resnet_model_v1.dat"
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = model_registry.ModelRegistry()
+
+    # test get
+    def test_get_correctness(self):
+        first = self.registry.face_recognition_model(DLIB_RECOGNITION_MODEL_PATH)
+        second = self.registry.face_recognition_model(os.path.abspath(DLIB_RECOGNITION_MODEL_PATH))
+        self.assertIs(first, second)
+        self.assertIs(self.registry.frontal_face_detector(), self.registry.frontal_face_detector())
+        self.assertEqual(self.registry.loads, 2)
+        self.assertEqual(self.registry.hits, 2)
+
+    def test_get_output_type(self):
+        self.assertIsInstance(self.registry.shape_predictor(DLIB_PREDICTOR_PATH), dlib.shape_predictor)
+        stats = self.registry.stats()
+        self.assertEqual(len(stats["models"]), 1)
+        self.assertGreater(stats["models"][0]["resident_bytes"], 0)
+        self.assertIsInstance(stats["models"][0]["load_time"], float)
+
+    def test_get_invalid_input(self):
+        with self.assertRaises(ValueError):
+            self.registry.get("invalid_input", DLIB_PREDICTOR_PATH)
+        with self.assertRaises(Exception):
+            self.registry.shape_predictor("invalid_input.dat")
+
+    def test_get_reloads_modified_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "model.dat")
+            shutil.copy(DLIB_RECOGNITION_MODEL_PATH, path)
+            first = self.registry.face_recognition_model(path)
+            os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+            self.assertIsNot(self.registry.face_recognition_model(path), first)
+            self.assertEqual(len(self.registry.stats()["models"]), 1)
+
+    # test evict / trim
+    def test_evict_boundary_zero(self):
+        self.assertEqual(self.registry.evict(), 0)
+        self.assertEqual(self.registry.trim(0), 0)
+        loaded = []
+        self.registry.add_stats_hook(loaded.append)
+        self.registry.face_recognition_model(DLIB_RECOGNITION_MODEL_PATH)
+        self.registry.frontal_face_detector()
+        self.assertEqual([stats["kind"] for stats in loaded], ["face_recognition_model", "frontal_face_detector"])
+        self.assertEqual(self.registry.evict(kind="frontal_face_detector"), 1)
+        self.assertEqual(self.registry.trim(0), 1)
+        self.assertEqual(self.registry.stats()["models"], [])
+
+    def test_get_performance(self):
+        self.registry.shape_predictor(DLIB_PREDICTOR_PATH)
+        start_time = time.time()
+        for _ in range(100):
+            self.registry.shape_predictor(DLIB_PREDICTOR_PATH)
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.01 秒內完成
+        self.assertLess(elapsed_time, 0.01, "Performance degraded, took too long to process.")
@@ -0,0 +1,74 @@
+import time
+import unittest
+
+import cv2
+import numpy as np
+
+from package import overlay
+
+
+class TestOverlay(unittest.TestCase):
+    def setUp(self):
+        self.frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+        self.labels = [
+            ("Eyes detection:", (10, 70)),
+            ("Blink: ON (Stream)", (400, 70)),
+            ("Face detection:", (10, 110)),
+            ("Distance:", (10, 150)),
+            ("[FastAPI Mode]", (10, 30)),
+        ]
+        self.layer = overlay.OverlayLayer().rectangle([100, 40], [540, 440], (0, 255, 0))
+        for text, origin in self.labels:
+            self.layer.text(text, origin, (0, 0, 255))
+
+    # test apply
+    def test_apply_correctness(self):
+        # Rectangles are the pixels `cv2.rectangle` draws, the inside is left alone.
+        frame, expected = self.frame.copy(), self.frame.copy()
+        overlay.OverlayLayer().rectangle([100, 40], [540, 440], (0, 255, 0)).apply(frame)
+        cv2.rectangle(expected, (100, 40), (540, 440), (0, 255, 0), 2)
+        np.testing.assert_array_equal(frame, expected)
+        # Text covers the pixels the anti-aliased text covers at least half.
+        frame = np.zeros_like(self.frame)
+        overlay.OverlayLayer().text("Face detection:", (10, 110), (0, 0, 255)).apply(frame)
+        coverage = np.zeros(frame.shape[:2], dtype=np.uint8)
+        cv2.putText(coverage, "Face detection:", (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 1, 255, 1, cv2.LINE_AA)
+        np.testing.assert_array_equal(frame[:, :, 2] == 255, coverage >= 128)
+        self.assertEqual(frame[:, :, :2].max(), 0)
+
+    def test_apply_output_type(self):
+        frame = self.frame.copy()
+        self.assertIsNone(self.layer.apply(frame))
+        self.assertEqual(frame.dtype, np.uint8)
+        self.assertIsInstance(overlay.OverlayLayer().text("Distance:", (10, 150), (0, 0, 255)), overlay.OverlayLayer)
+
+    def test_apply_invalid_input(self):
+        with self.assertRaises(Exception):
+            self.layer.apply("invalid_input")
+
+    def test_apply_boundary_zero(self):
+        # An empty layer changes nothing, elements leaving the frame are clipped.
+        frame = self.frame.copy()
+        overlay.OverlayLayer().apply(frame)
+        np.testing.assert_array_equal(frame, self.frame)
+        layer = overlay.OverlayLayer().rectangle([-10, -10], [700, 500], (0, 255, 0)).text("X", (630, 5), (0, 0, 255))
+        layer.apply(frame)
+        layer.apply(np.zeros((24, 32, 3), dtype=np.uint8))
+        self.assertFalse(np.array_equal(frame, self.frame))
+
+    def test_apply_performance(self):
+        frame = self.frame.copy()
+        self.layer.apply(frame)
+        start_time = time.time()
+        for _ in range(200):
+            self.layer.apply(frame)
+        elapsed_time = time.time() - start_time
+        # The same labels drawn again every frame.
+        draw_start = time.time()
+        for _ in range(200):
+            cv2.rectangle(frame, (100, 40), (540, 440), (0, 255, 0), 2)
+            for text, origin in self.labels:
+                cv2.putText(frame, text, origin, cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 1, cv2.LINE_AA)
+        self.assertLess(elapsed_time, time.time() - draw_start)
+        # 性能判斷, 假設期望在 0.05 秒內完成
+        self.assertLess(elapsed_time, 0.05, "Performance degraded, took too long to process.")
@@ -0,0 +1,82 @@
+import threading
+import time
+import unittest
+
+from package import pipeline
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.results = []
+        self.done = threading.Event()
+
+    def collect(self, item):
+        self.results.append(item)
+        if len(self.results) == 5:
+            self.done.set()
+
+    # test Stage
+    def test_stage_correctness(self):
+        # Results of a stage go to the next one, in order with a queue large enough.
+        double = pipeline.Stage("double", lambda item: item * 2, capacity=8)
+        collect = pipeline.Stage("collect", self.collect, capacity=8)
+        double.connect(collect)
+        stages = pipeline.Pipeline(double, collect)
+        stages.start()
+        for item in range(5):
+            self.assertTrue(double.submit(item))
+        self.assertTrue(self.done.wait(2))
+        stages.stop()
+        self.assertEqual(self.results, [0, 2, 4, 6, 8])
+        self.assertEqual(stages.stats()["double"]["processed"], 5)
+
+    def test_stage_output_type(self):
+        stage = pipeline.Stage("detect")
+        stage.record(0.004)
+        stats = stage.stats()
+        self.assertEqual(stats["processed"], 1)
+        self.assertEqual(stats["timing"]["p50_ms"], 5.0)
+        self.assertNotIn("buckets", stats["timing"])
+        self.assertIsInstance(pipeline.Pipeline(stage).stats()["detect"], dict)
+
+    def test_stage_invalid_input(self):
+        with self.assertRaises(ValueError):
+            pipeline.Stage("invalid_input", policy="invalid_input")
+        # A failing handler is counted, the worker goes on.
+        stage = pipeline.Stage("fail", lambda item: 1 / item, capacity=4)
+        stage.start()
+        stage.submit(0)
+        stage.submit(1)
+        stage.stop()
+        self.assertEqual(stage.failed, 1)
+        self.assertEqual(stage.processed, 2)
+
+    def test_stage_boundary_zero(self):
+        # Nothing is taken before start or after stop.
+        stage = pipeline.Stage("collect", self.collect)
+        self.assertFalse(stage.submit(1))
+        # `latest` keeps the newest item only.
+        release = threading.Event()
+        stage = pipeline.Stage("latest", lambda item: release.wait(2) and self.results.append(item), policy="latest")
+        stage.start()
+        stage.submit(0)
+        time.sleep(0.05)
+        for item in range(1, 5):
+            stage.submit(item)
+        release.set()
+        stage.stop()
+        self.assertEqual(self.results, [0, 4])
+        self.assertEqual(stage.dropped, 3)
+
+    def test_stage_performance(self):
+        # A slow stage drops items instead of slowing down the caller.
+        stage = pipeline.Stage("upload", lambda item: time.sleep(0.05), capacity=4)
+        stage.start()
+        start_time = time.time()
+        for item in range(100):
+            stage.submit(item)
+        elapsed_time = time.time() - start_time
+        stage.stop()
+        self.assertGreaterEqual(stage.dropped, 90)
+        # 性能判斷, 假設期望在 0.05 秒內完成
+        self.assertLess(elapsed_time, 0.05, "Performance degraded, took too long to process.")
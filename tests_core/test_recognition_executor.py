@@ -0,0 +1,125 @@
+import queue
+import threading
+import time
+import unittest
+
+import dlib
+import numpy as np
+
+from package import predictor, recognition_executor
+
+DLIB_PREDICTOR_PATH = "models/dlib/shape_predictor_68_face_landmarks.dat"
+DLIB_RECOGNITION_MODEL_PATH = "models/dlib/dlib_face_recognition_resnet_model_v1.dat"
+
+
+class TestRecognitionExecutor(unittest.TestCase):
+    def setUp(self):
+        self.image = np.load("./tests_core/test_data/test_image.npz")["test_img"]
+        self.predictor = predictor.Predictor(
+            dlib.shape_predictor(DLIB_PREDICTOR_PATH),
+            dlib.face_recognition_model_v1(DLIB_RECOGNITION_MODEL_PATH),
+            {},
+            0.4,
+        )
+        descriptor, _ = self.predictor.feature_extraction(self.image)
+        self.predictor.replace_gallery({"test_user": descriptor})
+        self.results = queue.Queue()
+
+    def _executor(self, **kwargs) -> recognition_executor.RecognitionExecutor:
+        executor = recognition_executor.RecognitionExecutor(
+            self.predictor,
+            self.results,
+            dlib_predictor_path=DLIB_PREDICTOR_PATH,
+            dlib_recognition_model_path=DLIB_RECOGNITION_MODEL_PATH,
+            **kwargs,
+        )
+        self.addCleanup(executor.shutdown, True)
+        return executor
+
+    # test submit
+    def test_submit_correctness(self):
+        for kind in recognition_executor.EXECUTOR_KINDS:
+            executor = self._executor(kind=kind, workers=1)
+            submitted_at = time.monotonic()
+            self.assertTrue(executor.submit(self.image, tag=7))
+            passed, distance, name, face_chip, descriptor, tag, recognized_at = self.results.get(timeout=30)
+            self.assertTrue(passed, kind)
+            self.assertEqual(name, "test_user")
+            self.assertLess(distance, 0.01)
+            self.assertEqual(face_chip.shape, (150, 150, 3))
+            self.assertEqual(descriptor.shape, (128,))
+            self.assertEqual(tag, 7)
+            self.assertGreater(recognized_at, submitted_at)
+            self.assertEqual(executor.completed, 1)
+
+    def test_submit_batched(self):
+        executor = self._executor(batch_size=4, batch_wait_ms=20)
+        for _ in range(3):
+            self.assertTrue(executor.submit(self.image))
+        results = [self.results.get(timeout=30) for _ in range(3)]
+        self.assertTrue(all(result[0] and result[2] == "test_user" for result in results))
+        self.assertEqual(executor.completed, 3)
+
+    def test_submit_output_type(self):
+        executor = self._executor()
+        executor.submit(self.image)
+        result = self.results.get(timeout=10)
+        self.assertIsInstance(result, list)
+        self.assertIsInstance(result[0], bool)
+        self.assertIsInstance(result[2], str)
+
+    def test_submit_invalid_input(self):
+        with self.assertRaises(ValueError):
+            self._executor(kind="invalid_input")
+        executor = self._executor()
+        executor.submit(np.zeros((10, 10, 3), dtype=np.uint8))
+        executor.shutdown(wait=True)
+        self.assertEqual(executor.failed, 1)
+        self.assertTrue(self.results.empty())
+
+    def test_submit_boundary_zero(self):
+        executor = self._executor(workers=1, queue_size=1, timeout=0)
+        self.assertTrue(executor.submit(self.image))
+        executor.shutdown(wait=True)
+        self.assertEqual(executor.timed_out, 1)
+        self.assertTrue(self.results.empty())
+
+        executor = self._executor(workers=1, queue_size=1)
+        self.assertTrue(executor.submit(self.image))
+        self.assertFalse(executor.submit(self.image))
+        self.assertEqual(executor.dropped, 1)
+
+    def test_submit_timeout_running(self):
+        # A running job cannot be cancelled, it keeps its slot past the deadline until it finishes.
+        extract = self.predictor.extract
+        started = threading.Event()
+
+        def slow_extract(face_roi):
+            started.set()
+            time.sleep(0.5)
+            return extract(face_roi)
+
+        self.predictor.extract = slow_extract
+        executor = self._executor(workers=1, queue_size=1, timeout=0.1)
+        self.assertTrue(executor.submit(self.image))
+        self.assertTrue(started.wait(5))
+        time.sleep(0.2)
+        self.assertFalse(executor.submit(self.image))
+        self.assertEqual(executor.pending, 1)
+        self.assertEqual(executor.timed_out, 1)
+        executor.shutdown(wait=True)
+        self.assertEqual(executor.pending, 0)
+        self.assertEqual(executor.timed_out, 1)
+        self.assertTrue(self.results.empty())
+
+    def test_submit_performance(self):
+        # The detection loop only pays for the hand-over, dlib runs in the worker processes.
+        executor = self._executor(kind="process", workers=1, queue_size=8)
+        executor.submit(self.image)
+        self.results.get(timeout=30)
+        start_time = time.time()
+        for _ in range(8):
+            executor.submit(self.image)
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.05 秒內完成
+        self.assertLess(elapsed_time, 0.05, "Performance degraded, took too long to process.")
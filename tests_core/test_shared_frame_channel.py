@@ -0,0 +1,120 @@
+import multiprocessing
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from package import shared_frame_channel
+
+FRAME_SHAPE = (48, 64, 3)
+
+
+def frame(value: int) -> np.ndarray:
+    return np.full(FRAME_SHAPE, value, dtype=np.uint8)
+
+
+def produce(channel: shared_frame_channel.SharedFrameChannel, count: int) -> None:
+    for value in range(count):
+        channel.put(frame(value), timeout=5)
+    channel.close()
+
+
+class TestSharedFrameChannel(unittest.TestCase):
+    def setUp(self):
+        self.channels = []
+
+    def tearDown(self):
+        for channel in self.channels:
+            channel.close()
+
+    def _channel(self, capacity: int = 2, policy: str = "latest") -> shared_frame_channel.SharedFrameChannel:
+        channel = shared_frame_channel.SharedFrameChannel(capacity, policy, int(np.prod(FRAME_SHAPE)))
+        self.channels.append(channel)
+        return channel
+
+    # test get
+    def test_get_correctness(self):
+        # Frames written by another process arrive in order and without loss with the block policy.
+        channel = self._channel(capacity=2, policy="block")
+        producer = multiprocessing.get_context("spawn").Process(target=produce, args=(channel, 20))
+        producer.start()
+        received = []
+        while (received_frame := channel.get(timeout=30)) is not None:
+            received.append(int(received_frame[0, 0, 0]))
+        producer.join()
+        self.assertEqual(received, list(range(20)))
+        self.assertEqual(channel.dropped, 0)
+        self.assertEqual(channel.put_count, 20)
+
+    def test_get_output_type(self):
+        channel = self._channel()
+        channel.put(frame(1))
+        received = channel.get(timeout=1)
+        self.assertIsInstance(received, np.ndarray)
+        self.assertEqual(received.shape, FRAME_SHAPE)
+        self.assertEqual(received.dtype, np.uint8)
+        channel.put(np.zeros((10, 20), dtype=np.uint8))
+        self.assertEqual(channel.get(timeout=1).shape, (10, 20))
+
+    def test_get_invalid_input(self):
+        channel = self._channel()
+        with self.assertRaises(ValueError):
+            channel.put(np.zeros((100, 100, 3), dtype=np.uint8))
+        with self.assertRaises(ValueError):
+            channel.put(np.zeros(FRAME_SHAPE, dtype=np.float32))
+        with self.assertRaises(ValueError):
+            shared_frame_channel.SharedFrameChannel(policy="invalid_input")
+
+    def test_get_boundary_zero(self):
+        channel = self._channel(capacity=3, policy="drop_oldest")
+        self.assertIsNone(channel.get(timeout=0))
+        for value in range(6):
+            channel.put(frame(value))
+        self.assertEqual([int(channel.get(timeout=1)[0, 0, 0]) for _ in range(3)], [3, 4, 5])
+        self.assertEqual(channel.dropped, 3)
+
+        latest = self._channel(policy="latest")
+        held = None
+        for value in range(5):
+            latest.put(frame(value))
+            if value == 0:
+                held = latest.get(timeout=1)
+        # The held frame is never overwritten while newer frames replace each other.
+        self.assertEqual(int(held[0, 0, 0]), 0)
+        self.assertEqual(int(latest.get(timeout=1)[0, 0, 0]), 4)
+        self.assertEqual(latest.dropped, 3)
+        latest.close()
+        self.assertTrue(latest.empty())
+        self.assertFalse(latest.put(frame(5)))
+
+    def test_get_performance(self):
+        channel = shared_frame_channel.SharedFrameChannel(2, "latest")
+        self.channels.append(channel)
+        large_frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        start_time = time.time()
+        for _ in range(10):
+            channel.put(large_frame)
+            channel.get(timeout=1)
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.1 秒內完成
+        self.assertLess(elapsed_time, 0.1, "Performance degraded, took too long to process.")
+
+    # test wants_frame
+    def test_wants_frame_correctness(self):
+        channel = self._channel(policy="drop_oldest", capacity=1)
+        self.assertTrue(channel.wants_frame())
+        channel.put(frame(1))
+        self.assertFalse(channel.wants_frame())
+        channel.get(timeout=1)
+        self.assertTrue(channel.wants_frame())
+        # With `latest`, only while the consumer waits in `get`.
+        latest = self._channel(policy="latest")
+        self.assertFalse(latest.wants_frame())
+        waiter = threading.Thread(target=latest.get, args=(1,))
+        waiter.start()
+        time.sleep(0.05)
+        self.assertTrue(latest.wants_frame())
+        latest.put(frame(2))
+        waiter.join()
+        self.assertFalse(latest.wants_frame())
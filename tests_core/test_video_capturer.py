@@ -0,0 +1,139 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+
+import package.config as config
+from package import frame_channel, shared_frame_channel, video_capturer
+
+
+class TestVideoCapturer(unittest.TestCase):
+    def setUp(self):
+        self.channel = frame_channel.FrameChannel(policy="latest")
+        self.frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    def retrieved(self, capturer: video_capturer.VideoCapturer, frames: int, consume_every: int = 0) -> list[int]:
+        retrieved = []
+        for index in range(1, frames + 1):
+            capturer.grabbed += 1
+            if capturer._should_retrieve():
+                retrieved.append(index)
+                self.channel.put(self.frame)
+            if consume_every and index % consume_every == 0:
+                self.channel.get(timeout=0)
+        return retrieved
+
+    # test should_retrieve
+    def test_should_retrieve_correctness(self):
+        capturer = video_capturer.VideoCapturer(0, self.channel, decimation=3)
+        self.assertEqual(self.retrieved(capturer, 9), [1, 4, 7])
+        # On demand: a frame is decoded only after the consumer took the previous one.
+        self.channel = frame_channel.FrameChannel(capacity=1, policy="drop_oldest")
+        capturer = video_capturer.VideoCapturer(0, self.channel, decimation=0)
+        self.assertEqual(self.retrieved(capturer, 9, consume_every=4), [1, 5, 9])
+        # With `latest`, only while the consumer waits for a frame.
+        capturer = video_capturer.VideoCapturer(0, frame_channel.FrameChannel(policy="latest"), decimation=0)
+        capturer.grabbed = 1
+        self.assertFalse(capturer._should_retrieve())
+
+    def test_should_retrieve_frame_age(self):
+        # A 30 fps source and a consumer busy 100 ms per frame: the frame it gets was just grabbed.
+        capturer = video_capturer.VideoCapturer(0, self.channel, decimation=0)
+        stop = threading.Event()
+
+        def capture():
+            while not stop.is_set():
+                captured_at = time.monotonic()
+                capturer.grabbed += 1
+                if capturer._should_retrieve():
+                    self.channel.put(self.frame, timestamp=captured_at)
+                time.sleep(1 / 30)
+
+        producer = threading.Thread(target=capture)
+        producer.start()
+        ages = []
+        for _ in range(8):
+            self.channel.get(timeout=1)
+            ages.append(self.channel.last_age)
+            time.sleep(0.1)
+        stop.set()
+        producer.join()
+        self.assertLess(float(np.median(ages)), 0.02)
+        # Frames are still decoded only on demand, not at the source rate.
+        self.assertLessEqual(self.channel.put_count, 10)
+
+    def test_should_retrieve_block_policy(self):
+        # `block` never drops: a fast replay into a slow consumer delivers every frame.
+        channel = frame_channel.FrameChannel(capacity=2, policy="block")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "frames.npz")
+            np.savez(path, frames=np.arange(50, dtype=np.uint8).reshape(50, 1, 1, 1).repeat(3, axis=3))
+            capturer = video_capturer.VideoCapturer(path, channel, decimation=0, source_options={"pacing": "fast"})
+            producer = threading.Thread(target=capturer.get_video)
+            producer.start()
+            delivered = []
+            while (frame := channel.get(timeout=0.5)) is not None:
+                delivered.append(int(frame[0, 0, 0]))
+                time.sleep(0.002)
+            producer.join()
+        self.assertEqual(delivered, list(range(50)))
+
+    def test_get_video_recording_every_frame(self):
+        # A recording is decoded frame by frame even on demand, whatever the consumer does.
+        channel = frame_channel.FrameChannel(capacity=1, policy="drop_oldest")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "frames.npz")
+            np.savez(path, frames=np.zeros((20, 4, 4, 3), dtype=np.uint8))
+            capturer = video_capturer.VideoCapturer(path, channel, decimation=0, source_options={"pacing": "fast"})
+            capturer.get_video()
+        self.assertEqual(capturer.retrieved, 20)
+        self.assertEqual(channel.put_count, 20)
+
+    def test_get_video_frame_too_large(self):
+        # Frames larger than the shared memory slots stop the capturer at start, with an error.
+        channel = shared_frame_channel.SharedFrameChannel(2, "latest", 32 * 24 * 3)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "frames.npz")
+            np.savez(path, frames=np.zeros((3, 48, 64, 3), dtype=np.uint8))
+            capturer = video_capturer.VideoCapturer(path, channel, source_options={"pacing": "fast"})
+            with self.assertLogs(config.logger, "ERROR"):
+                capturer.get_video()
+        channel.close()
+        self.assertFalse(capturer.status_alive)
+        self.assertEqual(capturer.retrieved, 0)
+
+    def test_get_video_missing_recording(self):
+        # A recording that cannot be opened ends the capturer like a camera that does not open.
+        capturer = video_capturer.VideoCapturer("missing.npz", self.channel)
+        capturer.get_video()
+        self.assertFalse(capturer.status_alive)
+        self.assertIsNone(capturer.cap)
+
+    def test_should_retrieve_output_type(self):
+        capturer = video_capturer.VideoCapturer(0, self.channel)
+        capturer.grabbed = 1
+        self.assertIsInstance(capturer._should_retrieve(), bool)
+
+    def test_should_retrieve_invalid_input(self):
+        capturer = video_capturer.VideoCapturer(0, "invalid_input", decimation=0)
+        with self.assertRaises(AttributeError):
+            capturer._should_retrieve()
+
+    def test_should_retrieve_boundary_zero(self):
+        # Decimation 1 decodes every frame, negative values mean on demand.
+        self.assertEqual(
+            self.retrieved(video_capturer.VideoCapturer(0, self.channel, decimation=1), 5), [1, 2, 3, 4, 5]
+        )
+        self.assertEqual(video_capturer.VideoCapturer(0, self.channel, decimation=-1).decimation, 0)
+
+    def test_should_retrieve_performance(self):
+        capturer = video_capturer.VideoCapturer(0, self.channel, decimation=0)
+        start_time = time.time()
+        for _ in range(1000):
+            capturer._should_retrieve()
+        elapsed_time = time.time() - start_time
+        # 性能判斷, 假設期望在 0.01 秒內完成
+        self.assertLess(elapsed_time, 0.01, "Performance degraded, took too long to process.")
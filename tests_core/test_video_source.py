@@ -0,0 +1,109 @@
+import os
+import tempfile
+import time
+import unittest
+
+import cv2
+import numpy as np
+
+from package import video_source
+
+TEST_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data")
+
+
+class TestVideoSource(unittest.TestCase):
+    def setUp(self):
+        self.npz = os.path.join(TEST_DATA, "test_image.npz")
+        self.directory = tempfile.TemporaryDirectory()
+        for index in range(3):
+            frame = np.full((24, 32, 3), index * 60, dtype=np.uint8)
+            cv2.imwrite(os.path.join(self.directory.name, f"frame_{index:03d}.png"), frame)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_all(self, source, limit: int = 10) -> list[np.ndarray]:
+        frames = []
+        while len(frames) < limit:
+            ret, frame = source.read()
+            if not ret:
+                break
+            frames.append(frame)
+        return frames
+
+    # test open_video_source
+    def test_open_video_source_correctness(self):
+        source = video_source.open_video_source(self.npz, pacing="fast")
+        self.assertIsInstance(source, video_source.NpzSource)
+        frames = self.read_all(source)
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(frames[0].shape, (774, 800, 3))
+        # Image directories replay in file name order, the same frames every run.
+        source = video_source.open_video_source(self.directory.name, pacing="fast")
+        self.assertIsInstance(source, video_source.ImageDirectorySource)
+        self.assertEqual([int(frame[0, 0, 0]) for frame in self.read_all(source)], [0, 60, 120])
+
+    def test_open_video_source_output_type(self):
+        source = video_source.open_video_source(self.directory.name, pacing="fast")
+        self.assertTrue(source.isOpened())
+        self.assertTrue(source.grab())
+        ret, frame = source.retrieve()
+        self.assertIsInstance(ret, bool)
+        self.assertIsInstance(frame, np.ndarray)
+        self.assertEqual(source.get(cv2.CAP_PROP_FRAME_COUNT), 3.0)
+
+    def test_open_video_source_invalid_input(self):
+        with self.assertRaises(ValueError):
+            video_source.open_video_source(self.npz, pacing="invalid_input")
+        with tempfile.TemporaryDirectory() as empty:
+            source = video_source.open_video_source(empty)
+            self.assertFalse(source.isOpened())
+            self.assertFalse(source.grab())
+
+        # A replay source without `_frame` fails when it is created, not on the first retrieve.
+        class CountOnly(video_source.ReplaySource):
+            def _count(self):
+                return 1
+
+        with self.assertRaises(TypeError):
+            CountOnly()
+
+    def test_open_video_source_boundary_zero(self):
+        # Looping restarts at the first frame, fps 0 falls back to 30 for images.
+        source = video_source.open_video_source(self.directory.name, fps=0, pacing="fast", loop=True)
+        self.assertEqual(source.fps, 30.0)
+        self.assertEqual([int(frame[0, 0, 0]) for frame in self.read_all(source, 7)], [0, 60, 120, 0, 60, 120, 0])
+
+    def test_open_video_source_performance(self):
+        source = video_source.open_video_source(self.directory.name, fps=200, pacing="realtime", loop=True)
+        start_time = time.time()
+        self.read_all(source, 21)
+        elapsed_time = time.time() - start_time
+        # Real-time pacing holds the frame rate: 20 intervals at 200 fps.
+        self.assertGreater(elapsed_time, 0.09)
+        # 性能判斷, 假設期望在 0.3 秒內完成
+        self.assertLess(elapsed_time, 0.3, "Performance degraded, took too long to process.")
+
+    # test open_capture
+    def test_open_capture_correctness(self):
+        path = os.path.join(self.directory.name, "video.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25, (32, 24))
+        for index in range(3):
+            writer.write(np.full((24, 32, 3), index * 60, dtype=np.uint8))
+        writer.release()
+        self.addCleanup(os.environ.pop, "OPENCV_FFMPEG_CAPTURE_OPTIONS", None)
+        cap = video_source.open_capture(path, backend="ffmpeg", ffmpeg_options="fflags;nobuffer")
+        self.assertTrue(cap.isOpened())
+        self.assertEqual(
+            video_source.describe_capture(cap),
+            {"backend": "FFMPEG", "width": 32, "height": 24, "fps": 25.0, "buffer_size": 0},
+        )
+        cap.release()
+
+    def test_open_capture_invalid_input(self):
+        with self.assertRaises(ValueError):
+            video_source.open_capture(0, backend="invalid_input")
+        self.assertEqual(
+            video_source.describe_capture(video_source.open_video_source(self.directory.name))["backend"],
+            "ImageDirectorySource",
+        )